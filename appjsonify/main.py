@@ -1,9 +1,10 @@
 from pathlib import Path
 
 from .modules.doc import Document
-from .modules.runner import BaseRunner
-from .utils import (NotAPDFError, PipelineOrderError, check_pipeline,
-                    get_template, print_data)
+from .utils import (Manifest, NotAPDFError, PipelineOrderError,
+                    build_runners, check_pipeline, get_start_index,
+                    get_template, load_documents, run_pipeline,
+                    stream_pipeline)
 
 
 def main(args):
@@ -38,37 +39,44 @@ def main(args):
     #####
     # Load PDF files
     #####
-    docs: list[Document] = []
     if is_dir:
-        for pdf_path in input_path.glob('**/*.pdf'):
-            docs.append(Document(pdf_path))
+        pdf_paths: list[Path] = list(input_path.glob('**/*.pdf'))
     else:
-        docs.append(Document(input_path))
-        
+        pdf_paths: list[Path] = [input_path]
+    
+    #####
+    # Skip PDF files converted by previous runs
+    #####
+    manifest = None
+    if args.incremental:
+        manifest = Manifest(
+            output_dir / 'manifest.json',
+            input_path if is_dir else input_path.parent,
+            args
+        )
+        num_pdfs = len(pdf_paths)
+        pdf_paths = [pdf_path for pdf_path in pdf_paths if not manifest.is_up_to_date(pdf_path)]
+        print(f"Skip {num_pdfs - len(pdf_paths)} out of {num_pdfs} PDF files that are already converted.")
+    
     #####
     # Process PDF files
     #####
-    for index, module_name in enumerate(args.pipeline):
-        print(f'Now running {index}: {module_name}')
-        
-        # get a module instance
-        module_cls = BaseRunner.by_name(module_name)
-
-        # execute a process
-        docs = module_cls().execute(documents=docs, **vars(args))
-
-        # print and save current data
-        if args.verbose:
-            print_data(
-                docs, 
-                output_dir, 
-                f'{index}_{module_name}',
-                args.insert_page_break,
-                args.show_pos,
-                args.show_font,
-                args.show_style,
-                args.show_meta
-            )
+    if args.incremental:
+        # process document by document to record the result of each
+        stream_pipeline(
+            pdf_paths, args, output_dir, args.workers, manifest, args.pipelined, args.stage_queue_size
+        )
+    elif args.streaming or args.workers > 1 or args.pipelined:
+        # process document by document
+        stream_pipeline(
+            pdf_paths, args, output_dir, args.workers, pipelined=args.pipelined, stage_queue_size=args.stage_queue_size
+        )
+    else:
+        # process module by module
+        start_index: int = get_start_index(args)
+        docs: list[Document] = load_documents(pdf_paths, args, output_dir)
+        runners = build_runners(args.pipeline[start_index:], inplace=not args.copy_documents)
+        run_pipeline(docs, runners, args, output_dir, start_index=start_index)
     
 
 def run_cli():
@@ -155,6 +163,20 @@ def run_cli():
         help="[load_docs] Specify a threshold value to determine " \
             + "if one character forms the same word. Defaults to 3.5."
     )
+    parser.add_argument(
+        '--pages', 
+        type=str, 
+        default='',
+        help="[load_docs] Specify pages to load as 1-based page ranges such as `1-2,5`. " \
+            + "The other pages are neither parsed nor rasterised. Defaults to all pages."
+    )
+    parser.add_argument(
+        '--max_pages', 
+        type=int, 
+        default=0,
+        help="[load_docs] Specify the maximum number of pages to load from the beginning " \
+            + "(of `--pages` if set). Defaults to 0, which loads all pages."
+    )
     
     # load_objects_with_ml settings
     parser.add_argument(
@@ -178,9 +200,34 @@ def run_cli():
     parser.add_argument(
         '--detectron_device_mode', 
         type=str,  
-        choices=['cpu', 'cuda'], 
+        choices=['cpu', 'cuda', 'cuda:all'], 
         default='cpu',
-        help="[load_objects_with_ml] Specify a type of a device for Detectron2 based models."
+        help="[load_objects_with_ml] Specify a type of a device for Detectron2 based models. " \
+            + "`cuda:all` runs the models in worker processes spread over all GPUs (see `--detectron_workers`)."
+    )
+    parser.add_argument(
+        '--detectron_batch_size', 
+        type=int, 
+        default=1,
+        help="[load_objects_with_ml] Specify the number of page images that each Detectron2 based model " \
+            + "processes at once. Larger values reduce per-page overhead but use more memory. Defaults to 1."
+    )
+    parser.add_argument(
+        '--detectron_workers', 
+        type=int, 
+        default=0,
+        help="[load_objects_with_ml] Specify the number of worker processes that run Detectron2 based models " \
+            + "on batches of pages concurrently. Each worker loads all the models on its own device, " \
+            + "and CPU workers are given separate cores. 0 runs the models in the main process, " \
+            + "or one worker per GPU with `--detectron_device_mode cuda:all`. Defaults to 0."
+    )
+    parser.add_argument(
+        '--concurrent_detectors', 
+        action='store_true', 
+        default=False,
+        help="[load_objects_with_ml] Set this to run the three Detectron2 based models concurrently in threads " \
+            + "on each batch of pages instead of one after another, " \
+            + "including in the worker processes of `--detectron_workers`. Defaults to False."
     )
     parser.add_argument(
         '--save_image', 
@@ -189,12 +236,64 @@ def run_cli():
         help="[load_objects_with_ml] " \
              + "Set this to save object images. Defaults to False."
     )
+    parser.add_argument(
+        '--save_visualization', 
+        action='store_true', 
+        default=False,
+        help="[load_objects_with_ml] " \
+             + "Set this with `save_image` to also save page images overlaid with the predictions " \
+             + "of each model for debugging. Defaults to False."
+    )
     parser.add_argument(
         '--output_image_dir', 
         type=str,
         default='',
         help="[load_objects_with_ml] Specify an image path if `save_image` is True."
     )
+    parser.add_argument(
+        '--detection_cache_dir', 
+        type=str,
+        default='',
+        help="[load_objects_with_ml] Specify a directory to cache detection results of each page. " \
+            + "Cached results are reused as long as the PDF file, model weights and thresholds are the same. " \
+            + "The cache is not used when `save_image` is True. Defaults to no cache."
+    )
+    parser.add_argument(
+        '--detection_cache_size', 
+        type=float,
+        default=1024,
+        help="[load_objects_with_ml] Specify the maximum size of the detection cache in megabytes. " \
+            + "The least recently used results are removed first. Defaults to 1024."
+    )
+    parser.add_argument(
+        '--render_dpi', 
+        type=int, 
+        default=200,
+        help="[load_objects_with_ml] Specify a resolution to render pages for the detection models at. " \
+            + "Set 0 to scale pages to the input size of the models, which is faster and uses less memory. " \
+            + "Defaults to 200."
+    )
+    parser.add_argument(
+        '--render_grayscale', 
+        action='store_true', 
+        default=False,
+        help="[load_objects_with_ml] Set this to render pages in grayscale. Defaults to False."
+    )
+    parser.add_argument(
+        '--render_thread_count', 
+        type=int, 
+        default=1,
+        help="[load_objects_with_ml] Specify the number of processes to render pages of a document in parallel. " \
+            + "Defaults to 1."
+    )
+    parser.add_argument(
+        '--render_chunk_size', 
+        type=int, 
+        default=8,
+        help="[load_objects_with_ml] Specify the number of pages rendered at once. Pages are passed to " \
+            + "the models while the next pages are rendered, so memory usage does not grow with the number " \
+            + "of pages. Defaults to 8."
+    )
     
     # extract_lines settings
     parser.add_argument(
@@ -389,6 +488,142 @@ def run_cli():
             + 'Defaults to 300.'
     )
     
+    # dump settings
+    parser.add_argument(
+        '--compact_json',
+        action='store_true',
+        default=False,
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc] " \
+             + "Set this to write JSON files without indents and spaces. Defaults to False."
+    )
+    parser.add_argument(
+        '--json_backend',
+        type=str,
+        default="auto",
+        choices=["auto", "orjson", "msgspec", "json"],
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc] " \
+             + "Specify a library to write JSON files. With `--compact_json`, `auto` uses orjson or msgspec " \
+             + "if installed and the standard json otherwise. Without it, `auto` always uses the standard json " \
+             + "so that indented files do not change. Note that orjson indents with two spaces instead of four. " \
+             + "Defaults to auto."
+    )
+    parser.add_argument(
+        '--corpus_jsonl',
+        action='store_true',
+        default=False,
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc] " \
+             + "Set this to append documents as lines of JSONL shards in the output directory " \
+             + "instead of writing a directory and a JSON file per document. " \
+             + "The shard and byte range of each document are recorded in `{corpus_name}-*.index.jsonl`. " \
+             + "Defaults to False."
+    )
+    parser.add_argument(
+        '--corpus_name',
+        type=str,
+        default="corpus",
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc, dump_columnar] " \
+             + "Specify a prefix of shard files with `--corpus_jsonl` and of table directories " \
+             + "of `dump_columnar`. Defaults to corpus."
+    )
+    parser.add_argument(
+        '--shard_size',
+        type=int,
+        default=256,
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc] " \
+             + "Specify the maximum size of a shard file in megabytes with `--corpus_jsonl`. Defaults to 256."
+    )
+    parser.add_argument(
+        '--shard_compression',
+        type=str,
+        default="none",
+        choices=["none", "gzip", "zstd"],
+        help="[dump_doc_with_tokens, dump_doc_with_lines, dump_doc_with_paragraphs, " \
+             + "dump_doc_with_sections, dump_formatted_doc] " \
+             + "Specify the compression of shard files with `--corpus_jsonl`. " \
+             + "zstd requires the zstandard package. Defaults to none."
+    )
+    parser.add_argument(
+        '--columnar_format',
+        type=str,
+        default="parquet",
+        choices=["parquet", "arrow"],
+        help="[dump_columnar] Specify the file format of token, line and paragraph tables. " \
+             + "Both require the pyarrow package. Defaults to parquet."
+    )
+
+    # execution settings
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        default=False,
+        help="Set this to process documents one by one through the whole pipeline " \
+             + "instead of running each module over all documents. " \
+             + "This keeps memory usage bounded for a large number of documents. Defaults to False."
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Specify the number of worker processes. If this is more than one, " \
+             + "documents are processed in parallel, each of which goes through the whole pipeline " \
+             + "as with `--streaming`. Note that each worker loads its own models. Defaults to 1."
+    )
+    parser.add_argument(
+        '--pipelined',
+        action='store_true',
+        default=False,
+        help="Set this to run each module in its own thread on successive documents, " \
+             + "e.g., parsing a document and rendering the next one while the detection models run on another. " \
+             + "Documents go through the whole pipeline as with `--streaming`. " \
+             + "Cannot be used with `--workers`. Defaults to False."
+    )
+    parser.add_argument(
+        '--stage_queue_size',
+        type=int,
+        default=1,
+        help="Specify the maximum number of documents waiting for each module with `--pipelined`. " \
+             + "Larger values absorb variations in processing time at the cost of memory. Defaults to 1."
+    )
+    parser.add_argument(
+        '--copy_documents',
+        action='store_true',
+        default=False,
+        help="Set this to let each module work on a deep copy of documents. " \
+             + "By default, modules edit documents in place as intermediate results are not reused. " \
+             + "Defaults to False."
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        default=False,
+        help="Set this to skip PDF files that have already been converted with the same pipeline, " \
+             + "arguments and version of appjsonify, as recorded in `manifest.json` in the output directory. " \
+             + "Documents are processed one by one as with `--streaming`. Defaults to False."
+    )
+    
+    # checkpoint settings
+    parser.add_argument(
+        '--checkpoint_stages',
+        type=str,
+        nargs='+',
+        default=[],
+        help="Specify module names after which the documents are saved as binary checkpoints " \
+             + "in the output directory so that a later run can resume from them with `--resume_from`."
+    )
+    parser.add_argument(
+        '--resume_from',
+        type=str,
+        default=None,
+        help="Specify a module name to load the checkpoints saved after it with `--checkpoint_stages` " \
+             + "and run only the following modules. The preceding modules must be the same as when saved."
+    )
+    
     # print settings
     parser.add_argument(
         '--verbose', 
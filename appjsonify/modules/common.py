@@ -1,4 +1,9 @@
-from collections import Counter
+import functools
+import math
+from collections import Counter, defaultdict
+from typing import Optional
+
+import numpy as np
 
 from .doc import Document
 
@@ -94,6 +99,186 @@ def check_token_overlap(
         return False
 
 
+def _to_bbox_array(
+    bboxes: list[tuple[int]]
+) -> np.ndarray:
+    """Convert bboxes into a float array of shape (N, 4)."""
+    return np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+
+def batch_normalize_bbox(
+    bboxes: list[list[float]],
+    width: int,
+    height: int
+) -> np.ndarray:
+    """Normalise bounding boxes at once. This returns the same values as `normalize_bbox`.
+
+    Args:
+        bboxes (list[list[float]]): Bounding boxes of shape (N, 4).
+        width (int): A page width.
+        height (int): A page height.
+
+    Returns:
+        np.ndarray: Normalised bounding boxes of shape (N, 4).
+    """
+    scale = np.array([width, height, width, height], dtype=np.float64)
+    normalised = np.trunc(_to_bbox_array(bboxes) / scale * 1000)
+    return np.clip(normalised, 0, 1000).astype(np.int64)
+
+
+def batch_judge_within_bbox(
+    ref_bboxes: list[tuple[int]],
+    target_bboxes: list[tuple[int]]
+) -> np.ndarray:
+    """Classify if each of `target_bboxes` is inside each of `ref_bboxes`.
+
+    Returns:
+        np.ndarray: A boolean mask of shape (N, M), whose (i, j) element equals
+        `judge_within_bbox(ref_bboxes[i], target_bboxes[j])`.
+    """
+    ref = _to_bbox_array(ref_bboxes)[:, None, :]
+    target = _to_bbox_array(target_bboxes)[None, :, :]
+    return (ref[..., 0] <= target[..., 0]) & (target[..., 2] <= ref[..., 2]) \
+        & (ref[..., 1] <= target[..., 1]) & (target[..., 3] <= ref[..., 3])
+
+
+def _batch_overlap(
+    ref_bboxes: list[tuple[int]],
+    target_bboxes: list[tuple[int]],
+    bbox_overlap_metric: str = 'min'
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return a mask of overlapping pairs and their overlap ratios."""
+    ref = _to_bbox_array(ref_bboxes)[:, None, :]
+    target = _to_bbox_array(target_bboxes)[None, :, :]
+
+    # get and (intersection) bboxes
+    and_x0 = np.maximum(ref[..., 0], target[..., 0])
+    and_x1 = np.minimum(ref[..., 2], target[..., 2])
+    and_y0 = np.maximum(ref[..., 1], target[..., 1])
+    and_y1 = np.minimum(ref[..., 3], target[..., 3])
+    overlaps = (and_x0 <= and_x1) & (and_y0 <= and_y1)
+
+    # calc overlap ratios
+    and_area = np.abs(and_x1 - and_x0) * np.abs(and_y1 - and_y0)
+    if bbox_overlap_metric == 'min':
+        ref_area = np.abs(ref[..., 2] - ref[..., 0]) * np.abs(ref[..., 3] - ref[..., 1])
+        target_area = np.abs(target[..., 2] - target[..., 0]) * np.abs(target[..., 3] - target[..., 1])
+        base_area = np.minimum(ref_area, target_area)
+    elif bbox_overlap_metric == 'union':
+        # union area
+        union_x0 = np.minimum(ref[..., 0], target[..., 0])
+        union_x1 = np.maximum(ref[..., 2], target[..., 2])
+        union_y0 = np.minimum(ref[..., 1], target[..., 1])
+        union_y1 = np.maximum(ref[..., 3], target[..., 3])
+        base_area = np.abs(union_x1 - union_x0) * np.abs(union_y1 - union_y0)
+    else:
+        raise ValueError('No such a `bbox_overlap_metric`!')
+
+    # pairs with an empty base area do not overlap instead of raising ZeroDivisionError
+    overlaps &= base_area > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overlap_ratios = np.where(overlaps, and_area / base_area, 0.0)
+    return overlaps, overlap_ratios
+
+
+def batch_overlap_ratio(
+    ref_bboxes: list[tuple[int]],
+    target_bboxes: list[tuple[int]],
+    bbox_overlap_metric: str = 'min'
+) -> np.ndarray:
+    """Calculate the overlap ratios of all pairs of bboxes as `check_token_overlap` does.
+
+    Args:
+        ref_bboxes (list[tuple[int]]): Reference bboxes of shape (N, 4).
+        target_bboxes (list[tuple[int]]): Target bboxes of shape (M, 4).
+        bbox_overlap_metric (str, optional): Specify a metric to calculate the overlap ratio. Defaults to 'min'.
+
+    Raises:
+        ValueError: Not defined overlap metric.
+
+    Returns:
+        np.ndarray: Overlap ratios of shape (N, M). The ratio of a pair without overlap is 0.
+    """
+    return _batch_overlap(ref_bboxes, target_bboxes, bbox_overlap_metric)[1]
+
+
+def batch_check_token_overlap(
+    ref_bboxes: list[tuple[int]],
+    target_bboxes: list[tuple[int]],
+    threshold: float = 0.95,
+    bbox_overlap_metric: str = 'min'
+) -> np.ndarray:
+    """Judge if each pair of bboxes overlaps significantly.
+
+    Args:
+        ref_bboxes (list[tuple[int]]): Reference bboxes of shape (N, 4).
+        target_bboxes (list[tuple[int]]): Target bboxes of shape (M, 4).
+        threshold (float, optional): A threshold to determin if two bboxes overlap significantly.
+        Defaults to 0.95.
+        bbox_overlap_metric (str, optional): Specify a metric to calculate the overlap ratio. Defaults to 'min'.
+
+    Raises:
+        ValueError: Not defined overlap metric.
+
+    Returns:
+        np.ndarray: A boolean mask of shape (N, M), whose (i, j) element equals
+        `check_token_overlap(ref_bboxes[i], target_bboxes[j], threshold, bbox_overlap_metric)`.
+    """
+    overlaps, overlap_ratios = _batch_overlap(ref_bboxes, target_bboxes, bbox_overlap_metric)
+    return overlaps & (overlap_ratios > threshold)
+
+
+class BboxIndex:
+    """Uniform grid index of bboxes in the normalised coordinate space (0-1000).
+
+    `query` narrows down the bboxes that may intersect a given bbox, so that `check_token_overlap`
+    and `judge_within_bbox` are applied only to them instead of to every bbox in a page.
+    """
+    def __init__(
+        self,
+        bboxes: list[tuple[int]],
+        cell_size: int = 50
+    ):
+        """
+        Args:
+            bboxes (list[tuple[int]]): A list of bboxes.
+            cell_size (int, optional): The width and height of a grid cell. Defaults to 50.
+        """
+        self.cell_size: int = cell_size
+        self.cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for index, bbox in enumerate(bboxes):
+            for cell in self._get_cells(bbox):
+                self.cells[cell].append(index)
+
+
+    def _get_cells(
+        self,
+        bbox: tuple[int],
+        offset: float = 0
+    ) -> list[tuple[int, int]]:
+        x0 = math.floor((min(bbox[0], bbox[2]) - offset) / self.cell_size)
+        y0 = math.floor((min(bbox[1], bbox[3]) - offset) / self.cell_size)
+        x1 = math.floor((max(bbox[0], bbox[2]) + offset) / self.cell_size)
+        y1 = math.floor((max(bbox[1], bbox[3]) + offset) / self.cell_size)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+
+    def query(
+        self,
+        bbox: tuple[int],
+        offset: float = 0
+    ) -> list[int]:
+        """Return the indices of bboxes that may intersect `bbox` expanded by `offset` in ascending order.
+
+        Every bbox that intersects or touches the expanded bbox is returned, together with some bboxes
+        that do not, so the result needs to be filtered with an exact condition.
+        """
+        candidates: set[int] = set()
+        for cell in self._get_cells(bbox, offset):
+            candidates.update(self.cells.get(cell, ()))
+        return sorted(candidates)
+
+
 def get_math_font_names(
     paper_type: str
 ) -> tuple[str]:
@@ -280,22 +465,114 @@ def get_font_specs_config(
         raise NotImplementedError()
 
 
+@functools.lru_cache(maxsize=None)
+def strip_font_subset(font_name: str) -> str:
+    """Strip a subset tag from a font name (e.g. `ABCDEF+Times-Roman` -> `Times-Roman`).
+    A font name without a tag is returned as it is."""
+    try:
+        return font_name.split('+')[1]
+    except IndexError:
+        return font_name
+
+
+class FontProfile:
+    """Font statistics of a document.
+
+    A profile is built in one pass over the tokens of a document by `load_docs` and stored
+    in `doc.meta["font_profile"]`. Modules that remove tokens rebuild it, and the others read it
+    with `get_font_profile` instead of walking all the tokens again.
+    """
+    def __init__(
+        self,
+        histogram: Counter
+    ):
+        """
+        Args:
+            histogram (Counter): Token counts keyed by (font size, subset-stripped font name)
+                in the order of their first appearance.
+        """
+        self.histogram: Counter = histogram
+        # font ids in the order of their first appearance
+        self.font_ids: dict[str, int] = {}
+        font_sizes: Counter = Counter()
+        font_names: Counter = Counter()
+        for (font_size, font_name), count in histogram.items():
+            self.font_ids.setdefault(font_name, len(self.font_ids))
+            font_sizes[font_size] += count
+            font_names[font_name] += count
+        # ties are broken by the first appearance as `Counter` over all the tokens does
+        self.most_common_font_size: Optional[float] = \
+            font_sizes.most_common(1)[0][0] if font_sizes else None
+        self.most_common_font_name: Optional[str] = \
+            font_names.most_common(1)[0][0] if font_names else None
+
+
+    @classmethod
+    def from_document(
+        cls,
+        doc: Document
+    ) -> "FontProfile":
+        """Build a profile from the tokens of a document."""
+        histogram: Counter = Counter()
+        for page in doc.pages:
+            for token in page.tokens:
+                histogram[(token.font_size, strip_font_subset(token.font_name))] += 1
+        return cls(histogram)
+
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serialisable summary of the profile."""
+        return {
+            "most_common_font_size": self.most_common_font_size,
+            "most_common_font_name": self.most_common_font_name,
+            "fonts": list(self.font_ids),
+            "histogram": [
+                {"font_size": font_size, "font_id": self.font_ids[font_name], "count": count}
+                for (font_size, font_name), count in self.histogram.most_common()
+            ]
+        }
+
+
+def get_font_profile(doc: Document) -> FontProfile:
+    """Return the font profile of a document, building and storing it if necessary."""
+    if doc.meta.get("font_profile") is None:
+        doc.meta["font_profile"] = FontProfile.from_document(doc)
+    return doc.meta["font_profile"]
+
+
 def get_most_common_font_size(doc: Document) -> float:
     """Return the most common font size for a given document."""
-    font_sizes: list[float] = []
-    for page in doc.pages:
-        for token in page.tokens:
-            font_sizes.append(token.font_size)
-    return Counter(font_sizes).most_common(1)[0][0]
+    return FontProfile.from_document(doc).most_common_font_size
 
 
 def get_most_common_font_name(doc: Document) -> str:
     """Return the most common font name for a given document."""
-    font_names: list[str] = []
-    for page in doc.pages:
-        for token in page.tokens:
-            try:
-                font_names.append(token.font_name.split('+')[1])
-            except IndexError:
-                font_names.append(token.font_name)
-    return Counter(font_names).most_common(1)[0][0]
+    return FontProfile.from_document(doc).most_common_font_name
+
+
+def parse_page_ranges(pages: str) -> list[int]:
+    """Parse page ranges such as `1-3,5` into sorted 1-based page numbers."""
+    page_numbers: set[int] = set()
+    for page_range in pages.split(','):
+        try:
+            if '-' in page_range:
+                start, end = (int(value) for value in page_range.split('-'))
+            else:
+                start = end = int(page_range)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {page_range}. Specify page ranges such as `1-3,5`.")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {page_range}. Page numbers start from 1.")
+        page_numbers.update(range(start, end + 1))
+    return sorted(page_numbers)
+
+
+def get_page_numbers(doc: Document) -> list[int]:
+    """Return the 1-based page numbers of the pages of a document in the PDF file.
+
+    They differ from the positions of the pages when `load_docs` loads only some pages.
+    """
+    page_numbers: Optional[list[int]] = doc.meta.get("page_numbers")
+    if page_numbers is None or len(page_numbers) != len(doc.pages):
+        return list(range(1, len(doc.pages) + 1))
+    return page_numbers
@@ -1,24 +1,36 @@
+import sys
 from pathlib import Path
 
 class Token:
-    """Token definition."""
+    """Token definition.
+
+    Document classes use `__slots__` to keep millions of instances small,
+    and font names are interned so that tokens share a single string per font.
+    """
+    __slots__ = ("token", "pos", "font_size", "font_name", "meta")
+
     def __init__(
         self, 
         token: str, 
         pos: tuple,
         font_size: float,
         font_name: str,
-        meta: dict = {}
+        meta: dict = None
     ):
         self.token: str = token
         self.pos: tuple = pos
         self.font_size: float = font_size
-        self.font_name: str = font_name
-        self.meta: dict = meta
+        self.font_name: str = sys.intern(font_name)
+        self.meta: dict = meta if meta is not None else {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.token, self.pos, self.font_size, self.font_name, self.meta))
 
 
 class Line:
     """Line definition."""
+    __slots__ = ("line", "pos", "font_size", "font_name", "tokens", "meta")
+
     def __init__(
         self, 
         line: str, 
@@ -26,18 +38,23 @@ class Line:
         font_size: float,
         font_name: str,
         tokens: list[Token],
-        meta: dict = {}
+        meta: dict = None
     ):
         self.line: str = line
         self.pos: tuple = pos
         self.font_size: float = font_size
-        self.font_name: str = font_name
+        self.font_name: str = sys.intern(font_name)
         self.tokens: list[Token] = tokens
-        self.meta: dict = meta
+        self.meta: dict = meta if meta is not None else {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.line, self.pos, self.font_size, self.font_name, self.tokens, self.meta))
 
 
 class Paragraph:
     """Paragraph definition."""
+    __slots__ = ("paragraph", "pos", "font_size", "font_name", "lines", "meta")
+
     def __init__(
         self, 
         paragraph: str,
@@ -45,41 +62,54 @@ class Paragraph:
         font_size: float,
         font_name: str,
         lines: list[Line],
-        meta: dict = {}
+        meta: dict = None
     ):
         self.paragraph: str = paragraph
         self.pos: tuple = pos
         self.font_size: float = font_size
-        self.font_name: str = font_name
+        self.font_name: str = sys.intern(font_name)
         self.lines: list[Line] = lines
-        self.meta: dict = meta
+        self.meta: dict = meta if meta is not None else {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.paragraph, self.pos, self.font_size, self.font_name, self.lines, self.meta))
 
 
 class Page:
     """Page definition."""
+    __slots__ = ("paragraphs", "lines", "tokens", "meta")
+
     def __init__(
         self,
         paragraphs: list[Paragraph],
         lines: list[Line],
         tokens: list[Token], 
-        meta: dict = {}
+        meta: dict = None
     ):
         self.paragraphs: list[Paragraph] = paragraphs
         self.lines: list[Line] = lines
         self.tokens: list[Token] = tokens
-        self.meta: dict = meta
+        self.meta: dict = meta if meta is not None else {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.paragraphs, self.lines, self.tokens, self.meta))
 
 
 class Document:
     """Document definition."""
+    __slots__ = ("input_path", "pages", "formatted_paragraphs", "meta")
+
     def __init__(
         self, 
         input_path: Path, 
-        pages: list[Page] = [],
-        formatted_paragraphs: list[Paragraph] = [],
-        meta: dict = {}
+        pages: list[Page] = None,
+        formatted_paragraphs: list[Paragraph] = None,
+        meta: dict = None
     ):
         self.input_path: Path = input_path
-        self.pages: list[Page] = pages
-        self.formatted_paragraphs: list[Paragraph] = formatted_paragraphs
-        self.meta: dict = meta
+        self.pages: list[Page] = pages if pages is not None else []
+        self.formatted_paragraphs: list[Paragraph] = formatted_paragraphs if formatted_paragraphs is not None else []
+        self.meta: dict = meta if meta is not None else {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.input_path, self.pages, self.formatted_paragraphs, self.meta))
@@ -1,3 +1,4 @@
+from .columnar import ColumnarDumper
 from .dump import (FormattedDocJSONDumper, LineLevelJSONDumper,
                    ParagraphLevelJSONDumper, SectionLevelJSONDumper,
                    TokenLevelJSONDumper)
@@ -0,0 +1,171 @@
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from ..common import get_page_numbers
+from ..doc import Document
+from ..runner import BaseRunner
+
+COLUMNAR_LEVELS = ("tokens", "lines", "paragraphs")
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _get_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError("Please install pyarrow by specifying `python -m pip install pyarrow`!")
+    return pyarrow
+
+
+def get_columnar_schema(level: str):
+    """Return the Arrow schema of a level.
+
+    Each row has the document id, the 1-based page number in the PDF file, the index of the element in the page,
+    its text, bbox, font size and font name. Tokens and lines also have the index of the line and
+    the paragraph in the page that they belong to, which is null if they do not belong to any.
+    Lines and paragraphs have the number of their elements, and paragraphs have their styles.
+    """
+    pa = _get_pyarrow()
+    fields = [
+        ("doc_id", pa.string()),
+        ("page", pa.int32()),
+        ("index", pa.int32()),
+        ("text", pa.string()),
+        ("x0", pa.float32()),
+        ("y0", pa.float32()),
+        ("x1", pa.float32()),
+        ("y1", pa.float32()),
+        ("font_size", pa.float64()),
+        # fonts are repeated over millions of tokens
+        ("font_name", pa.dictionary(pa.int32(), pa.string())),
+    ]
+    if level == "tokens":
+        fields.append(("line_index", pa.int32()))
+    elif level == "lines":
+        fields += [("paragraph_index", pa.int32()), ("num_tokens", pa.int32())]
+    elif level == "paragraphs":
+        fields += [("num_lines", pa.int32()), ("style", pa.string())]
+    else:
+        raise ValueError(f"Unknown level: {level}. Choose from {', '.join(COLUMNAR_LEVELS)}.")
+    return pa.schema(fields)
+
+
+@BaseRunner.register("dump_columnar")
+class ColumnarDumper(BaseRunner):
+    """Export tokens, lines and paragraphs with their geometry as Parquet or Arrow tables.
+
+    Each call of `execute` writes a file per level, e.g., `{output_dir}/{corpus_name}_tokens/part-*.parquet`,
+    so that each directory can be read as a single dataset by `pyarrow.dataset.dataset`.
+    Levels without any rows, e.g., paragraphs before `extract_paragraphs`, are not written.
+    """
+    def __init__(
+        self,
+        show_progress: bool = True,
+        inplace: bool = False
+    ):
+        super().__init__(show_progress, inplace)
+        # unique to each instance so that worker processes never write to the same file
+        self.writer_id: str = uuid.uuid4().hex[:8]
+        self.num_parts: int = 0
+
+
+    @staticmethod
+    def _make_columns(
+        documents: list[Document]
+    ) -> dict[str, dict[str, list]]:
+        """Collect the columns of all levels over documents."""
+        names = ("doc_id", "page", "index", "text", "x0", "y0", "x1", "y1", "font_size", "font_name")
+        columns: dict[str, dict[str, list]] = {
+            "tokens": {name: [] for name in names + ("line_index",)},
+            "lines": {name: [] for name in names + ("paragraph_index", "num_tokens")},
+            "paragraphs": {name: [] for name in names + ("num_lines", "style")},
+        }
+
+        def append(level_columns, doc_id, page_number, index, text, element):
+            level_columns["doc_id"].append(doc_id)
+            level_columns["page"].append(page_number)
+            level_columns["index"].append(index)
+            level_columns["text"].append(text)
+            x0, y0, x1, y1 = element.pos
+            level_columns["x0"].append(x0)
+            level_columns["y0"].append(y0)
+            level_columns["x1"].append(x1)
+            level_columns["y1"].append(y1)
+            level_columns["font_size"].append(element.font_size)
+            level_columns["font_name"].append(element.font_name)
+
+        for doc in documents:
+            doc_id = doc.input_path.stem
+            for page_number, page in zip(get_page_numbers(doc), doc.pages):
+                # map elements to their parents by identity
+                line_indices: dict[int, int] = {
+                    id(token): index for index, line in enumerate(page.lines) for token in line.tokens
+                }
+                paragraph_indices: dict[int, int] = {
+                    id(line): index for index, paragraph in enumerate(page.paragraphs) for line in paragraph.lines
+                }
+                for index, token in enumerate(page.tokens):
+                    append(columns["tokens"], doc_id, page_number, index, token.token, token)
+                    columns["tokens"]["line_index"].append(line_indices.get(id(token)))
+                for index, line in enumerate(page.lines):
+                    append(columns["lines"], doc_id, page_number, index, line.line, line)
+                    columns["lines"]["paragraph_index"].append(paragraph_indices.get(id(line)))
+                    columns["lines"]["num_tokens"].append(len(line.tokens))
+                for index, paragraph in enumerate(page.paragraphs):
+                    append(columns["paragraphs"], doc_id, page_number, index, paragraph.paragraph, paragraph)
+                    columns["paragraphs"]["num_lines"].append(len(paragraph.lines))
+                    columns["paragraphs"]["style"].append(paragraph.meta.get("style"))
+        return columns
+
+
+    def _write_table(
+        self,
+        level: str,
+        level_columns: dict[str, list],
+        output_dir: Path,
+        corpus_name: str,
+        columnar_format: str
+    ) -> Optional[Path]:
+        pa = _get_pyarrow()
+        if level_columns["doc_id"] == []:
+            return None
+        table = pa.table(level_columns, schema=get_columnar_schema(level))
+
+        level_dir = output_dir / f'{corpus_name}_{level}'
+        if not level_dir.exists():
+            level_dir.mkdir(parents=True)
+        output_path = level_dir / f'part-{self.writer_id}-{self.num_parts:05d}{COLUMNAR_EXTENSIONS[columnar_format]}'
+        if columnar_format == "parquet":
+            pa.parquet.write_table(table, str(output_path))
+        else:
+            with pa.OSFile(str(output_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        return output_path
+
+
+    def execute(
+        self,
+        documents: list[Document],
+        output_dir: str,
+        corpus_name: str = "corpus",
+        columnar_format: str = "parquet",
+        **kwargs: dict
+    ) -> list[Document]:
+        # init
+        self.check_args(self.execute, locals())
+        if columnar_format not in COLUMNAR_EXTENSIONS:
+            raise ValueError(
+                f"Unknown columnar format: {columnar_format}. Choose from {', '.join(COLUMNAR_EXTENSIONS)}."
+            )
+
+        columns = self._make_columns(documents)
+        for level in COLUMNAR_LEVELS:
+            output_path = self._write_table(level, columns[level], Path(output_dir), corpus_name, columnar_format)
+            if output_path is not None:
+                for doc in documents:
+                    self.add_output_path(doc, output_path)
+        self.num_parts += 1
+        return documents
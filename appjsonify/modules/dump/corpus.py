@@ -0,0 +1,126 @@
+import gzip
+import json
+import uuid
+from pathlib import Path
+
+# file extensions of shards by compression
+SHARD_EXTENSIONS = {"none": ".jsonl", "gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+def _get_zstandard():
+    try:
+        import zstandard
+    except ModuleNotFoundError:
+        raise ModuleNotFoundError("Please install zstandard by specifying `python -m pip install zstandard`!")
+    return zstandard
+
+
+class ShardedJSONLWriter:
+    """Append documents as lines of rotating JSONL shards.
+
+    Shards are named `{corpus_name}-{writer_id}-{shard:05d}.jsonl[.gz|.zst]`, where `writer_id` is unique
+    to each writer so that worker processes and later runs never write to the same file.
+    Each writer also appends `{corpus_name}-{writer_id}.index.jsonl`, which records the shard, byte offset
+    and byte length of each document. A compressed document is a gzip member or a zstd frame of its own,
+    so that it can be read by its offset and length while a whole shard is still a valid compressed file.
+    """
+    def __init__(
+        self,
+        output_dir: Path,
+        corpus_name: str = "corpus",
+        shard_size: int = 256,
+        compression: str = "none"
+    ):
+        """
+        Args:
+            output_dir (Path): An output directory.
+            corpus_name (str, optional): A prefix of the shard and index files. Defaults to "corpus".
+            shard_size (int, optional): The maximum size of a shard in megabytes. A document larger than this
+                forms a shard by itself. Defaults to 256.
+            compression (str, optional): One of `none`, `gzip` and `zstd`. Defaults to "none".
+        """
+        if compression not in SHARD_EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}. Choose from {', '.join(SHARD_EXTENSIONS)}.")
+        if shard_size <= 0:
+            raise ValueError(f'`shard_size` must be positive, but got {shard_size}.')
+        self.output_dir: Path = output_dir
+        self.corpus_name: str = corpus_name
+        self.max_shard_bytes: int = shard_size * 1024 * 1024
+        self.compression: str = compression
+        self.compressor = _get_zstandard().ZstdCompressor() if compression == "zstd" else None
+        self.writer_id: str = uuid.uuid4().hex[:8]
+        self.shard_index: int = 0
+        self.shard_bytes: int = 0
+        self.index_path: Path = output_dir / f'{corpus_name}-{self.writer_id}.index.jsonl'
+
+
+    @property
+    def shard_path(self) -> Path:
+        return self.output_dir \
+            / f'{self.corpus_name}-{self.writer_id}-{self.shard_index:05d}{SHARD_EXTENSIONS[self.compression]}'
+
+
+    def write(
+        self,
+        doc_id: str,
+        record: bytes
+    ):
+        """Append a serialised document without line breaks to the current shard.
+
+        Files are opened for each document so that everything written so far is complete
+        even if the process is killed.
+        """
+        data = record + b'\n'
+        if self.compression == "gzip":
+            data = gzip.compress(data)
+        elif self.compression == "zstd":
+            data = self.compressor.compress(data)
+
+        # rotate
+        if self.shard_bytes > 0 and self.shard_bytes + len(data) > self.max_shard_bytes:
+            self.shard_index += 1
+            self.shard_bytes = 0
+
+        with open(str(self.shard_path), 'ab') as f:
+            f.write(data)
+        entry = {"doc_id": doc_id, "shard": self.shard_path.name, "offset": self.shard_bytes, "length": len(data)}
+        with open(str(self.index_path), 'a') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.shard_bytes += len(data)
+        return
+
+
+def load_corpus_index(
+    output_dir: Path,
+    corpus_name: str = "corpus"
+) -> dict[str, dict]:
+    """Return index entries of a corpus by document ids.
+
+    If a document has been written more than once, e.g., by an incremental run, the latest entry is returned.
+    """
+    index: dict[str, dict] = {}
+    index_paths = sorted(
+        Path(output_dir).glob(f'{corpus_name}-*.index.jsonl'),
+        key=lambda index_path: index_path.stat().st_mtime
+    )
+    for index_path in index_paths:
+        with open(str(index_path)) as f:
+            for line in f:
+                entry = json.loads(line)
+                index[entry["doc_id"]] = entry
+    return index
+
+
+def read_corpus_document(
+    output_dir: Path,
+    entry: dict
+) -> dict:
+    """Read a document by its entry returned by `load_corpus_index`."""
+    with open(str(Path(output_dir) / entry["shard"]), 'rb') as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+    if entry["shard"].endswith(SHARD_EXTENSIONS["gzip"]):
+        data = gzip.decompress(data)
+    elif entry["shard"].endswith(SHARD_EXTENSIONS["zstd"]):
+        data = _get_zstandard().ZstdDecompressor().decompress(data)
+    return json.loads(data)
@@ -1,314 +1,213 @@
-import copy
-import json
 from pathlib import Path
 
 from tqdm.contrib import tenumerate
 
-from ..doc import Document
+from ..common import get_font_profile
+from ..doc import Document, Paragraph
 from ..runner import BaseRunner
+from .corpus import ShardedJSONLWriter
+from .serializer import dumps_json, get_json_backend, write_json
+
+
+class BaseJSONDumper(BaseRunner):
+    """Base class of the JSON dumpers.
+
+    Subclasses only define the body of a document and the suffix of its file name.
+    The header and writing a file are shared. With `corpus_jsonl`, documents are appended to
+    JSONL shards named after `{corpus_name}{suffix}` instead of written to a file each.
+    """
+    # `{stem}{suffix}.json` is written in `{output_dir}/{stem}/`
+    suffix: str = ""
+
+    def __init__(
+        self,
+        show_progress: bool = True,
+        inplace: bool = False
+    ):
+        super().__init__(show_progress, inplace)
+        # created by the first `execute` with `corpus_jsonl` and reused for the following documents
+        self.corpus_writer: ShardedJSONLWriter = None
+
+    @staticmethod
+    def _make_header(
+        doc: Document
+    ) -> dict:
+        """Return the document-level fields of an output JSON."""
+        meta = doc.meta
+        return {
+            'doc_name' : meta.get('Title') if meta.get('Title') is not None else doc.input_path.stem,
+            'author' : meta.get('Author') if meta.get('Author') is not None else '',
+            'creation_date' : meta.get('CreationDate') if meta.get('CreationDate') is not None else '',
+            'mod_date' : meta.get('ModDate') if meta.get('ModDate') is not None else '',
+            'tables': meta.get('tables') if meta.get('tables') is not None else '',
+            'figures': meta.get('figures') if meta.get('figures') is not None else '',
+            'footers': meta.get('footers') if meta.get('footers') is not None else '',
+            'font_profile': get_font_profile(doc).to_dict(),
+        }
+
+
+    @staticmethod
+    def _group_sections(
+        paragraphs: list[Paragraph]
+    ) -> list[dict]:
+        """Group paragraphs into sections by their styles."""
+        sections: list[dict] = []
+        section_group: dict = {
+            "title": "",
+            "content": []
+        }
+        for paragraph in paragraphs:
+            # TODO: More sophisticated way of structuring
+            if paragraph.meta["style"] in ("title", "section", "subsection"):
+                # register
+                if section_group["title"] != "" or section_group["content"] != []:
+                    sections.append(section_group)
+                # init
+                section_group = {
+                    "title": paragraph.paragraph,
+                    "content": []
+                }
+            else:
+                section_group["content"].append(paragraph.paragraph)
+        else:
+            if section_group["title"] != "" or section_group["content"] != []:
+                sections.append(section_group)
+        return sections
+
+
+    def _make_body(
+        self,
+        doc: Document
+    ) -> list:
+        """Return the body of an output JSON."""
+        raise NotImplementedError()
 
 
-@BaseRunner.register("dump_doc_with_tokens")
-class TokenLevelJSONDumper(BaseRunner):
-    """Export as a .json file structured with tokens."""
     def _process_by_doc(
         self,
         doc: Document,
-        output_dir: Path
-    ):      
+        output_dir: Path,
+        compact_json: bool,
+        json_backend: str
+    ):
         # init
-        formatted_doc: dict = {
-            'doc_name' : doc.meta.get('Title') if doc.meta.get('Title') is not None else doc.input_path.stem,
-            'author' : doc.meta.get('Author') if doc.meta.get('Author') is not None else '',
-            'creation_date' : doc.meta.get('CreationDate') if doc.meta.get('CreationDate') is not None else '',
-            'mod_date' : doc.meta.get('ModDate') if doc.meta.get('ModDate') is not None else '',
-            'tables': doc.meta.get('tables') if doc.meta.get('tables') is not None else '',
-            'figures': doc.meta.get('figures') if doc.meta.get('figures') is not None else '',
-            'footers': doc.meta.get('footers') if doc.meta.get('footers') is not None else '',
-            'body': []
-        }
-        
-        # process by page
-        for page in doc.pages:
-            for token in page.tokens:
-                if token.token != "":
-                    formatted_doc["body"].append(token.token)
-        
+        formatted_doc: dict = self._make_header(doc)
+        formatted_doc['body'] = self._make_body(doc)
+
         # make a directory if necessary
-        output_doc_dir = output_dir / doc.input_path.stem 
+        output_doc_dir = output_dir / doc.input_path.stem
         if not output_doc_dir.exists():
             output_doc_dir.mkdir()
-            
+
         # output as a json
-        output_path = output_dir / doc.input_path.stem / f'{doc.input_path.stem}_with_tokens.json'
-        with open(str(output_path), 'w') as f:
-            json.dump(formatted_doc, f, indent=4, ensure_ascii=False)
+        output_path = output_doc_dir / f'{doc.input_path.stem}{self.suffix}.json'
+        write_json(formatted_doc, output_path, compact_json, json_backend)
+        self.add_output_path(doc, output_path)
         return
-    
-    
-    def execute(
-        self, 
-        documents: list[Document],
-        output_dir: str,
-        **kwargs: dict
-    ) -> list[Document]:
-        # init
-        self.check_args(self.execute, locals())
-        
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            self._process_by_doc(doc, Path(output_dir))
-        return copied_documents
-    
 
-@BaseRunner.register("dump_doc_with_lines")
-class LineLevelJSONDumper(BaseRunner):
-    """Export as a .json file structured with lines."""
-    def _process_by_doc(
+
+    def _append_to_corpus(
         self,
         doc: Document,
-        output_dir: Path
+        json_backend: str
     ):
-        # init
-        formatted_doc: dict = {
-            'doc_name' : doc.meta.get('Title') if doc.meta.get('Title') is not None else doc.input_path.stem,
-            'author' : doc.meta.get('Author') if doc.meta.get('Author') is not None else '',
-            'creation_date' : doc.meta.get('CreationDate') if doc.meta.get('CreationDate') is not None else '',
-            'mod_date' : doc.meta.get('ModDate') if doc.meta.get('ModDate') is not None else '',
-            'tables': doc.meta.get('tables') if doc.meta.get('tables') is not None else '',
-            'figures': doc.meta.get('figures') if doc.meta.get('figures') is not None else '',
-            'footers': doc.meta.get('footers') if doc.meta.get('footers') is not None else '',
-            'body': []
-        }
-        
-        # process by page
-        for page in doc.pages:
-            for line in page.lines:
-                if line.line != "":
-                    formatted_doc["body"].append(line.line)
-        
-        # make a directory if necessary
-        output_doc_dir = output_dir / doc.input_path.stem 
-        if not output_doc_dir.exists():
-            output_doc_dir.mkdir()
-            
-        # output as a json
-        output_path = output_dir / doc.input_path.stem / f'{doc.input_path.stem}_with_lines.json'
-        with open(str(output_path), 'w') as f:
-            json.dump(formatted_doc, f, indent=4, ensure_ascii=False)
+        formatted_doc: dict = {'doc_id': doc.input_path.stem}
+        formatted_doc.update(self._make_header(doc))
+        formatted_doc['body'] = self._make_body(doc)
+        self.corpus_writer.write(doc.input_path.stem, dumps_json(formatted_doc, True, json_backend))
+        self.add_output_path(doc, self.corpus_writer.shard_path)
+        self.add_output_path(doc, self.corpus_writer.index_path)
         return
 
-    
+
     def execute(
-        self, 
+        self,
         documents: list[Document],
         output_dir: str,
+        compact_json: bool = False,
+        json_backend: str = "auto",
+        corpus_jsonl: bool = False,
+        corpus_name: str = "corpus",
+        shard_size: int = 256,
+        shard_compression: str = "none",
         **kwargs: dict
     ) -> list[Document]:
         # init
         self.check_args(self.execute, locals())
-        
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            self._process_by_doc(doc, Path(output_dir))
-        return copied_documents
+        # fail before processing any documents if the backend is not available
+        # shards of a corpus are always compact
+        json_backend = get_json_backend(json_backend, compact_json or corpus_jsonl)
+        if corpus_jsonl and (self.corpus_writer is None or self.corpus_writer.output_dir != Path(output_dir)):
+            self.corpus_writer = ShardedJSONLWriter(
+                Path(output_dir), f'{corpus_name}{self.suffix}', shard_size, shard_compression
+            )
 
+        for _, doc in tenumerate(documents, total=len(documents), disable=not self.show_progress):
+            if corpus_jsonl:
+                self._append_to_corpus(doc, json_backend)
+            else:
+                self._process_by_doc(doc, Path(output_dir), compact_json, json_backend)
+        return documents
+
+
+@BaseRunner.register("dump_doc_with_tokens")
+class TokenLevelJSONDumper(BaseJSONDumper):
+    """Export as a .json file structured with tokens."""
+    suffix = "_with_tokens"
+
+    def _make_body(
+        self,
+        doc: Document
+    ) -> list[str]:
+        return [token.token for page in doc.pages for token in page.tokens if token.token != ""]
+
+
+@BaseRunner.register("dump_doc_with_lines")
+class LineLevelJSONDumper(BaseJSONDumper):
+    """Export as a .json file structured with lines."""
+    suffix = "_with_lines"
+
+    def _make_body(
+        self,
+        doc: Document
+    ) -> list[str]:
+        return [line.line for page in doc.pages for line in page.lines if line.line != ""]
 
 
 @BaseRunner.register("dump_doc_with_paragraphs")
-class ParagraphLevelJSONDumper(BaseRunner):
+class ParagraphLevelJSONDumper(BaseJSONDumper):
     """Export as a .json file structured with paragraphs."""
-    def _process_by_doc(
-        self,
-        doc: Document,
-        output_dir: Path
-    ):
-        # init
-        formatted_doc: dict = {
-            'doc_name' : doc.meta.get('Title') if doc.meta.get('Title') is not None else doc.input_path.stem,
-            'author' : doc.meta.get('Author') if doc.meta.get('Author') is not None else '',
-            'creation_date' : doc.meta.get('CreationDate') if doc.meta.get('CreationDate') is not None else '',
-            'mod_date' : doc.meta.get('ModDate') if doc.meta.get('ModDate') is not None else '',
-            'tables': doc.meta.get('tables') if doc.meta.get('tables') is not None else '',
-            'figures': doc.meta.get('figures') if doc.meta.get('figures') is not None else '',
-            'footers': doc.meta.get('footers') if doc.meta.get('footers') is not None else '',
-            'body': []
-        }
-        
-        # process by page
-        for page in doc.pages:
-            for paragraph in page.paragraphs:
-                if paragraph.paragraph != "":
-                    formatted_doc["body"].append(paragraph.paragraph)
-        
-        # make a directory if necessary
-        output_doc_dir = output_dir / doc.input_path.stem 
-        if not output_doc_dir.exists():
-            output_doc_dir.mkdir()
-        
-        # output as a json
-        output_path = output_dir / doc.input_path.stem / f'{doc.input_path.stem}_with_paragraphs.json'
-        with open(str(output_path), 'w') as f:
-            json.dump(formatted_doc, f, indent=4, ensure_ascii=False)
-        return
+    suffix = "_with_paragraphs"
 
-    
-    def execute(
-        self, 
-        documents: list[Document],
-        output_dir: str,
-        **kwargs: dict
-    ) -> list[Document]:
-        # init
-        self.check_args(self.execute, locals())
-        
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            self._process_by_doc(doc, Path(output_dir))
-        return copied_documents
+    def _make_body(
+        self,
+        doc: Document
+    ) -> list[str]:
+        return [
+            paragraph.paragraph for page in doc.pages for paragraph in page.paragraphs
+            if paragraph.paragraph != ""
+        ]
 
 
 @BaseRunner.register("dump_doc_with_sections")
-class SectionLevelJSONDumper(BaseRunner):
+class SectionLevelJSONDumper(BaseJSONDumper):
     """Export as a .json file structured with sections."""
-    def _process_by_doc(
+    suffix = "_with_sections"
+
+    def _make_body(
         self,
-        doc: Document,
-        output_dir: Path
-    ):
-        # init
-        formatted_doc: dict = {
-            'doc_name' : doc.meta.get('Title') if doc.meta.get('Title') is not None else doc.input_path.stem,
-            'author' : doc.meta.get('Author') if doc.meta.get('Author') is not None else '',
-            'creation_date' : doc.meta.get('CreationDate') if doc.meta.get('CreationDate') is not None else '',
-            'mod_date' : doc.meta.get('ModDate') if doc.meta.get('ModDate') is not None else '',
-            'tables': doc.meta.get('tables') if doc.meta.get('tables') is not None else '',
-            'figures': doc.meta.get('figures') if doc.meta.get('figures') is not None else '',
-            'footers': doc.meta.get('footers') if doc.meta.get('footers') is not None else '',
-            'body': []
-        }
-        section_group: dict = {
-            "title": "",
-            "content": []
-        }
-        
-        # process by page
-        for page in doc.pages:
-            for paragraph in page.paragraphs:
-                # TODO: More sophisticated way of structuring
-                if paragraph.meta["style"] in ("title", "section", "subsection"):
-                    # register
-                    if section_group["title"] != "" or section_group["content"] != []:
-                        formatted_doc["body"].append(section_group)
-                    # init
-                    section_group = {
-                        "title": paragraph.paragraph,
-                        "content": []
-                    }
-                else:
-                    section_group["content"].append(paragraph.paragraph)
-        else:
-            if section_group["title"] != "" or section_group["content"] != []:
-                formatted_doc["body"].append(section_group)
-        
-        # make a directory if necessary
-        output_doc_dir = output_dir / doc.input_path.stem 
-        if not output_doc_dir.exists():
-            output_doc_dir.mkdir()
-         
-        # output as a json
-        output_path = output_dir / doc.input_path.stem / f'{doc.input_path.stem}_with_sections.json'
-        with open(str(output_path), 'w') as f:
-            json.dump(formatted_doc, f, indent=4, ensure_ascii=False)
-        return
-    
-    
-    def execute(
-        self, 
-        documents: list[Document],
-        output_dir: str,
-        **kwargs: dict
-    ) -> list[Document]:
-        # init
-        self.check_args(self.execute, locals())
-        
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            self._process_by_doc(doc, Path(output_dir))
-        return copied_documents
+        doc: Document
+    ) -> list[dict]:
+        return self._group_sections(
+            [paragraph for page in doc.pages for paragraph in page.paragraphs]
+        )
 
 
 @BaseRunner.register("dump_formatted_doc")
-class FormattedDocJSONDumper(BaseRunner):
+class FormattedDocJSONDumper(BaseJSONDumper):
     """Export as a .json file structured with sections."""
-    def _process_by_doc(
+    def _make_body(
         self,
-        doc: Document,
-        output_dir: Path
-    ):
-        # init
-        formatted_doc: dict = {
-            'doc_name' : doc.meta.get('Title') if doc.meta.get('Title') is not None else doc.input_path.stem,
-            'author' : doc.meta.get('Author') if doc.meta.get('Author') is not None else '',
-            'creation_date' : doc.meta.get('CreationDate') if doc.meta.get('CreationDate') is not None else '',
-            'mod_date' : doc.meta.get('ModDate') if doc.meta.get('ModDate') is not None else '',
-            'tables': doc.meta.get('tables') if doc.meta.get('tables') is not None else '',
-            'figures': doc.meta.get('figures') if doc.meta.get('figures') is not None else '',
-            'footers': doc.meta.get('footers') if doc.meta.get('footers') is not None else '',
-            'body': []
-        }
-        section_group: dict = {
-            "title": "",
-            "content": []
-        }
-        
-        # process by paragraph
-        for paragraph in doc.formatted_paragraphs:
-            # TODO: More sophisticated way of structuring
-            if paragraph.meta["style"] in ("title", "section", "subsection"):
-                # register
-                if section_group["title"] != "" or section_group["content"] != []:
-                    formatted_doc["body"].append(section_group)
-                # inits
-                section_group = {
-                    "title": paragraph.paragraph,
-                    "content": []
-                }
-            else:
-                section_group["content"].append(paragraph.paragraph)
-        else:
-            if section_group["title"] != "" or section_group["content"] != []:
-                formatted_doc["body"].append(section_group)
-        
-        # make a directory if necessary
-        output_doc_dir = output_dir / doc.input_path.stem 
-        if not output_doc_dir.exists():
-            output_doc_dir.mkdir()
-           
-        # output as a json
-        output_path = output_dir / doc.input_path.stem / f'{doc.input_path.stem}.json'
-        with open(str(output_path), 'w') as f:
-            json.dump(formatted_doc, f, indent=4, ensure_ascii=False)
-        return
-    
-    
-    def execute(
-        self, 
-        documents: list[Document],
-        output_dir: str,
-        **kwargs: dict
-    ) -> list[Document]:
-        # init
-        self.check_args(self.execute, locals())
-        
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            self._process_by_doc(doc, Path(output_dir))
-        return copied_documents
+        doc: Document
+    ) -> list[dict]:
+        return self._group_sections(doc.formatted_paragraphs)
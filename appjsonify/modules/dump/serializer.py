@@ -0,0 +1,78 @@
+import functools
+import importlib.util
+import json
+from pathlib import Path
+from typing import Any
+
+# JSON backends in order of preference for `auto`
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+@functools.lru_cache(maxsize=None)
+def get_json_backend(backend: str = "auto", compact: bool = False) -> str:
+    """Return the name of an available JSON backend.
+
+    Args:
+        backend (str, optional): One of `auto`, `orjson`, `msgspec` and `json`.
+            For compact output, `auto` picks the first installed one of `orjson` and `msgspec`,
+            falling back to the standard `json`. Indented output is always written by the standard `json`
+            with `auto` so that it stays the same whichever libraries are installed. Defaults to "auto".
+        compact (bool, optional): Whether the output is compact. Defaults to False.
+
+    Returns:
+        str: The name of the backend.
+    """
+    if backend == "auto":
+        if not compact:
+            return "json"
+        for name in JSON_BACKENDS:
+            if importlib.util.find_spec(name) is not None:
+                return name
+    elif backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}. Choose from auto, {', '.join(JSON_BACKENDS)}.")
+    elif importlib.util.find_spec(backend) is None:
+        raise ModuleNotFoundError(f"Please install {backend} by specifying `python -m pip install {backend}`!")
+    return backend
+
+
+def dumps_json(
+    obj: Any,
+    compact: bool = False,
+    backend: str = "auto"
+) -> bytes:
+    """Serialise an object into UTF-8 encoded JSON.
+
+    Non-ASCII characters are written as they are. Indented output uses four spaces
+    except for `orjson`, which only supports two.
+
+    Args:
+        obj (Any): A JSON-serialisable object.
+        compact (bool, optional): Whether to write without indents and spaces. Defaults to False.
+        backend (str, optional): A backend name accepted by `get_json_backend`. Defaults to "auto".
+
+    Returns:
+        bytes: A serialised object.
+    """
+    backend = get_json_backend(backend, compact)
+    if backend == "orjson":
+        import orjson
+        return orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    elif backend == "msgspec":
+        import msgspec
+        encoded = msgspec.json.encode(obj)
+        return encoded if compact else msgspec.json.format(encoded, indent=4)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def write_json(
+    obj: Any,
+    output_path: Path,
+    compact: bool = False,
+    backend: str = "auto"
+):
+    """Write an object as a JSON file. See `dumps_json` for the arguments."""
+    with open(str(output_path), 'wb') as f:
+        f.write(dumps_json(obj, compact, backend))
+    return
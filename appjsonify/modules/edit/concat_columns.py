@@ -1,4 +1,3 @@
-import copy
 import re
 from collections import Counter
 
@@ -98,10 +97,10 @@ class RuleBasedColumnConcatenator(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 self._process_by_page(
                     page,
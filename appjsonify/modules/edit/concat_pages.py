@@ -1,4 +1,3 @@
-import copy
 import re
 from collections import Counter
 
@@ -147,9 +146,9 @@ class RuleBasedPageConcatenator(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
         docs: list[Document] = []
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             docs.append(self._process_by_doc(doc, consider_font_size))   
         return docs
@@ -1,10 +1,9 @@
-import copy
 import re
 
 from tqdm.contrib import tenumerate
 
-from ..common import (get_font_specs_config, get_math_font_names,
-                      get_most_common_font_name, get_most_common_font_size)
+from ..common import (get_font_profile, get_font_specs_config,
+                      get_math_font_names, strip_font_subset)
 from ..doc import Document, Page, Paragraph
 from ..runner import BaseRunner
 
@@ -28,7 +27,7 @@ class RuleBasedSectionDetector(BaseRunner):
             paragraph_len = len(ret_headline.groups()[2].split(' '))
             if paragraph_len <= max_headline_len and paragraph_len > 0 \
                 and paragraph.font_size >= most_common_font_size \
-                and (paragraph.font_name.split('+')[1] != most_common_font_name \
+                and (strip_font_subset(paragraph.font_name) != most_common_font_name \
                     or capilitzed_headline_ptn.match(ret_headline.groups()[2]) is not None):
                 # Possibly a section
                 style = "section"
@@ -81,10 +80,7 @@ class RuleBasedSectionDetector(BaseRunner):
                 most_common_font_name = transposed_font_specs["body"][1]
             prev_style: str = None
             for paragraph in page.paragraphs:
-                try:
-                    font_spec = (paragraph.font_size, paragraph.font_name.split('+')[1])
-                except IndexError:
-                    font_spec = (paragraph.font_size, paragraph.font_name)
+                font_spec = (paragraph.font_size, strip_font_subset(paragraph.font_name))
                 # check if the font name is not a math one
                 style: str = None
                 if type(math_font_names) is not str:
@@ -156,24 +152,24 @@ class RuleBasedSectionDetector(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
         if paper_type is not None:
             font_specs = get_font_specs_config(paper_type)
             math_font_names = get_math_font_names(paper_type)
         else:
             font_specs = None
             math_font_names = None
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             # get most_common_font_size
             if doc.meta.get("most_common_font_size") is None:
-                most_common_font_size = get_most_common_font_size(doc)
+                most_common_font_size = get_font_profile(doc).most_common_font_size
                 doc.meta["most_common_font_size"] = most_common_font_size
             else:
                 most_common_font_size = doc.meta["most_common_font_size"]
             # get most_common_font_name
             if doc.meta.get("most_common_font_name") is None:
-                most_common_font_name = get_most_common_font_name(doc)
+                most_common_font_name = get_font_profile(doc).most_common_font_name
                 doc.meta["most_common_font_name"] = most_common_font_name
             else:
                 most_common_font_name = doc.meta["most_common_font_name"]
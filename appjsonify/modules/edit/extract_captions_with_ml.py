@@ -1,10 +1,9 @@
 import re
-import copy
 import math
 
 from tqdm.contrib import tenumerate
 
-from ..common import check_token_overlap
+from ..common import batch_check_token_overlap
 from ..doc import Document, Line, Page, Token
 from ..runner import BaseRunner
 
@@ -162,16 +161,15 @@ class MLBasedCaptionExtractor(BaseRunner):
             figures = []
             
         # remove captions from lines
-        lines: list[Line] = []
-        for line in page.lines:
-            to_be_removed: bool = False
-            if page.meta.get("captions") != []:
-                for caption in page.meta.get("captions"):
-                    if check_token_overlap(caption.pos, line.pos, threshold=threshold):
-                        to_be_removed = True
-                        break
-            if to_be_removed is False:
-                lines.append(line)
+        overlaps = batch_check_token_overlap(
+            [caption.pos for caption in page.meta.get("captions")],
+            [line.pos for line in page.lines],
+            threshold=threshold
+        )
+        lines: list[Line] = [
+            line for line, to_be_removed in zip(page.lines, overlaps.any(axis=0))
+            if not to_be_removed
+        ]
         
         return Page(
             page.paragraphs,
@@ -198,10 +196,10 @@ class MLBasedCaptionExtractor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             pages: list[Page] = []
             for page in doc.pages:
                 pages.append(
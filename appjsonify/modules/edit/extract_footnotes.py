@@ -1,9 +1,8 @@
-import copy
 from collections import Counter
 
 from tqdm.contrib import tenumerate
 
-from ..common import get_most_common_font_size
+from ..common import get_font_profile
 from ..doc import Document, Line, Page
 from ..runner import BaseRunner
 
@@ -81,14 +80,14 @@ class RuleBasedFootnoteExtractor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
 
         # remove meta information by page
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             # get most_common_font_size
             if doc.meta.get("most_common_font_size") is None:
-                most_common_font_size = get_most_common_font_size(doc)
+                most_common_font_size = get_font_profile(doc).most_common_font_size
                 doc.meta["most_common_font_size"] = most_common_font_size
             else:
                 most_common_font_size = doc.meta["most_common_font_size"]
@@ -1,10 +1,9 @@
 import re
-import copy
 import math
 
 from tqdm.contrib import tenumerate
 
-from ..common import check_token_overlap
+from ..common import batch_check_token_overlap
 from ..doc import Document, Line, Page
 from ..runner import BaseRunner
 
@@ -21,28 +20,24 @@ class MLBasedFootnoteExtractor(BaseRunner):
         if page.meta.get("footers") == [] and page.meta.get("footers") is not None:
             return page
         
+        # (footers, lines) mask
+        overlaps = batch_check_token_overlap(
+            [footer.pos for footer in page.meta["footers"]],
+            [line.pos for line in page.lines],
+            threshold=threshold
+        )
+
         # extract footnotes
-        footnotes: list[list[Line]] = []
-        for footer in page.meta["footers"]:
-            footnote: list[Line] = []
-            for line in page.lines:
-                if check_token_overlap(
-                    footer.pos, line.pos, threshold=threshold
-                ):
-                    footnote.append(line) 
-            footnotes.append(footnote)
+        footnotes: list[list[Line]] = [
+            [line for line, overlap in zip(page.lines, footer_overlaps) if overlap]
+            for footer_overlaps in overlaps
+        ]
         
         # remove footers from lines
-        lines: list[Line] = []
-        for line in page.lines:
-            to_be_removed: bool = False
-            if page.meta.get("footers") != []:
-                for footer in page.meta.get("footers"):
-                    if check_token_overlap(footer.pos, line.pos, threshold=threshold):
-                        to_be_removed = True
-                        break
-            if to_be_removed is False:
-                lines.append(line)
+        lines: list[Line] = [
+            line for line, to_be_removed in zip(page.lines, overlaps.any(axis=0))
+            if not to_be_removed
+        ]
         
         return Page(
             page.paragraphs,
@@ -63,10 +58,10 @@ class MLBasedFootnoteExtractor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             pages: list[Page] = []
             for page in doc.pages:
                 pages.append(
@@ -1,8 +1,6 @@
-import copy
 from collections import Counter
 from typing import Any
 
-import numpy as np
 from tqdm.contrib import tenumerate
 
 from ..doc import Document, Line, Token
@@ -36,6 +34,8 @@ class LineExtractor(BaseRunner):
             "y0": -1, 
             "x1": -1, 
             "y1": -1, 
+            "y0_sum": 0,
+            "y1_sum": 0,
             "font_size": [],
             "font_name": [], 
             "init": True
@@ -53,14 +53,18 @@ class LineExtractor(BaseRunner):
                     "y0": [token.pos[1]], 
                     "x1": token.pos[2], 
                     "y1": [token.pos[3]],  
+                    "y0_sum": token.pos[1],
+                    "y1_sum": token.pos[3],
                     "font_size": [token.font_size], 
                     "font_name": [token.font_name],
                     "init": True
                 }
                 line_min_y0, line_max_y1 = token.pos[1], token.pos[3]
             else:
-                if abs(token.pos[1] - np.mean(cache["y0"], dtype=int)) <= y_tolerance \
-                    or abs(token.pos[3] - np.mean(cache["y1"], dtype=int)) <= y_tolerance:
+                # compare with the mean positions of the line truncated to integers,
+                # which are kept as running sums to avoid summing up the line for every token
+                if abs(token.pos[1] - int(cache["y0_sum"] / len(cache["y0"]))) <= y_tolerance \
+                    or abs(token.pos[3] - int(cache["y1_sum"] / len(cache["y1"]))) <= y_tolerance:
                     #####
                     # token in the same line => merge
                     #####
@@ -72,6 +76,8 @@ class LineExtractor(BaseRunner):
                     cache["tokens"].append(token)
                     cache["y0"].append(token.pos[1])
                     cache["y1"].append(token.pos[3])
+                    cache["y0_sum"] += token.pos[1]
+                    cache["y1_sum"] += token.pos[3]
                     cache["font_size"].append(token.font_size)
                     cache["font_name"].append(token.font_name)
                     cache["init"] = False
@@ -111,6 +117,8 @@ class LineExtractor(BaseRunner):
                         "y0": [token.pos[1]], 
                         "x1": token.pos[2], 
                         "y1": [token.pos[3]],  
+                        "y0_sum": token.pos[1],
+                        "y1_sum": token.pos[3],
                         "font_size": [token.font_size], 
                         "font_name": [token.font_name],
                         "init": True
@@ -171,12 +179,12 @@ class LineExtractor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
 
         # extract lines
         docs: list[Document] = []
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             docs.append(
                 self._process_by_doc(
                     doc,
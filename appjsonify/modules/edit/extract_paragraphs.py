@@ -1,4 +1,3 @@
-import copy
 import re
 from collections import Counter
 
@@ -12,10 +11,32 @@ from ..runner import BaseRunner
 @BaseRunner.register("extract_paragraphs")
 class RuleBasedParagraphExtractor(BaseRunner):
     """Concatenate line elements if they are in the same paragraph."""
+    # a line ending with a sentence terminator
+    # (equivalent to `.*?[.!?:;]”?\s*[0-9]*$` without scanning from every position)
+    str_end_ptn = re.compile(r"[.!?:;]”?\s*[0-9]*$")
+    # TODO: Add more listing styles if necessary
+    # references
+    str_start_ptn_1 = re.compile(r"^[\[\(]?\d+[0-9\.]*[\]\)]?")
+    # appendix
+    str_start_ptn_2 = re.compile(r"^[A-Z]{1}[0-9\.]*\s")
+    # listing
+    str_start_ptn_3 = re.compile(r"^\-|–|•")
+
     @staticmethod
     def gather_as_list(line: Line, target_name: str) -> list:
         return [getattr(token, target_name) for token in line.tokens]
     
+    def _get_line_features(self, line: Line) -> dict:
+        """Compute the features of a line that merge decisions refer to."""
+        return {
+            "listing_start": self.str_start_ptn_1.search(line.line) is not None \
+                or self.str_start_ptn_2.match(line.line) is not None \
+                or self.str_start_ptn_3.search(line.line) is not None,
+            "sentence_end": self.str_end_ptn.search(line.line) is not None,
+            "font_size": self.gather_as_list(line, "font_size"),
+            "font_name": self.gather_as_list(line, "font_name")
+        }
+    
     def _process_by_page(
         self, 
         page: Page,
@@ -28,6 +49,7 @@ class RuleBasedParagraphExtractor(BaseRunner):
         # init
         paragraphs: list[Paragraph] = []
         prev_line: Line = None
+        prev_features: dict = None
         is_listing: bool = False
         cache: dict = {
             "line": [], 
@@ -40,21 +62,15 @@ class RuleBasedParagraphExtractor(BaseRunner):
             "font_name": [], 
             "init": True
         }
-        str_end_ptn = re.compile(r".*?[.!?:;]”?\s*[0-9]*$")
-        # TODO: Add more listing styles if necessary
-        # references
-        str_start_ptn_1 = re.compile(r"^[\[\(]?\d+[0-9\.]*[\]\)]?")
-        # appendix
-        str_start_ptn_2 = re.compile(r"^[A-Z]{1}[0-9\.]*\s")
-        # listing
-        str_start_ptn_3 = re.compile(r"^\-|–|•")
+        # compute features once per line instead of in every condition below
+        line_features: list[dict] = [self._get_line_features(line) for line in page.lines]
 
         # process by line 
-        for line in page.lines:
+        for line, features in zip(page.lines, line_features):
             if prev_line is None:
                 # init
-                font_size_list = self.gather_as_list(line, "font_size")
-                font_name_list = self.gather_as_list(line, "font_name")
+                font_size_list = list(features["font_size"])
+                font_name_list = list(features["font_name"])
                 cache: dict = {
                     "line": [line.line], 
                     "lines": [line], 
@@ -82,10 +98,13 @@ class RuleBasedParagraphExtractor(BaseRunner):
                 if listing_offset is None:
                     listing_offset = int(line.font_size * 6)
                 
+                # prev_line begins a listing paragraph
+                listing_cond = prev_features["listing_start"] \
+                    and 0 <= (line.pos[0] - prev_line.pos[0]) <= listing_offset
+                
                 if ((abs(line.pos[0] - prev_line.pos[0]) <= x_offset) \
                         or (0 <= (prev_line.pos[0] - line.pos[0]) <= indent_offset and is_listing is False) \
-                        or ((str_start_ptn_1.search(prev_line.line) is not None or str_start_ptn_2.match(prev_line.line) is not None or str_start_ptn_3.search(prev_line.line) is not None) \
-                            and 0 <= (line.pos[0] - prev_line.pos[0]) <= listing_offset)) \
+                        or listing_cond) \
                     and font_cond \
                     and abs(line.pos[2] - prev_line.pos[2]) <= x_offset \
                     and abs(line.pos[1] - prev_line.pos[3]) <= y_offset:
@@ -95,8 +114,7 @@ class RuleBasedParagraphExtractor(BaseRunner):
                     # -- Condition 2: prev_line should be the beginning of a paragraph (indent).
                     # -- Condition 3: prev_line should be the beginning of a listing paragraph (listing).
                     #####
-                    if (str_start_ptn_1.search(prev_line.line) is not None or str_start_ptn_2.match(prev_line.line) is not None or str_start_ptn_3.search(prev_line.line) is not None) \
-                        and 0 <= (line.pos[0] - prev_line.pos[0]) <= listing_offset:
+                    if listing_cond:
                         is_listing = True
                     
                     if cache["line"][-1].endswith("-"):
@@ -105,20 +123,17 @@ class RuleBasedParagraphExtractor(BaseRunner):
                     else:
                         cache["line"].append(line.line)
                     cache["lines"].append(line)
-                    font_size_list = self.gather_as_list(line, "font_size")
-                    cache["font_size"].extend(font_size_list)
-                    font_name_list = self.gather_as_list(line, "font_name")
-                    cache["font_name"].extend(font_name_list)
+                    cache["font_size"].extend(features["font_size"])
+                    cache["font_name"].extend(features["font_name"])
                     cache["init"] = False
                     if line.pos[0] < paragraph_min_x0:
                         paragraph_min_x0 = line.pos[0]
                     if line.pos[2] > paragraph_max_x1:
                         paragraph_max_x1 = line.pos[2]
 
-                elif ((abs(line.pos[0] - prev_line.pos[0]) <= x_offset and str_end_ptn.search(line.line) is not None) \
-                        or (0 <= (prev_line.pos[0] - line.pos[0]) <= indent_offset and str_end_ptn.search(line.line) is not None and is_listing is False) \
-                        or (str_start_ptn_1.search(prev_line.line) is not None or str_start_ptn_2.match(prev_line.line) is not None or str_start_ptn_3.search(prev_line.line) is not None) \
-                            and 0 <= (line.pos[0] - prev_line.pos[0]) <= listing_offset
+                elif ((abs(line.pos[0] - prev_line.pos[0]) <= x_offset and features["sentence_end"]) \
+                        or (0 <= (prev_line.pos[0] - line.pos[0]) <= indent_offset and features["sentence_end"] and is_listing is False) \
+                        or listing_cond \
                         or (abs(line.pos[0] - prev_line.pos[0]) <= x_offset and is_listing is True)) \
                     and font_cond \
                     and (prev_line.pos[2] - line.pos[2]) > x_offset \
@@ -136,10 +151,8 @@ class RuleBasedParagraphExtractor(BaseRunner):
                     else:
                         cache["line"].append(line.line)
                     cache["lines"].append(line)
-                    font_size_list = self.gather_as_list(line, "font_size")
-                    cache["font_size"].extend(font_size_list)
-                    font_name_list = self.gather_as_list(line, "font_name")
-                    cache["font_name"].extend(font_name_list)
+                    cache["font_size"].extend(features["font_size"])
+                    cache["font_name"].extend(features["font_name"])
                     cache["init"] = False
                     if line.pos[0] < paragraph_min_x0:
                         paragraph_min_x0 = line.pos[0]
@@ -204,8 +217,8 @@ class RuleBasedParagraphExtractor(BaseRunner):
                             )
                     
                     # clear cache
-                    font_size_list = self.gather_as_list(line, "font_size")
-                    font_name_list = self.gather_as_list(line, "font_name")
+                    font_size_list = list(features["font_size"])
+                    font_name_list = list(features["font_name"])
                     cache: dict = {
                         "line": [line.line], 
                         "lines": [line], 
@@ -222,6 +235,7 @@ class RuleBasedParagraphExtractor(BaseRunner):
                 
             # update prev_line
             prev_line = line
+            prev_features = features
             
         else:
             # end of for loop
@@ -264,10 +278,10 @@ class RuleBasedParagraphExtractor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 paragraphs = self._process_by_page(
                     page, x_offset, y_offset, consider_font_size, indent_offset, listing_offset
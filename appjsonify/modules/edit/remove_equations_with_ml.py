@@ -1,9 +1,8 @@
-import copy
 from tqdm.contrib import tenumerate
 
 from ..runner import BaseRunner
 from ..doc import Document, Page, Line
-from ..common import check_token_overlap
+from ..common import batch_check_token_overlap
 
 
 @BaseRunner.register("remove_equations_with_ml")
@@ -14,16 +13,16 @@ class MLBasedEquationRemover(BaseRunner):
         page: Page,
         threshold: float
     ):
-        lines: list[Line] = []
-        for line in page.lines:
-            to_be_removed: bool = False
-            if page.meta.get("equations") != []:
-                for equation in page.meta.get("equations"):
-                    if check_token_overlap(equation.pos, line.pos, threshold=threshold):
-                        to_be_removed = True
-                        break
-            if to_be_removed is False:
-                lines.append(line)
+        # (equations, lines) mask
+        overlaps = batch_check_token_overlap(
+            [equation.pos for equation in page.meta.get("equations")],
+            [line.pos for line in page.lines],
+            threshold=threshold
+        )
+        lines: list[Line] = [
+            line for line, to_be_removed in zip(page.lines, overlaps.any(axis=0))
+            if not to_be_removed
+        ]
         page.lines = lines
         return                    
 
@@ -37,10 +36,10 @@ class MLBasedEquationRemover(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 self._process_by_page(page, equation_overlap_threshold)
         return copied_documents
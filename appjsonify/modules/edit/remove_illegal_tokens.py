@@ -1,8 +1,10 @@
 import copy
+import functools
 from tqdm.contrib import tenumerate
 import re
 import difflib
 
+from ..common import FontProfile
 from ..doc import Document, Token
 from ..runner import BaseRunner
 
@@ -10,14 +12,21 @@ from ..runner import BaseRunner
 @BaseRunner.register("remove_illegal_tokens")
 class IllegalTokenRemover(BaseRunner):
     """Remove illegal token."""
+    illegal_char_ptn = re.compile(r'\(cid:[0-9]+\)')
+
     @staticmethod
+    @functools.lru_cache(maxsize=1 << 16)
     def _check_code(
         token: str
     ) -> str:
+        # fast path: nothing to compare if `repr` does not escape any character,
+        # which is the case for almost all tokens
+        if repr(token)[1:-1] == token:
+            return IllegalTokenRemover.illegal_char_ptn.sub('', token)
+
         # init
         copied_token = copy.copy(token)
         copied_token = copied_token.encode('utf-8').decode('utf-8')
-        illegal_char_ptn = re.compile(r'\(cid:[0-9]+\)')
         
         # search illegal chars
         illegal_chars = []
@@ -30,7 +39,7 @@ class IllegalTokenRemover(BaseRunner):
         # replace illegal chars with blanks
         for illegal_char in illegal_chars:
             copied_token = copied_token.replace(illegal_char, '')
-        copied_token = illegal_char_ptn.sub('', copied_token)
+        copied_token = IllegalTokenRemover.illegal_char_ptn.sub('', copied_token)
                 
         return copied_token
 
@@ -43,11 +52,11 @@ class IllegalTokenRemover(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
         
         # extract lines
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 ret_tokens: list[Token] = []
                 for token in page.tokens:
@@ -64,5 +73,7 @@ class IllegalTokenRemover(BaseRunner):
                         )
                 # update tokens
                 page.tokens = ret_tokens
+            # update font statistics as tokens are removed
+            doc.meta["font_profile"] = FontProfile.from_document(doc)
         
         return copied_documents
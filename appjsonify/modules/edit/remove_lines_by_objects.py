@@ -1,9 +1,8 @@
-import copy
 from tqdm.contrib import tenumerate
 
 from ..runner import BaseRunner
 from ..doc import Document, Page, Line, Token
-from ..common import judge_within_bbox
+from ..common import BboxIndex, judge_within_bbox
 
 
 @BaseRunner.register("remove_lines_by_objects")
@@ -30,6 +29,12 @@ class RuleBasedLineRemoverByObjects(BaseRunner):
                 cross_lines.append(line.pos)
         rects: list[tuple[int]] = [rect.pos for rect in page.meta["rects"]]
         curves: list[tuple[int]] = [curve.pos for curve in page.meta["curves"]]
+        # only objects near a line can affect it
+        vertical_line_index = BboxIndex(vertical_lines)
+        horizontal_line_index = BboxIndex(horizontal_lines)
+        cross_line_index = BboxIndex(cross_lines)
+        rect_index = BboxIndex(rects)
+        curve_index = BboxIndex(curves)
         
         # process by line
         ret_lines: list[Line] = []
@@ -40,21 +45,24 @@ class RuleBasedLineRemoverByObjects(BaseRunner):
             # decision based on lines
             skip_line: bool = False
             if remove_by_line:
-                for vline in vertical_lines:
+                for index in vertical_line_index.query(line.pos, object_bbox_offset):
+                    vline = vertical_lines[index]
                     if (abs(x0 - vline[0]) < object_bbox_offset or abs(x1 - vline[2]) < object_bbox_offset) \
                         and (y0 >= (vline[1] - object_bbox_offset) and y1 <= (vline[3] + object_bbox_offset)):
                         skip_line = True
                         break
                 if skip_line:
                     continue
-                for hline in horizontal_lines:
+                for index in horizontal_line_index.query(line.pos, object_bbox_offset):
+                    hline = horizontal_lines[index]
                     if (abs(y0 - hline[1]) < object_bbox_offset or abs(y1 - hline[3]) < object_bbox_offset) \
                         and (x0 >= (hline[0] - object_bbox_offset) and x1 <= (hline[2] + object_bbox_offset)):
                         skip_line = True
                         break
                 if skip_line:
                     continue
-                for cline in cross_lines:
+                for index in cross_line_index.query(line.pos, object_bbox_offset):
+                    cline = cross_lines[index]
                     ref_bbox: tuple[int] = (
                         cline[0] - object_bbox_offset,
                         cline[1] - object_bbox_offset,
@@ -69,7 +77,8 @@ class RuleBasedLineRemoverByObjects(BaseRunner):
 
             # decision based on rects
             if remove_by_rect:
-                for rect in rects:
+                for index in rect_index.query(line.pos, object_bbox_offset):
+                    rect = rects[index]
                     ref_bbox: tuple[int] = (
                         rect[0] - object_bbox_offset,
                         rect[1] - object_bbox_offset,
@@ -84,7 +93,8 @@ class RuleBasedLineRemoverByObjects(BaseRunner):
             
             # decision based on curves
             if remove_by_curve:
-                for curve in curves:
+                for index in curve_index.query(line.pos, object_bbox_offset):
+                    curve = curves[index]
                     ref_bbox: tuple[int] = (
                         curve[0] - object_bbox_offset,
                         curve[1] - object_bbox_offset,
@@ -117,10 +127,10 @@ class RuleBasedLineRemoverByObjects(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 self._process_by_obj(
                     page, 
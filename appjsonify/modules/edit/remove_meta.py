@@ -1,7 +1,7 @@
-import copy
 from tqdm.contrib import tenumerate
 
 from ..runner import BaseRunner
+from ..common import FontProfile
 from ..doc import Document, Page, Token
 
 
@@ -56,14 +56,16 @@ class RuleBasedMetaRemover(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
 
         # remove meta information by page
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 self._process_by_page(
                     page, header_offset, footer_offset,
                     left_side_offset, right_side_offset,
                 )
+            # update font statistics as tokens are removed
+            doc.meta["font_profile"] = FontProfile.from_document(doc)
         return copied_documents
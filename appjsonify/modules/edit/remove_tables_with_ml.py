@@ -1,9 +1,8 @@
-import copy
 from tqdm.contrib import tenumerate
 
 from ..runner import BaseRunner
 from ..doc import Document, Page, Line
-from ..common import judge_within_bbox
+from ..common import batch_judge_within_bbox
 
 
 @BaseRunner.register("remove_tables_with_ml")
@@ -14,22 +13,20 @@ class MLBasedTableRemover(BaseRunner):
         page: Page,
         object_bbox_offset: int
     ):
-        lines: list[Line] = []
-        for line in page.lines:
-            to_be_removed: bool = False
-            if page.meta.get("tables") != []:
-                for table in page.meta.get("tables"):
-                    ref_bbox: tuple[int] = (
-                        table.pos[0] - object_bbox_offset,
-                        table.pos[1] - object_bbox_offset,
-                        table.pos[2] + object_bbox_offset,
-                        table.pos[3] + object_bbox_offset
-                    )
-                    if judge_within_bbox(ref_bbox, line.pos):
-                        to_be_removed = True
-                        break
-            if to_be_removed is False:
-                lines.append(line)
+        ref_bboxes: list[tuple[int]] = [
+            (
+                table.pos[0] - object_bbox_offset,
+                table.pos[1] - object_bbox_offset,
+                table.pos[2] + object_bbox_offset,
+                table.pos[3] + object_bbox_offset
+            ) for table in page.meta.get("tables")
+        ]
+        # (tables, lines) mask
+        within = batch_judge_within_bbox(ref_bboxes, [line.pos for line in page.lines])
+        lines: list[Line] = [
+            line for line, to_be_removed in zip(page.lines, within.any(axis=0))
+            if not to_be_removed
+        ]
         page.lines = lines
         return                    
 
@@ -43,10 +40,10 @@ class MLBasedTableRemover(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             for page in doc.pages:
                 self._process_by_page(page, object_bbox_offset)
         return copied_documents
@@ -1,4 +1,3 @@
-import copy
 import re
 from collections import Counter
 
@@ -124,10 +123,10 @@ class RuleBasedReferenceTailor(BaseRunner):
         # init
         self.check_args(self.execute, locals())
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents = self.prepare_documents(documents)
 
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             self._process_by_doc(
                 doc, listing_offset
             )
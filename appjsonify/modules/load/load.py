@@ -1,15 +1,52 @@
-import copy
 import re
 import statistics
+from bisect import bisect_left, bisect_right
 from collections import Counter
-from typing import Any
+from typing import Any, Optional
 
 import pdfplumber
+from pdfplumber.page import test_proposed_bbox
 from tqdm.contrib import tenumerate
 
 from ..doc import Document, Page, Token
 from ..runner import BaseRunner
-from ..common import normalize_bbox
+from ..common import FontProfile, batch_normalize_bbox, normalize_bbox, parse_page_ranges
+
+
+class CharIndex:
+    """Characters of a page sorted by their top coordinates.
+
+    This looks up the characters overlapping a bbox without scanning all the objects in a page
+    as `page.crop(bbox).chars` does for every word.
+    """
+    def __init__(
+        self,
+        chars: list[dict[str, Any]]
+    ):
+        self.chars: list[dict[str, Any]] = chars
+        self.order: list[int] = sorted(range(len(chars)), key=lambda index: chars[index]['top'])
+        self.tops: list[float] = [chars[index]['top'] for index in self.order]
+        # add a margin so that rounding errors never drop a character
+        self.max_height: float = max((char['bottom'] - char['top'] for char in chars), default=0) + 1
+    
+    
+    def query(
+        self,
+        bbox: tuple
+    ) -> list[dict[str, Any]]:
+        """Return characters overlapping or touching a bbox in the page order, as `page.crop(bbox).chars` does."""
+        x0, top, x1, bottom = bbox
+        start = bisect_left(self.tops, top - self.max_height)
+        end = bisect_right(self.tops, bottom)
+        indices: list[int] = []
+        for index in self.order[start:end]:
+            char = self.chars[index]
+            overlap_width = min(char['x1'], x1) - max(char['x0'], x0)
+            overlap_height = min(char['bottom'], bottom) - max(char['top'], top)
+            if overlap_width >= 0 and overlap_height >= 0 and overlap_width + overlap_height > 0:
+                indices.append(index)
+        indices.sort()
+        return [self.chars[index] for index in indices]
 
 
 @BaseRunner.register("load_docs")
@@ -35,6 +72,7 @@ class DocumentLoader(BaseRunner):
         """
         def extract_token(
             page: pdfplumber.page.Page,
+            char_index: CharIndex,
             word: dict[str, Any],
             width: float,
             height: float
@@ -48,8 +86,10 @@ class DocumentLoader(BaseRunner):
             word_bbox[2] = width if word_bbox[2] > width else word_bbox[2]
             word_bbox[3] = height if word_bbox[3] > height else word_bbox[3]
             try:
+                # raise ValueError for an invalid bbox as `page.crop` does
+                test_proposed_bbox(tuple(word_bbox), page.bbox)
                 word_font_specs = [(char['fontname'], char['size']) 
-                                for char in page.crop(tuple(word_bbox)).chars]
+                                for char in char_index.query(tuple(word_bbox))]
                 font_size = round(statistics.median([word_font_spec[1] 
                                                     for word_font_spec in word_font_specs]), 1)
                 font_name = Counter([word_font_spec[0] 
@@ -67,6 +107,7 @@ class DocumentLoader(BaseRunner):
         
         # init
         tokens: list[Token] = []
+        char_index = CharIndex(page.chars)
         
         # extract words
         words = page.extract_words(
@@ -78,7 +119,7 @@ class DocumentLoader(BaseRunner):
         for word in words:
             tokens.append(
                 extract_token(
-                    page, word, width, height
+                    page, char_index, word, width, height
                 )
             )
         
@@ -92,17 +133,20 @@ class DocumentLoader(BaseRunner):
             width: int, 
             height: int
         ) -> list[Token]:
+        # format bboxes at once as a page may have thousands of objects
+        obj_bboxes = batch_normalize_bbox(
+            [(float(obj['x0']), float(obj['top']), float(obj['x1']), float(obj['bottom'])) 
+             for obj in getattr(page, object_name)],
+            width,
+            height
+        )
         objs: list[Token] = []
-        for obj in getattr(page, object_name):
-            # format bbox
-            obj_bbox = (float(obj['x0']), float(obj['top']), 
-                        float(obj['x1']), float(obj['bottom']))
-            obj_bbox = normalize_bbox(obj_bbox, width, height)
+        for obj_bbox in obj_bboxes.tolist():
             # add to tokens
             objs.append(
                 Token(
                     f'[{object_name.capitalize()}]', 
-                    obj_bbox,
+                    tuple(obj_bbox),
                     font_size=-1,
                     font_name="default"
                 )
@@ -114,11 +158,19 @@ class DocumentLoader(BaseRunner):
             self, 
             doc: Document,
             x_tolerance: float,
+            page_numbers: Optional[list[int]] = None,
+            max_pages: int = 0
         ) -> Document:
-        """Parse a PDF document."""
-        with pdfplumber.open(str(doc.input_path)) as pdf:
+        """Parse a PDF document.
+
+        Only the pages in `page_numbers` (all pages if None) are parsed, up to `max_pages` pages if it is positive.
+        """
+        if page_numbers is None and max_pages > 0:
+            page_numbers = list(range(1, max_pages + 1))
+        with pdfplumber.open(str(doc.input_path), pages=page_numbers) as pdf:
             pages: list[Page] = []
-            for index, page in enumerate(pdf.pages, start=1):
+            selected_pages = pdf.pages[:max_pages] if max_pages > 0 else pdf.pages
+            for page in selected_pages:
                 # get height and width of a page
                 width, height = int(page.width), int(page.height)
                 
@@ -156,6 +208,8 @@ class DocumentLoader(BaseRunner):
             # edit doc
             doc.pages = pages
             doc.meta = pdf.metadata
+            doc.meta["page_numbers"] = [page.page_number for page in selected_pages]
+            doc.meta["font_profile"] = FontProfile.from_document(doc)
             
         return doc
 
@@ -164,21 +218,26 @@ class DocumentLoader(BaseRunner):
         self, 
         documents: list[Document],
         x_tolerance: float,
+        pages: str = '',
+        max_pages: int = 0,
         **kwargs: dict
     ) -> list[Document]:
         # init
         self.check_args(self.execute, locals())
+        page_numbers: Optional[list[int]] = parse_page_ranges(pages) if pages != '' else None
         
-        # avoid overwrite
-        copied_documents: list[Document] = copy.deepcopy(documents)
+        # avoid overwrite unless running in place
+        copied_documents: list[Document] = self.prepare_documents(documents)
 
         # load contents
         docs: list[Document] = []
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
+        for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
             docs.append(
                 self._parse_by_doc(
                     doc,
-                    x_tolerance
+                    x_tolerance,
+                    page_numbers,
+                    max_pages
                 )
             )
         return docs
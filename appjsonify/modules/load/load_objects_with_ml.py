@@ -1,29 +1,47 @@
 import copy
+import itertools
 import os
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Iterator, Optional
 
 from pdf2image import convert_from_path
-from PIL import Image
 from tqdm.contrib import tenumerate
 
-from ...utils import download_individual_file
-from ..common import check_token_overlap
+from ...utils import DetectionCache, download_individual_file, get_file_hash, prefetch
+from ..common import BboxIndex, check_token_overlap, get_page_numbers
 from ..doc import Document, Page, Token
 from ..runner import BaseRunner
-from .models import DocBankModel, PublaynetModel, TableBankModel
+from .models import (BaseModel, DetectorPool, DocBankModel, PublaynetModel, TableBankModel,
+                     get_devices, predict_models)
 
 
 @BaseRunner.register("load_objects_with_ml")
 class MLBasedObjectLoader(BaseRunner):
     """Load objects with ML-based models."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # detectors and their worker processes keyed by their settings (see `_load_models`)
+        self._models: dict[tuple, tuple] = {}
+        # detection caches keyed by their settings (see `_load_cache`)
+        self._caches: dict[tuple, DetectionCache] = {}
+        # threads to run the detectors concurrently in the main process (see `_get_executor`)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # detections started by `prepare` keyed by input paths (see `_start_detection`)
+        self._prepared: dict[Path, tuple] = {}
+    
+    
     @staticmethod
     def get_object_tokens_in_page(
         object_name: str, 
         obj_bboxes: dict[int, dict],
-        tokens: list[Token] = None
+        tokens: list[Token] = None,
+        token_index: Optional[BboxIndex] = None
     ) -> list[Token]:
-        """Get object tokens in a page. If `tokens` is given, associate such tokens to each object token."""
+        """Get object tokens in a page. If `tokens` is given, associate such tokens to each object token.
+        `token_index` is an index of `tokens` shared among objects, which is built if not given."""
         if tokens is None:
             objs = [
                 Token(
@@ -35,10 +53,13 @@ class MLBasedObjectLoader(BaseRunner):
                 ) for val in obj_bboxes.values()
             ]
         else:
+            if token_index is None:
+                token_index = BboxIndex([token.pos for token in tokens])
             objs: list[Token] = []
             for val in obj_bboxes.values():
                 obj_actual_tokens: list[Token] = []
-                for token in tokens:
+                for index in token_index.query(val["bbox"]):
+                    token = tokens[index]
                     if check_token_overlap(
                         val["bbox"], token.pos, threshold=0.50
                     ):
@@ -62,9 +83,11 @@ class MLBasedObjectLoader(BaseRunner):
     def get_title_tokens_in_page(
         obj_bboxes: dict[int, dict],
         tokens: list[Token] = None,
-        max_headline_len: int = 20
+        max_headline_len: int = 20,
+        token_index: Optional[BboxIndex] = None
     ) -> list[Token]:
-        """Get title tokens in a page. If `tokens` is given, associate such tokens to each title token."""
+        """Get title tokens in a page. If `tokens` is given, associate such tokens to each title token.
+        `token_index` is an index of `tokens` shared among objects, which is built if not given."""
         if tokens is None:
             objs = [
                 Token(
@@ -78,10 +101,13 @@ class MLBasedObjectLoader(BaseRunner):
         else:
             end_str = r".*?[。．.、，,;；:：][0-9]*$"
             end_str_ptn = re.compile(end_str)
+            if token_index is None:
+                token_index = BboxIndex([token.pos for token in tokens])
             objs: list[Token] = []
             for val in obj_bboxes.values():
                 obj_actual_tokens: list[Token] = []
-                for token in tokens:
+                for index in token_index.query(val["bbox"]):
+                    token = tokens[index]
                     if check_token_overlap(
                         val["bbox"], token.pos, threshold=0.50
                     ):
@@ -206,37 +232,15 @@ class MLBasedObjectLoader(BaseRunner):
     def _process_by_page(
         self,
         page: Page,
-        image: Image,
-        page_number: int,
-        save_image: bool,
-        output_image_dir: str,
-        tablebank_model: TableBankModel,
-        publaynet_model: PublaynetModel,
-        docbank_model: DocBankModel,
+        table_bboxes_tablebank: dict[int, dict],
+        publaynet_bboxes: tuple[dict[int, dict]],
+        docbank_bboxes: tuple[dict[int, dict]],
         max_headline_len: int
     ) -> Page:
-        # get bboxes    
-        table_bboxes_tablebank = tablebank_model.get_bboxes(
-            image,
-            page_number,
-            save_image,
-            output_image_dir
-        )
-        (table_bboxes_publaynet, figure_bboxes_publaynet, _, text_bboxes) = \
-            publaynet_model.get_bboxes(
-                image, 
-                page_number, 
-                save_image, 
-                output_image_dir
-            )
+        # unpack bboxes
+        (table_bboxes_publaynet, figure_bboxes_publaynet, _, text_bboxes) = publaynet_bboxes
         (_, _, caption_bboxes, _, equation_bboxes, footer_bboxes, _, 
-         title_bboxes, figure_bboxes_docbank, table_bboxes_docbank) = \
-            docbank_model.get_bboxes(
-                image, 
-                page_number, 
-                save_image,
-                output_image_dir
-            )
+         title_bboxes, figure_bboxes_docbank, table_bboxes_docbank) = docbank_bboxes
             
         # adjust bboxes using text bboxes
         caption_bboxes = self.adjust_object_bboxes_by_text_bbox(
@@ -281,6 +285,7 @@ class MLBasedObjectLoader(BaseRunner):
             figure_bboxes = {}
         
         # get object tokens
+        token_index = BboxIndex([token.pos for token in page.tokens])
         tables = self.get_object_tokens_in_page(
             'TABLE', table_bboxes
         ) if table_bboxes is not None else []
@@ -288,16 +293,16 @@ class MLBasedObjectLoader(BaseRunner):
             'FIGURE', figure_bboxes
         ) if figure_bboxes != {} else []
         captions = self.get_object_tokens_in_page(
-            'CAPTION', caption_bboxes, page.tokens
+            'CAPTION', caption_bboxes, page.tokens, token_index
         ) if caption_bboxes != {} else []
         equations = self.get_object_tokens_in_page(
-            'EQUATION', equation_bboxes, page.tokens
+            'EQUATION', equation_bboxes, page.tokens, token_index
         ) if equation_bboxes != {} else []
         footers = self.get_object_tokens_in_page(
-            'FOOTER', footer_bboxes, page.tokens
+            'FOOTER', footer_bboxes, page.tokens, token_index
         ) if footer_bboxes != {} else []
         titles = self.get_title_tokens_in_page(
-            title_bboxes, page.tokens, max_headline_len
+            title_bboxes, page.tokens, max_headline_len, token_index
         )
         
         return Page(
@@ -349,6 +354,411 @@ class MLBasedObjectLoader(BaseRunner):
         return            
             
 
+    def _load_models(
+        self,
+        tablebank_threshold: float,
+        publaynet_threshold: float,
+        docbank_threshold: float,
+        detectron_device_mode: str,
+        detectron_workers: int = 0,
+        concurrent_detectors: bool = False
+    ) -> tuple[tuple[TableBankModel, PublaynetModel, DocBankModel], Optional[DetectorPool]]:
+        """Load the detectors once and reuse them while the settings stay the same.
+
+        If `detectron_workers` is positive or `detectron_device_mode` is `cuda:all`, the detectors run in
+        worker processes (see `DetectorPool`), and the returned models only convert their predictions.
+        """
+        model_key = (
+            tablebank_threshold, publaynet_threshold, docbank_threshold, detectron_device_mode, detectron_workers,
+            concurrent_detectors
+        )
+        if model_key in self._models:
+            return self._models[model_key]
+        
+        self.check_model_file_path()
+        top_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        model_specs = [
+            (
+                TableBankModel,
+                {
+                    "detectron_config_path": os.path.join(top_directory, "weights/tablebank/X152/All_X152.yaml"),
+                    "detectron_model_path": os.path.join(top_directory, "weights/tablebank/X152/model_final.pth"),
+                    "detectron_threshold": tablebank_threshold
+                }
+            ),
+            (
+                PublaynetModel,
+                {
+                    "detectron_config_path": os.path.join(
+                        top_directory, "weights/publaynet/X101/DLA_mask_rcnn_X_101_32x8d_FPN_3x.yaml"
+                    ),
+                    "detectron_model_path": os.path.join(
+                        top_directory, "weights/publaynet/X101/model_final_trimmed.pth"
+                    ),
+                    "detectron_threshold": publaynet_threshold
+                }
+            ),
+            (
+                DocBankModel,
+                {
+                    "detectron_config_path": os.path.join(top_directory, "weights/docbank/X101/X101.yaml"),
+                    "detectron_model_path": os.path.join(top_directory, "weights/docbank/X101/model.pth"),
+                    "detectron_threshold": docbank_threshold
+                }
+            )
+        ]
+        if detectron_workers > 0 or detectron_device_mode == "cuda:all":
+            models = tuple(
+                model_class(**model_kwargs, detectron_device_mode="cpu", build_predictor=False)
+                for model_class, model_kwargs in model_specs
+            )
+            pool = DetectorPool(
+                model_specs, get_devices(detectron_device_mode, detectron_workers), concurrent_detectors
+            )
+        else:
+            models = tuple(
+                model_class(**model_kwargs, detectron_device_mode=detectron_device_mode)
+                for model_class, model_kwargs in model_specs
+            )
+            pool = None
+        self._models[model_key] = (models, pool)
+        return self._models[model_key]
+
+
+    def _drop_closed_pools(self):
+        """Forget detectors whose worker processes have died so that the next document loads them again."""
+        for model_key, (_, pool) in list(self._models.items()):
+            if pool is not None and pool.closed:
+                del self._models[model_key]
+
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Start threads to run the detectors concurrently once and reuse them."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="detector")
+        return self._executor
+
+
+    def _load_cache(
+        self,
+        detection_cache_dir: str,
+        detection_cache_size: float
+    ) -> DetectionCache:
+        """Open a detection cache once and reuse it while the settings stay the same."""
+        cache_key = (detection_cache_dir, detection_cache_size)
+        if cache_key not in self._caches:
+            self._caches[cache_key] = DetectionCache(detection_cache_dir, detection_cache_size)
+        return self._caches[cache_key]
+
+
+    @staticmethod
+    def _iter_page_images(
+        pdf_path: Path,
+        page_numbers: list[int],
+        render_dpi: int,
+        render_width: Optional[int],
+        render_grayscale: bool,
+        render_thread_count: int,
+        render_chunk_size: int
+    ) -> Iterator[tuple[int, Any]]:
+        """Yield page numbers and images of the given pages of a PDF file in order.
+
+        Pages are rendered by `pdftoppm` in chunks of at most `render_chunk_size` consecutive pages,
+        each of which is split among `render_thread_count` processes. The next chunk is rendered
+        in the background while the current one is processed, so that at most a few chunks are in memory.
+
+        Args:
+            pdf_path (Path): A path to a PDF file.
+            page_numbers (list[int]): Sorted 1-based page numbers to render.
+            render_dpi (int): A resolution to render pages at. Ignored if `render_width` is given.
+            render_width (Optional[int]): If given, pages are scaled to this width keeping their aspect ratios.
+            render_grayscale (bool): Whether to render pages in grayscale.
+            render_thread_count (int): The number of processes to render a chunk.
+            render_chunk_size (int): The maximum number of pages rendered at once.
+        """
+        def render_chunks() -> Iterator[list[tuple[int, Any]]]:
+            start = 0
+            for end in range(1, len(page_numbers) + 1):
+                if end == len(page_numbers) or page_numbers[end] != page_numbers[end - 1] + 1 \
+                    or end - start == render_chunk_size:
+                    chunk = page_numbers[start:end]
+                    images = convert_from_path(
+                        str(pdf_path),
+                        dpi=render_dpi,
+                        first_page=chunk[0],
+                        last_page=chunk[-1],
+                        thread_count=render_thread_count,
+                        grayscale=render_grayscale,
+                        size=(render_width, None) if render_width is not None else None
+                    )
+                    yield list(zip(chunk, images))
+                    start = end
+
+        for chunk in prefetch(render_chunks(), max_prefetch=1):
+            yield from chunk
+
+
+    @staticmethod
+    def _start_detection(
+        doc: Document,
+        models: tuple[TableBankModel, PublaynetModel, DocBankModel],
+        cache: Optional[DetectionCache],
+        render_dpi: int = 200,
+        render_grayscale: bool = False,
+        render_thread_count: int = 1,
+        render_chunk_size: int = 8
+    ) -> tuple[list[list], Optional[list[list[str]]], list[set[int]], Iterator[tuple[int, Any]]]:
+        """Look up cached detections of a document and set up rendering of the pages to detect objects in.
+
+        Pages found in `cache` are skipped, and only the pages that are missing for any model are rasterised.
+        See `_iter_page_images` for the rendering arguments. `render_dpi` of 0 scales pages to the width
+        of the largest input of the models.
+
+        Returns:
+            tuple[list[list], Optional[list[list[str]]], list[set[int]], Iterator[tuple[int, Any]]]:
+            Outputs of `get_bboxes` for every page found in `cache` and None otherwise, their cache keys or None
+            without `cache`, the indices of the pages missing for each model, and an iterator of the indices and
+            images of the pages to render, which starts rendering when it is first advanced.
+        """
+        num_pages = len(doc.pages)
+        page_numbers = get_page_numbers(doc)
+        detections: list[list] = [[None] * num_pages for _ in models]
+        missing: list[list[int]] = [list(range(num_pages)) for _ in models]
+        keys: Optional[list[list[str]]] = None
+        
+        # look up cached detections
+        if cache is not None:
+            pdf_hash = get_file_hash(doc.input_path)
+            # keep the keys of the default rendering as they were before it became configurable
+            render_fields = () if (render_dpi, render_grayscale) == (200, False) \
+                else ("render", render_dpi, render_grayscale)
+            keys = [
+                [
+                    cache.make_key(pdf_hash, page_numbers[index], *model.get_cache_fields(), *render_fields)
+                    for index in range(num_pages)
+                ]
+                for model in models
+            ]
+            for model_index in range(len(models)):
+                missing[model_index] = []
+                for index, key in enumerate(keys[model_index]):
+                    hit, value = cache.get(key)
+                    if hit:
+                        detections[model_index][index] = value
+                    else:
+                        missing[model_index].append(index)
+        missing_indices: list[set[int]] = [set(indices) for indices in missing]
+        rendered_indices: list[int] = sorted(set().union(*missing))
+        if rendered_indices == []:
+            return detections, keys, missing_indices, iter(())
+        
+        index_by_page_number: dict[int, int] = {page_numbers[index]: index for index in rendered_indices}
+        images = (
+            (index_by_page_number[page_number], img)
+            for page_number, img in MLBasedObjectLoader._iter_page_images(
+                doc.input_path,
+                [page_numbers[index] for index in rendered_indices],
+                render_dpi,
+                max(model.get_input_size() for model in models) if render_dpi == 0 else None,
+                render_grayscale,
+                render_thread_count,
+                render_chunk_size
+            )
+        )
+        return detections, keys, missing_indices, images
+
+
+    @staticmethod
+    def _detect_objects(
+        doc: Document,
+        models: tuple[TableBankModel, PublaynetModel, DocBankModel],
+        detectron_batch_size: int,
+        save_image: bool,
+        output_path: str,
+        save_visualization: bool,
+        cache: Optional[DetectionCache],
+        render_dpi: int = 200,
+        render_grayscale: bool = False,
+        render_thread_count: int = 1,
+        render_chunk_size: int = 8,
+        prepared: Optional[tuple] = None,
+        pool: Optional[DetectorPool] = None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> list[list]:
+        """Get the outputs of each model for every page of a document.
+
+        Pages are passed to the models as they are rendered instead of after the whole document is rendered.
+        See `_start_detection` for the cache and rendering arguments.
+
+        Args:
+            prepared (Optional[tuple], optional): The outputs of `_start_detection` for `doc` if it has already
+                been called. Defaults to None.
+            pool (Optional[DetectorPool], optional): If given, the models only convert predictions made
+                by the pool, which runs on several batches at once. Defaults to None.
+            executor (Optional[ThreadPoolExecutor], optional): If given without `pool`, the models run
+                concurrently in its threads (see `predict_models`). Defaults to None.
+
+        Returns:
+            list[list]: Outputs of `get_bboxes` for every page, one list per model.
+        """
+        if prepared is None:
+            prepared = MLBasedObjectLoader._start_detection(
+                doc,
+                models,
+                cache,
+                render_dpi,
+                render_grayscale,
+                render_thread_count,
+                render_chunk_size
+            )
+        detections, keys, missing_indices, images = prepared
+        page_numbers = get_page_numbers(doc)
+        
+        def collect(batch: list[tuple[int, Any]], subsets: list[list[int]], predictions: list[list]):
+            """Convert the predictions of each detector on a batch and cache them."""
+            for model_index, (model, subset, model_predictions) in enumerate(zip(models, subsets, predictions)):
+                outputs = model.get_bboxes_from_predictions(
+                    [batch[i][1] for i in subset],
+                    model_predictions,
+                    [page_numbers[batch[i][0]] for i in subset],
+                    save_image,
+                    output_path,
+                    save_visualization
+                )
+                for i, output in zip(subset, outputs):
+                    index = batch[i][0]
+                    detections[model_index][index] = output
+                    if cache is not None:
+                        cache.put(keys[model_index][index], output)
+        
+        pending: deque[tuple[list[tuple[int, Any]], list[list[int]]]] = deque()
+        
+        def detect(batch: list[tuple[int, Any]]):
+            """Run each detector on the pages of a batch that it has not processed.
+
+            Each page is converted into an array once, and resized once for the detectors with the same input settings.
+            With `pool`, the batch is submitted, and the oldest one is collected once enough batches are in flight.
+            """
+            np_imgs = BaseModel.to_numpy([img for _, img in batch])
+            subsets = [
+                [i for i, (index, _) in enumerate(batch) if index in indices]
+                for indices in missing_indices
+            ]
+            if pool is None:
+                collect(batch, subsets, predict_models(models, np_imgs, subsets, executor))
+                return
+            pool.put(np_imgs, subsets)
+            pending.append((batch, subsets))
+            if len(pending) >= pool.default_buffer_size:
+                collect(*pending.popleft(), pool.get())
+        
+        # run the detectors on `detectron_batch_size` pages at once as soon as they are rendered
+        try:
+            batch: list[tuple[int, Any]] = []
+            for index, img in images:
+                batch.append((index, img))
+                if len(batch) == detectron_batch_size:
+                    detect(batch)
+                    batch = []
+            if batch != []:
+                detect(batch)
+            while pending:
+                collect(*pending.popleft(), pool.get())
+        finally:
+            # do not leave the results of a failed document to the next one
+            if pool is not None:
+                pool.discard()
+        return detections
+
+
+    def prepare(
+        self,
+        documents: list[Document],
+        tablebank_threshold: float = 0.9,
+        publaynet_threshold: float = 0.75,
+        docbank_threshold: float = 0.9,
+        detectron_device_mode: str = 'cpu',
+        detectron_batch_size: int = 1,
+        detectron_workers: int = 0,
+        concurrent_detectors: bool = False,
+        save_image: bool = False,
+        detection_cache_dir: str = '',
+        detection_cache_size: float = 1024,
+        render_dpi: int = 200,
+        render_grayscale: bool = False,
+        render_thread_count: int = 1,
+        render_chunk_size: int = 8,
+        **kwargs: dict
+    ) -> None:
+        """Look up cached detections of documents and render their first pages ahead of `execute`.
+
+        Rendering of each document continues in the background until a few chunks of pages are rendered,
+        and `execute` takes over the rest. The arguments must be the same as those passed to `execute`.
+        """
+        self._validate_args(detectron_batch_size, detectron_workers, render_dpi, render_thread_count, render_chunk_size)
+        models, _ = self._load_models(
+            tablebank_threshold,
+            publaynet_threshold,
+            docbank_threshold,
+            detectron_device_mode,
+            detectron_workers,
+            concurrent_detectors
+        )
+        cache = self._load_cache(
+            detection_cache_dir, detection_cache_size
+        ) if detection_cache_dir != '' and not save_image else None
+        try:
+            for doc in documents:
+                detections, keys, missing_indices, images = self._start_detection(
+                    doc,
+                    models,
+                    cache,
+                    render_dpi,
+                    render_grayscale,
+                    render_thread_count,
+                    render_chunk_size
+                )
+                first = next(images, None)
+                if first is not None:
+                    images = itertools.chain([first], images)
+                self._prepared[doc.input_path] = (detections, keys, missing_indices, images)
+        except BaseException:
+            self._discard_prepared(documents)
+            raise
+
+
+    def _discard_prepared(
+        self,
+        documents: list[Document]
+    ):
+        """Drop the detections started by `prepare` for documents that failed.
+
+        Dropping the iterators stops their rendering threads, and a stale entry is not picked up
+        when a document with the same path is processed again.
+        """
+        for doc in documents:
+            self._prepared.pop(doc.input_path, None)
+
+
+    @staticmethod
+    def _validate_args(
+        detectron_batch_size: int,
+        detectron_workers: int,
+        render_dpi: int,
+        render_thread_count: int,
+        render_chunk_size: int
+    ):
+        """Check the arguments shared by `prepare` and `execute`."""
+        if detectron_batch_size < 1:
+            raise ValueError(f'`detectron_batch_size` must be positive, but got {detectron_batch_size}.')
+        if detectron_workers < 0:
+            raise ValueError(f'`detectron_workers` must not be negative, but got {detectron_workers}.')
+        if render_dpi < 0 or render_thread_count < 1 or render_chunk_size < 1:
+            raise ValueError(
+                '`render_dpi` must not be negative, and `render_thread_count` and `render_chunk_size` must be positive.'
+            )
+
+
     def execute(
         self, 
         documents: list[Document],
@@ -356,69 +766,93 @@ class MLBasedObjectLoader(BaseRunner):
         publaynet_threshold: float = 0.75,
         docbank_threshold: float = 0.9,
         detectron_device_mode: str = 'cpu',
+        detectron_batch_size: int = 1,
+        detectron_workers: int = 0,
+        concurrent_detectors: bool = False,
         save_image: bool = False,
+        save_visualization: bool = False,
         output_image_dir: str = '',
+        detection_cache_dir: str = '',
+        detection_cache_size: float = 1024,
         max_headline_len: int = 30,
+        render_dpi: int = 200,
+        render_grayscale: bool = False,
+        render_thread_count: int = 1,
+        render_chunk_size: int = 8,
         **kwargs: dict
     ) -> list[Document]:
         # init
         self.check_args(self.execute, locals())
-        self.check_model_file_path()
-        top_directory = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        tablebank_model = TableBankModel(
-            os.path.join(top_directory, "weights/tablebank/X152/All_X152.yaml"),
-            os.path.join(top_directory, "weights/tablebank/X152/model_final.pth"),
-            detectron_device_mode,
-            tablebank_threshold
-        )
-        publaynet_model = PublaynetModel(
-            os.path.join(top_directory, "weights/publaynet/X101/DLA_mask_rcnn_X_101_32x8d_FPN_3x.yaml"),
-            os.path.join(top_directory, "weights/publaynet/X101/model_final_trimmed.pth"),
-            detectron_device_mode,
-            publaynet_threshold
-        )
-        docbank_model = DocBankModel(
-            os.path.join(top_directory, "weights/docbank/X101/X101.yaml"),
-            os.path.join(top_directory, "weights/docbank/X101/model.pth"),
-            detectron_device_mode,
-            docbank_threshold
-        )
+        try:
+            self._validate_args(detectron_batch_size, detectron_workers, render_dpi, render_thread_count, render_chunk_size)
+            models, pool = self._load_models(
+                tablebank_threshold,
+                publaynet_threshold,
+                docbank_threshold,
+                detectron_device_mode,
+                detectron_workers,
+                concurrent_detectors
+            )
+            executor = self._get_executor() if concurrent_detectors and pool is None else None
+            # saved images are not cached, so detections are always recomputed when saving them
+            cache = self._load_cache(
+                detection_cache_dir, detection_cache_size
+            ) if detection_cache_dir != '' and not save_image else None
         
-        # avoid overwrite
-        copied_documents = copy.deepcopy(documents)
-        for _, doc in tenumerate(copied_documents, total=len(copied_documents)):
-            # generate doc images
-            pdf_images = convert_from_path(str(doc.input_path))
+            # avoid overwrite unless running in place
+            copied_documents = self.prepare_documents(documents)
+            for _, doc in tenumerate(copied_documents, total=len(copied_documents), disable=not self.show_progress):
+                # rendering may have been started by `prepare`
+                prepared = self._prepared.pop(doc.input_path, None)
             
-            # output settings
-            if save_image is True:
-                doc_name: str = doc.input_path.stem
-                output_image_dir: Path = Path(output_image_dir)
-                if not output_image_dir.exists():
-                    output_image_dir.mkdir()
-                output_path = output_image_dir / doc_name
-                if not output_path.exists():
-                    output_path.mkdir()
-                output_path = str(output_path)
-            else:
-                output_path = ""
+                # output settings
+                if save_image is True:
+                    doc_name: str = doc.input_path.stem
+                    output_image_dir: Path = Path(output_image_dir)
+                    if not output_image_dir.exists():
+                        output_image_dir.mkdir()
+                    output_path = output_image_dir / doc_name
+                    if not output_path.exists():
+                        output_path.mkdir()
+                    output_path = str(output_path)
+                else:
+                    output_path = ""
             
-            # process by page
-            pages: list[Page] = []
-            for index, page in enumerate(doc.pages):
-                pages.append(
-                    self._process_by_page(
-                        page,
-                        pdf_images[index],
-                        index + 1,
-                        save_image,
-                        output_path,
-                        tablebank_model,
-                        publaynet_model,
-                        docbank_model,
-                        max_headline_len
-                    )
+                # get bboxes
+                tablebank_bboxes, publaynet_bboxes, docbank_bboxes = self._detect_objects(
+                    doc,
+                    models,
+                    detectron_batch_size,
+                    save_image,
+                    output_path,
+                    save_visualization,
+                    cache,
+                    render_dpi,
+                    render_grayscale,
+                    render_thread_count,
+                    render_chunk_size,
+                    prepared,
+                    pool,
+                    executor
                 )
-            doc.pages = pages
             
+                # process by page
+                pages: list[Page] = []
+                for index, page in enumerate(doc.pages):
+                    pages.append(
+                        self._process_by_page(
+                            page,
+                            tablebank_bboxes[index],
+                            publaynet_bboxes[index],
+                            docbank_bboxes[index],
+                            max_headline_len
+                        )
+                    )
+                doc.pages = pages
+        except BaseException:
+            # do not leave detections started by `prepare` to later runs
+            self._discard_prepared(documents)
+            self._drop_closed_pools()
+            raise
+        
         return copied_documents
@@ -1,3 +1,5 @@
+from .base_model import BaseModel
 from .docbank import DocBankModel
+from .pool import DetectorPool, get_devices, predict_models
 from .publaynet import PublaynetModel
 from .tablebank import TableBankModel
@@ -1,12 +1,181 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+try:
+    from detectron2.config import CfgNode
+    from detectron2.data import MetadataCatalog
+    from detectron2.data.detection_utils import convert_PIL_to_numpy
+    from detectron2.engine.defaults import DefaultPredictor
+    from detectron2.structures import Instances
+    from detectron2.utils.visualizer import ColorMode, Visualizer
+except ModuleNotFoundError:
+    raise ModuleNotFoundError("Please install detectron2 by specifying `python -m pip install 'git+https://github.com/facebookresearch/detectron2.git'`!")
 from PIL import Image
 
+from ....utils import get_file_hash
+
 class BaseModel:
     """Base model for a bounding box detector."""
+    # used in the names of saved images
+    model_name: str = "BASE"
+
     def __init__(self) -> None:
         pass
-    
-    def get_bboxes(self, 
-                   img: Image, 
+
+    def load_predictor(self, cfg: CfgNode, build_predictor: bool = True) -> None:
+        """Load a predict-only engine. Predictions are drawn only when `save_visualization` is called.
+
+        If `build_predictor` is False, the weights are not loaded, and the model only converts predictions
+        made elsewhere, e.g., by a `DetectorPool`, into bounding boxes.
+        """
+        self.cfg = cfg
+        self.predictor = DefaultPredictor(cfg) if build_predictor else None
+        self.metadata = MetadataCatalog.get(
+            cfg.DATASETS.TEST[0] if len(cfg.DATASETS.TEST) else "__unused"
+        )
+
+    def get_input_size(self) -> int:
+        """Return the length that the shorter edge of an image is resized to before inference."""
+        min_size = self.cfg.INPUT.MIN_SIZE_TEST
+        return max(min_size) if isinstance(min_size, (tuple, list)) else min_size
+
+    def get_cache_fields(self) -> tuple:
+        """Return the settings that predictions depend on, which are used as a part of cache keys."""
+        if not hasattr(self, "_weight_hash"):
+            # hash the weights only once as they are hundreds of megabytes
+            self._weight_hash = get_file_hash(self.cfg.MODEL.WEIGHTS)
+        return (self.model_name, self._weight_hash, self.cfg.MODEL.ROI_HEADS.SCORE_THRESH_TEST)
+
+    def save_visualization(self, img: Image, p: Instances, path: str) -> None:
+        """Save a page image overlaid with predicted instances for debugging."""
+        visualizer = Visualizer(np.asarray(img.convert("RGB")), self.metadata, instance_mode=ColorMode.IMAGE)
+        visualizer.draw_instance_predictions(predictions=p).save(path)
+
+    @staticmethod
+    def to_numpy(imgs: list[Image]) -> list[np.ndarray]:
+        """Convert page images into arrays of shape (H, W, C) in BGR order, which `get_bboxes_batch` accepts."""
+        return [convert_PIL_to_numpy(img, format="BGR") for img in imgs]
+
+    def get_input_fields(self) -> tuple:
+        """Return the settings that input tensors depend on. Models with the same fields can share input tensors."""
+        return (
+            self.predictor.input_format,
+            self.cfg.INPUT.MIN_SIZE_TEST,
+            self.cfg.INPUT.MAX_SIZE_TEST,
+            self.cfg.MODEL.DEVICE
+        )
+
+    def preprocess(self, np_imgs: list[np.ndarray], shared_inputs: Optional[dict] = None) -> list[dict]:
+        """Resize images into the inputs of the model. See `predict` for the arguments."""
+        predictor = self.predictor
+        input_fields = self.get_input_fields()
+        inputs: list[dict] = []
+        for np_img in np_imgs:
+            key = (id(np_img), input_fields)
+            if shared_inputs is not None and key in shared_inputs:
+                inputs.append(shared_inputs[key])
+                continue
+            height, width = np_img.shape[:2]
+            if predictor.input_format == "RGB":
+                np_img = np_img[:, :, ::-1]
+            image = predictor.aug.get_transform(np_img).apply_image(np_img)
+            # models normalise images into new tensors, so the same tensor can be passed to several models
+            image = torch.as_tensor(image.astype("float32").transpose(2, 0, 1)).to(self.cfg.MODEL.DEVICE)
+            inputs.append({"image": image, "height": height, "width": width})
+            if shared_inputs is not None:
+                shared_inputs[key] = inputs[-1]
+        return inputs
+
+    def predict(self, np_imgs: list[np.ndarray], shared_inputs: Optional[dict] = None) -> list[Instances]:
+        """Run a detector on images in a single forward pass.
+
+        This does what `DefaultPredictor.__call__` does for a single image, but for a batch of images.
+
+        Args:
+            np_imgs (list[np.ndarray]): Images of shape (H, W, C) in BGR order.
+            shared_inputs (Optional[dict], optional): If given, resized input tensors on the device are looked up
+                in and added to this dictionary by the arrays and `get_input_fields`, so that models with
+                the same input settings resize and copy each image only once. The arrays must be kept alive
+                while the dictionary is used. Defaults to None.
+
+        Returns:
+            list[Instances]: Predicted instances on CPU for each image.
+        """
+        inputs = self.preprocess(np_imgs, shared_inputs)
+        with torch.no_grad():
+            predictions = self.predictor.model(inputs)
+        return [prediction["instances"].to('cpu') for prediction in predictions]
+
+    def get_bboxes_from_instances(self,
+                                  img: Image,
+                                  p: Instances,
+                                  page_number: int,
+                                  save_image: bool = False,
+                                  output_dir: str = ''):
+        """Convert predicted instances of a page into bbox dictionaries. See `get_bboxes` for the arguments."""
+        pass
+
+    def get_bboxes_batch(self,
+                         imgs: list[Image],
+                         page_numbers: list[int],
+                         save_image: bool = False,
+                         output_dir: str = '',
+                         save_visualization: bool = False,
+                         np_imgs: Optional[list[np.ndarray]] = None,
+                         shared_inputs: Optional[dict] = None) -> list:
+        """Get bounding boxes of objects in multiple pages with a single forward pass.
+
+        Args:
+            imgs (list[Image]): Images of pages.
+            page_numbers (list[int]): Page numbers of `imgs`.
+            save_image (bool, optional): Whether to save table images. Defaults to False.
+            output_dir (str): If `save_image` is True, specify an output image path.
+            save_visualization (bool, optional): Whether to also save page images overlaid with predictions
+                when `save_image` is True. Defaults to False.
+            np_imgs (Optional[list[np.ndarray]], optional): `imgs` converted by `to_numpy`, which can be shared
+                among models. Converted from `imgs` if not given. Defaults to None.
+            shared_inputs (Optional[dict], optional): Input tensors shared among models. See `predict`.
+                Defaults to None.
+
+        Returns:
+            list: Outputs of `get_bboxes` for each page.
+        """
+        if len(imgs) == 0:
+            return []
+        if np_imgs is None:
+            np_imgs = self.to_numpy(imgs)
+        return self.get_bboxes_from_predictions(
+            imgs, self.predict(np_imgs, shared_inputs), page_numbers, save_image, output_dir, save_visualization
+        )
+
+    def get_bboxes_from_predictions(self,
+                                    imgs: list[Image],
+                                    predictions: list[Instances],
+                                    page_numbers: list[int],
+                                    save_image: bool = False,
+                                    output_dir: str = '',
+                                    save_visualization: bool = False) -> list:
+        """Convert instances predicted by `predict` into the outputs of `get_bboxes` for each page.
+
+        See `get_bboxes_batch` for the arguments.
+        """
+        outputs: list = []
+        for img, p, page_number in zip(imgs, predictions, page_numbers):
+            outputs.append(
+                self.get_bboxes_from_instances(img, p, page_number, save_image, output_dir)
+            )
+            if save_image and save_visualization:
+                if output_dir == '' or not Path(output_dir).exists():
+                    raise ValueError('Need to specify the valid save path!')
+                self.save_visualization(
+                    img, p, str(Path(output_dir) / f'{page_number}_{self.model_name}_VISUALIZATION.png')
+                )
+        return outputs
+
+    def get_bboxes(self,
+                   img: Image,
                    page_number: int,
                    save_image: bool = False,
                    output_dir: str = '') -> tuple[dict[int, dict]]:
@@ -21,4 +190,4 @@ class BaseModel:
         Returns:
             Tuple[Dict[int, Dict]]: A tuple of bbox dictionaries.
         """
-        pass
+        return self.get_bboxes_batch([img], [page_number], save_image, output_dir)[0]
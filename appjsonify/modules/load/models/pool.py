@@ -0,0 +1,284 @@
+import atexit
+import bisect
+import multiprocessing as mp
+import os
+import queue
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+import numpy as np
+
+
+def get_devices(
+    detectron_device_mode: str,
+    detectron_workers: int
+) -> list[str]:
+    """Return the device of each worker process of a `DetectorPool`.
+
+    `cuda:all` spreads workers over all visible GPUs in turn, with one worker per GPU by default.
+    Otherwise, all workers use `detectron_device_mode`.
+
+    Args:
+        detectron_device_mode (str): A device such as `cpu`, `cuda`, `cuda:1` or `cuda:all`.
+        detectron_workers (int): The number of worker processes. 0 means one per GPU with `cuda:all`.
+
+    Returns:
+        list[str]: A device for each worker.
+    """
+    if detectron_device_mode != "cuda:all":
+        return [detectron_device_mode] * detectron_workers
+    import torch
+    num_gpus = torch.cuda.device_count()
+    if num_gpus == 0:
+        raise ValueError("`cuda:all` is specified, but no GPUs are available.")
+    num_workers = detectron_workers if detectron_workers > 0 else num_gpus
+    return [f"cuda:{index % num_gpus}" for index in range(num_workers)]
+
+
+def predict_models(
+    models: list,
+    np_imgs: list[np.ndarray],
+    subsets: list[list[int]],
+    executor: Optional[ThreadPoolExecutor] = None
+) -> list[list]:
+    """Run models on their subsets of a batch of pages, sharing resized inputs among them.
+
+    Args:
+        models (list): Models derived from `BaseModel`.
+        np_imgs (list[np.ndarray]): Pages converted by `BaseModel.to_numpy`.
+        subsets (list[list[int]]): Indices of the pages to run each model on.
+        executor (Optional[ThreadPoolExecutor], optional): If given, the models run concurrently
+            in its threads, which pays off as PyTorch releases the GIL during inference.
+            Inputs are resized beforehand so that they are still shared. Defaults to None.
+
+    Returns:
+        list[list]: Predicted instances of each model, one per page of its subset.
+    """
+    shared_inputs: dict = {}
+    model_imgs = [[np_imgs[i] for i in subset] for subset in subsets]
+    if executor is None:
+        return [
+            model.predict(imgs, shared_inputs) if imgs != [] else []
+            for model, imgs in zip(models, model_imgs)
+        ]
+    for model, imgs in zip(models, model_imgs):
+        model.preprocess(imgs, shared_inputs)
+    futures = [
+        executor.submit(model.predict, imgs, shared_inputs) if imgs != [] else None
+        for model, imgs in zip(models, model_imgs)
+    ]
+    return [future.result() if future is not None else [] for future in futures]
+
+
+def _split_cpus(
+    num_workers: int
+) -> list[Optional[list[int]]]:
+    """Split the available CPUs into contiguous blocks, one per worker, so that workers do not share cores."""
+    if not hasattr(os, "sched_getaffinity"):
+        return [None] * num_workers
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < num_workers:
+        return [None] * num_workers
+    # contiguous ids usually belong to the same socket
+    return [list(block) for block in np.array_split(cpus, num_workers)]
+
+
+def _serve(
+    model_specs: list[tuple[type, dict]],
+    device: str,
+    cpus: Optional[list[int]],
+    concurrent_models: bool,
+    task_queue: mp.Queue,
+    result_queue: mp.Queue
+):
+    """Load the models on a device and run them on the tasks of a `DetectorPool` until a stop token arrives."""
+    import torch
+    if cpus is not None:
+        os.sched_setaffinity(0, cpus)
+        torch.set_num_threads(len(cpus))
+    models = [
+        model_class(**model_kwargs, detectron_device_mode=device)
+        for model_class, model_kwargs in model_specs
+    ]
+    executor = ThreadPoolExecutor(max_workers=len(models)) if concurrent_models else None
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        index, np_imgs, subsets = task
+        try:
+            result_queue.put((index, None, predict_models(models, np_imgs, subsets, executor)))
+        except Exception:
+            result_queue.put((index, traceback.format_exc(), None))
+
+
+class DetectorPool:
+    """Detectors served by worker processes, each of which loads all the models on its own device.
+
+    This follows `AsyncPredictor` in `detectron2_demo/predictor.py`, but each task is a batch of pages
+    for several models so that a worker converts each page only once, and results are returned
+    in the order of `put` however many workers there are. If a worker dies, the pool closes itself,
+    and `put` and `get` raise an error instead of waiting for it.
+    """
+    def __init__(
+        self,
+        model_specs: list[tuple[type, dict]],
+        devices: list[str],
+        concurrent_models: bool = False
+    ):
+        """
+        Args:
+            model_specs (list[tuple[type, dict]]): Model classes and their keyword arguments
+                except `detectron_device_mode`.
+            devices (list[str]): A device of each worker process (see `get_devices`).
+            concurrent_models (bool, optional): Whether each worker runs the models concurrently
+                (see `predict_models`). Defaults to False.
+        """
+        # CUDA cannot be used in forked processes
+        context = mp.get_context("spawn")
+        self.task_queue = context.Queue(maxsize=len(devices) * 2)
+        self.result_queue = context.Queue()
+        # split CPUs among workers only when all of them run on CPUs
+        all_cpus = all(device == "cpu" for device in devices) and len(devices) > 1
+        cpus = _split_cpus(len(devices)) if all_cpus else [None] * len(devices)
+        self.procs = [
+            context.Process(
+                target=_serve,
+                args=(model_specs, device, worker_cpus, concurrent_models, self.task_queue, self.result_queue),
+                daemon=True
+            )
+            for device, worker_cpus in zip(devices, cpus)
+        ]
+        for proc in self.procs:
+            proc.start()
+
+        self.put_index = 0
+        self.get_index = 0
+        self.result_rank: list[int] = []
+        self.result_data: list[Any] = []
+        # set once a worker has died (see `close`)
+        self.closed: bool = False
+        atexit.register(self.shutdown)
+
+
+    def _check_open(self):
+        if self.closed:
+            raise RuntimeError("The detector pool was closed as a worker process exited.")
+
+
+    def _check_workers(self):
+        """Close the pool and raise an error if any worker has exited, e.g., on a load failure."""
+        self._check_open()
+        if any(not proc.is_alive() for proc in self.procs):
+            self.close()
+            raise RuntimeError("A detector worker process exited unexpectedly.")
+
+
+    def put(
+        self,
+        np_imgs: list[np.ndarray],
+        subsets: list[list[int]]
+    ):
+        """Submit a batch of pages.
+
+        Args:
+            np_imgs (list[np.ndarray]): Pages converted by `BaseModel.to_numpy`.
+            subsets (list[list[int]]): Indices of the pages to run each model on.
+        """
+        self._check_open()
+        while True:
+            try:
+                self.task_queue.put((self.put_index + 1, np_imgs, subsets), timeout=1)
+                break
+            except queue.Full:
+                # the queue is never drained if the workers have died
+                self._check_workers()
+        self.put_index += 1
+
+
+    def get(self) -> list[list]:
+        """Return the predictions of each model for the oldest batch that has not been returned yet."""
+        self._check_open()
+        self.get_index += 1
+        if len(self.result_rank) and self.result_rank[0] == self.get_index:
+            result = self.result_data[0]
+            del self.result_data[0], self.result_rank[0]
+            return self._unpack(result)
+
+        while True:
+            try:
+                index, error, predictions = self.result_queue.get(timeout=1)
+            except queue.Empty:
+                # a worker that failed to start would never reply
+                self._check_workers()
+                continue
+            if index == self.get_index:
+                return self._unpack((error, predictions))
+            insert = bisect.bisect(self.result_rank, index)
+            self.result_rank.insert(insert, index)
+            self.result_data.insert(insert, (error, predictions))
+
+
+    @staticmethod
+    def _unpack(
+        result: tuple[Optional[str], Optional[list[list]]]
+    ) -> list[list]:
+        error, predictions = result
+        if error is not None:
+            raise RuntimeError(f"A detector worker process failed:\n{error}")
+        return predictions
+
+
+    def discard(self):
+        """Wait for and drop the results of all submitted batches, e.g., after a document fails."""
+        while len(self) > 0 and not self.closed:
+            try:
+                self.get()
+            except RuntimeError:
+                pass
+
+
+    def __len__(self) -> int:
+        """Return the number of batches that have been submitted but not returned."""
+        return self.put_index - self.get_index
+
+
+    @property
+    def default_buffer_size(self) -> int:
+        """The number of batches to keep in flight so that every worker stays busy."""
+        return len(self.procs) * 2
+
+
+    def close(self):
+        """Terminate the workers and close the queues at once, dropping all submitted batches.
+
+        A pool is closed when a worker dies, as the batches it held would never be returned.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for proc in self.procs:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in self.procs:
+            proc.join(timeout=5)
+        for q in (self.task_queue, self.result_queue):
+            # do not wait at exit for tasks that no worker will read
+            q.cancel_join_thread()
+            q.close()
+        self.get_index = self.put_index
+        self.result_rank, self.result_data = [], []
+
+
+    def shutdown(self):
+        """Let the workers exit once they finish the submitted batches."""
+        if self.closed:
+            return
+        for proc in self.procs:
+            if proc.is_alive():
+                try:
+                    self.task_queue.put_nowait(None)
+                except queue.Full:
+                    # daemonic workers are terminated at exit anyway
+                    break
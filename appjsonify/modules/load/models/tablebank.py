@@ -3,24 +3,26 @@ from pathlib import Path
 import numpy as np
 try:
     from detectron2.config import get_cfg
-    from detectron2.data.detection_utils import convert_PIL_to_numpy
+    from detectron2.structures import Instances
 except ModuleNotFoundError:
     raise ModuleNotFoundError("Please install detectron2 by specifying `python -m pip install 'git+https://github.com/facebookresearch/detectron2.git'`!")
 from PIL import Image
 
 from ...common import normalize_bbox
 from .base_model import BaseModel
-from .detectron2_demo.predictor import VisualizationDemo
 
 
 class TableBankModel(BaseModel):
     """Table bounding box detector based on TableBank."""
+    model_name: str = "TABLEBANK"
+    
     def __init__(
         self,
         detectron_config_path: str,
         detectron_model_path: str,
         detectron_device_mode: str,
-        detectron_threshold: float = 0.9
+        detectron_threshold: float = 0.9,
+        build_predictor: bool = True
     ):
         # init
         cfg = get_cfg()
@@ -31,12 +33,13 @@ class TableBankModel(BaseModel):
         cfg.MODEL.ROI_HEADS.SCORE_THRESH_TEST = detectron_threshold
         cfg.MODEL.PANOPTIC_FPN.COMBINE.INSTANCES_CONFIDENCE_THRESH = detectron_threshold
         cfg.freeze()
-        self.demo = VisualizationDemo(cfg)
+        self.load_predictor(cfg, build_predictor)
     
     
-    def get_bboxes(
+    def get_bboxes_from_instances(
         self, 
         img: Image, 
+        p: Instances,
         page_number: int,
         save_image: bool = False,
         output_dir: str = ''
@@ -45,6 +48,7 @@ class TableBankModel(BaseModel):
 
         Args:
             img (Image): An image of a page.
+            p (Instances): Instances predicted for `img`.
             page_number (int): A page number.
             save_image (bool, optional): Whether to save table images. Defaults to False.
             output_dir (str): If `save_image` is True, specify an output image path.
@@ -54,12 +58,7 @@ class TableBankModel(BaseModel):
         """
         # init
         table_bboxes: dict[int, dict] = {}
-        np_img = convert_PIL_to_numpy(img, format="BGR")
-        h, w = np_img.shape[:2]
-        
-        # get bbox predictions
-        predictions, _ = self.demo.run_on_image(np_img)
-        p = predictions["instances"].to('cpu')
+        w, h = img.size
 
         for tb_index, (pred_bbox, _, _) \
             in enumerate(zip(p.pred_boxes, p.scores, p.pred_classes)):
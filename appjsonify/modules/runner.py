@@ -1,3 +1,4 @@
+import copy
 import inspect
 from typing import Any
 
@@ -7,8 +8,35 @@ from .doc import Document
 
 
 class BaseRunner(Registrable):
-    @staticmethod
+    def __init__(
+        self,
+        show_progress: bool = True,
+        inplace: bool = False
+    ):
+        """
+        Args:
+            show_progress (bool, optional): Whether to show a progress bar. Defaults to True.
+            inplace (bool, optional): Whether to edit given documents in place instead of their deep copies.
+            Set this only when the caller does not use the given documents anymore. Defaults to False.
+        """
+        self.show_progress: bool = show_progress
+        self.inplace: bool = inplace
+        # (function, parameters) pairs already reported by `check_args`
+        self._reported_args: set = set()
+    
+    
+    def prepare_documents(
+        self,
+        documents: list[Document]
+    ) -> list[Document]:
+        """Return documents that a module is allowed to edit."""
+        if self.inplace:
+            return documents
+        return copy.deepcopy(documents)
+
+
     def check_args(
+        self,
         func, 
         arg_dict: dict[str, Any]
     ):
@@ -27,7 +55,11 @@ class BaseRunner(Registrable):
             if arg_dict[key] == val:
                 same_params[key] = val
         
-        # put warnings
+        # put warnings only once per runner as it can be reused across documents
+        report_key = (func.__qualname__, repr(same_params))
+        if report_key in self._reported_args:
+            return
+        self._reported_args.add(report_key)
         if same_params != {}:
             print('\tThe followings will use the default value as they are not specified or unchanged!')
             for key, val in same_params.items():
@@ -35,6 +67,30 @@ class BaseRunner(Registrable):
         return
     
     
+    @staticmethod
+    def add_output_path(
+        doc: Document,
+        path: Any
+    ) -> None:
+        """Record a file written for a document so that incremental runs can check that it still exists."""
+        output_paths: list[str] = doc.meta.setdefault("output_paths", [])
+        if str(path) not in output_paths:
+            output_paths.append(str(path))
+
+
+    def prepare(
+        self,
+        documents: list[Document],
+        **kwargs: dict
+    ) -> None:
+        """Do work for documents ahead of `execute`, e.g., rendering pages.
+
+        A pipelined run calls this in a separate thread while `execute` is still processing
+        the preceding documents, and then passes the same documents to `execute`. Does nothing by default.
+        """
+        return
+
+
     def execute(
         self, 
         documents: list[Document],
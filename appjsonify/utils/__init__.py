@@ -1,5 +1,11 @@
+from .cache import DetectionCache, get_file_hash
+from .checkpoint import load_checkpoint, save_checkpoint
 from .download import download, download_individual_file
-from .error import DownloadFailureError, NotAPDFError, PipelineOrderError
+from .error import CheckpointError, DownloadFailureError, NotAPDFError, PipelineOrderError
+from .executor import (build_runners, get_start_index, load_documents, pipeline_documents, run_pipeline,
+                       stream_pipeline)
+from .manifest import Manifest
 from .pipeline_checker import check_pipeline
+from .prefetch import prefetch
 from .print import print_data
 from .template import get_template
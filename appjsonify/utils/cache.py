@@ -0,0 +1,141 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Union
+
+
+def get_file_hash(
+    path: Union[str, Path],
+    chunk_size: int = 1 << 20
+) -> str:
+    """Return the SHA-256 hex digest of the contents of a file."""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class DetectionCache:
+    """Size-bounded LRU cache of detection results on disk.
+
+    Each entry is a pickle file named after the hash of its key. The modification time of an entry
+    is updated whenever it is read, and the least recently used entries are evicted first
+    once the total size exceeds `max_size_mb`. An entry that cannot be loaded is removed and treated as a miss.
+    The cache directory can be shared by multiple processes as entries are written atomically,
+    and an instance can be shared by multiple threads, e.g., the stages of a pipelined run.
+    """
+    suffix: str = '.pkl'
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_size_mb: float = 1024
+    ):
+        """
+        Args:
+            cache_dir (Union[str, Path]): A cache directory. It is created if it does not exist.
+            max_size_mb (float, optional): The maximum total size of entries in megabytes. Defaults to 1024.
+        """
+        self.cache_dir: Path = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size: int = int(max_size_mb * 1024 * 1024)
+        self.total_size: int = sum(path.stat().st_size for path in self._entries())
+        # guards `total_size` and entries being read, written and evicted
+        self._lock = threading.RLock()
+
+
+    @staticmethod
+    def make_key(*fields: Any) -> str:
+        """Make a key from hashable fields such as a file hash, a page number and model settings."""
+        return hashlib.sha256(repr(fields).encode('utf-8')).hexdigest()
+
+
+    def _entries(self) -> list[Path]:
+        return list(self.cache_dir.glob(f'*{self.suffix}'))
+
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}{self.suffix}'
+
+
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self.total_size -= size
+
+
+    def get(
+        self,
+        key: str
+    ) -> tuple[bool, Any]:
+        """Return whether `key` is cached and its value. The value is None on a cache miss."""
+        with self._lock:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except FileNotFoundError:
+                return (False, None)
+            except Exception:
+                # drop an entry that is truncated or was written by an incompatible version
+                self._remove(path)
+                return (False, None)
+            try:
+                # mark as recently used
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            return (True, value)
+
+
+    def put(
+        self,
+        key: str,
+        value: Any
+    ):
+        """Store a value and evict the least recently used entries if the cache is full."""
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self._path(key)
+            try:
+                # an existing entry is overwritten
+                self.total_size -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            self.total_size += os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+            if self.total_size > self.max_size:
+                self.evict()
+
+
+    def evict(self):
+        """Remove the least recently used entries until the total size fits in the limit."""
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            for path in self._entries():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+
+            # the total size is recounted as other processes may share the directory
+            self.total_size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if self.total_size <= self.max_size:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self.total_size -= size
@@ -0,0 +1,78 @@
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from ..modules.doc import Document
+from .error import CheckpointError
+
+
+def get_checkpoint_path(
+    pdf_path: Path,
+    output_dir: Path,
+    index: int,
+    module_name: str
+) -> Path:
+    """Return a checkpoint path, which is placed next to the intermediate logs of `--verbose`."""
+    return output_dir / pdf_path.stem / f'{index}_{module_name}.ckpt'
+
+
+def save_checkpoint(
+    documents: list[Document],
+    output_dir: Path,
+    pipeline: list[str],
+    index: int
+):
+    """Save documents right after the `index`-th module of a pipeline, one binary file per document.
+
+    Args:
+        documents (list[Document]): A list of documents.
+        output_dir (Path): An output directory.
+        pipeline (list[str]): A list of module names.
+        index (int): The index of the module that has just finished.
+    """
+    for doc in documents:
+        output_path = get_checkpoint_path(doc.input_path, output_dir, index, pipeline[index])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # write to a temporary file first not to leave a broken checkpoint behind
+        fd, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(
+                {"pipeline": pipeline[:index + 1], "document": doc},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, output_path)
+
+
+def load_checkpoint(
+    pdf_path: Path,
+    output_dir: Path,
+    pipeline: list[str],
+    index: int
+) -> Document:
+    """Load a document saved by `save_checkpoint` right after the `index`-th module of a pipeline.
+
+    Raises:
+        FileNotFoundError: Throws an error when the checkpoint does not exist.
+        CheckpointError: Throws an error when the checkpoint was made with different preceding modules.
+
+    Returns:
+        Document: A document to be passed to the `index + 1`-th module.
+    """
+    checkpoint_path = get_checkpoint_path(pdf_path, output_dir, index, pipeline[index])
+    if not checkpoint_path.exists():
+        raise FileNotFoundError(f"No checkpoint for {pdf_path} at {checkpoint_path}.")
+    with open(checkpoint_path, 'rb') as f:
+        checkpoint: dict = pickle.load(f)
+    if checkpoint["pipeline"] != pipeline[:index + 1]:
+        raise CheckpointError(
+            f"{checkpoint_path} was made with the pipeline {checkpoint['pipeline']}, "
+            f"which differs from {pipeline[:index + 1]}."
+        )
+    
+    # keep the given path as the PDF file may have been moved since the checkpoint was made
+    doc: Document = checkpoint["document"]
+    doc.input_path = pdf_path
+    return doc
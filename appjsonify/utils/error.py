@@ -15,3 +15,9 @@ class DownloadFailureError(Exception):
     def __init__(self, message="Failed to download the file from the given URL."):
         self.message = message
         super().__init__(self.message)
+
+class CheckpointError(Exception):
+    """Checkpoint error!"""
+    def __init__(self, message="The checkpoint does not match the given pipeline."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,348 @@
+import argparse
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from tqdm import tqdm
+
+from ..modules.doc import Document
+from ..modules.runner import BaseRunner
+from .checkpoint import load_checkpoint, save_checkpoint
+from .error import CheckpointError
+from .manifest import Manifest
+from .prefetch import prefetch
+from .print import print_data
+
+# module instances and arguments of a worker process (see `_init_worker`)
+_worker_state: dict = {}
+
+
+def build_runners(
+    pipeline: list[str],
+    show_progress: bool = True,
+    inplace: bool = False
+) -> list[tuple[str, BaseRunner]]:
+    """Instantiate the modules of a pipeline so that they can be reused across documents.
+
+    Args:
+        pipeline (list[str]): A list of module names.
+        show_progress (bool, optional): Whether each module shows its own progress bar. Defaults to True.
+        inplace (bool, optional): Whether each module edits documents in place. Defaults to False.
+
+    Returns:
+        list[tuple[str, BaseRunner]]: A list of module names and their instances.
+    """
+    return [
+        (module_name, BaseRunner.by_name(module_name)(show_progress=show_progress, inplace=inplace))
+        for module_name in pipeline
+    ]
+
+
+def get_start_index(
+    args: argparse.Namespace
+) -> int:
+    """Return the index of the first module to run, which follows `args.resume_from` if it is set."""
+    if args.resume_from is None:
+        return 0
+    if args.resume_from not in args.pipeline:
+        raise CheckpointError(f"Cannot resume from {args.resume_from} as it is not in the pipeline {args.pipeline}.")
+    return args.pipeline.index(args.resume_from) + 1
+
+
+def load_documents(
+    pdf_paths: list[Path],
+    args: argparse.Namespace,
+    output_dir: Path
+) -> list[Document]:
+    """Create documents to be passed to the first module to run, restoring them from checkpoints when resuming."""
+    start_index = get_start_index(args)
+    if start_index == 0:
+        return [Document(pdf_path) for pdf_path in pdf_paths]
+    return [
+        load_checkpoint(pdf_path, output_dir, args.pipeline, start_index - 1)
+        for pdf_path in pdf_paths
+    ]
+
+
+def run_pipeline(
+    documents: list[Document],
+    runners: list[tuple[str, BaseRunner]],
+    args: argparse.Namespace,
+    output_dir: Path,
+    show_log: bool = True,
+    start_index: int = 0
+) -> list[Document]:
+    """Run all modules of a pipeline over given documents one module at a time.
+
+    Args:
+        documents (list[Document]): A list of documents.
+        runners (list[tuple[str, BaseRunner]]): Module names and instances returned by `build_runners`.
+        args (argparse.Namespace): Arguments passed to each module.
+        output_dir (Path): An output directory.
+        show_log (bool, optional): Whether to print the name of a running module. Defaults to True.
+        start_index (int, optional): The index of the first of `runners` in `args.pipeline`. Defaults to 0.
+
+    Returns:
+        list[Document]: A list of processed documents.
+    """
+    for index, (module_name, runner) in enumerate(runners, start=start_index):
+        if show_log:
+            print(f'Now running {index}: {module_name}')
+        documents = _run_module(documents, index, module_name, runner, args, output_dir)
+    return documents
+
+
+def _run_module(
+    documents: list[Document],
+    index: int,
+    module_name: str,
+    runner: BaseRunner,
+    args: argparse.Namespace,
+    output_dir: Path
+) -> list[Document]:
+    """Run a module, and print and save its outputs as specified by `args`."""
+    # execute a process
+    documents = runner.execute(documents=documents, **vars(args))
+
+    # print and save current data
+    if args.verbose:
+        print_data(
+            documents,
+            output_dir,
+            f'{index}_{module_name}',
+            args.insert_page_break,
+            args.show_pos,
+            args.show_font,
+            args.show_style,
+            args.show_meta
+        )
+    
+    # save documents to resume from this module later
+    if module_name in args.checkpoint_stages:
+        save_checkpoint(documents, output_dir, args.pipeline, index)
+    return documents
+
+
+def _prepare_module(
+    documents: list[Document],
+    runner: BaseRunner,
+    args: argparse.Namespace
+) -> list[Document]:
+    runner.prepare(documents, **vars(args))
+    return documents
+
+
+def _run_stage(
+    items: Iterator[list],
+    func: Callable[[list[Document]], list[Document]]
+) -> Iterator[list]:
+    """Apply a stage to each document that has not failed in the preceding stages."""
+    for item in items:
+        _, documents, error, _ = item
+        if error is None:
+            try:
+                item[1] = func(documents)
+            except Exception:
+                item[1] = None
+                item[2] = traceback.format_exc()
+        yield item
+
+
+def pipeline_documents(
+    pdf_paths: list[Path],
+    runners: list[tuple[str, BaseRunner]],
+    args: argparse.Namespace,
+    output_dir: Path,
+    stage_queue_size: int = 1
+) -> Iterator[tuple[Path, Optional[str], float, list[str]]]:
+    """Run a whole pipeline over documents with each module in its own thread.
+
+    Modules are connected by queues of at most `stage_queue_size` documents, so that a module processes
+    a document while the preceding modules process the following documents, e.g., `load_docs` parses
+    a document while `load_objects_with_ml` renders the next one with `prepare` and runs the detectors
+    on the one before. The throughput approaches that of the slowest module when the modules
+    release the GIL, as pdftoppm and PyTorch do, and memory usage stays bounded.
+
+    Args:
+        pdf_paths (list[Path]): A list of paths to PDF files.
+        runners (list[tuple[str, BaseRunner]]): Module names and instances returned by `build_runners`.
+        args (argparse.Namespace): Arguments passed to each module.
+        output_dir (Path): An output directory.
+        stage_queue_size (int, optional): The maximum number of documents waiting for each module. Defaults to 1.
+
+    Yields:
+        tuple[Path, Optional[str], float, list[str]]: The same as `process_document`, in the order of `pdf_paths`.
+    """
+    start_index = get_start_index(args)
+
+    def load() -> Iterator[list]:
+        for pdf_path in pdf_paths:
+            start = time.perf_counter()
+            try:
+                yield [pdf_path, load_documents([pdf_path], args, output_dir), None, start]
+            except Exception:
+                yield [pdf_path, None, traceback.format_exc(), start]
+
+    items = load()
+    for index, (module_name, runner) in enumerate(runners, start=start_index):
+        # give modules that can work ahead a stage of their own
+        if type(runner).prepare is not BaseRunner.prepare:
+            items = prefetch(
+                _run_stage(items, partial(_prepare_module, runner=runner, args=args)),
+                max_prefetch=stage_queue_size
+            )
+        items = prefetch(
+            _run_stage(
+                items,
+                partial(
+                    _run_module,
+                    index=index,
+                    module_name=module_name,
+                    runner=runner,
+                    args=args,
+                    output_dir=output_dir
+                )
+            ),
+            max_prefetch=stage_queue_size
+        )
+    for pdf_path, documents, error, start in items:
+        yield (pdf_path, error, time.perf_counter() - start, get_output_paths(documents))
+
+
+def get_output_paths(
+    documents: Optional[list[Document]]
+) -> list[str]:
+    """Return the files written for documents (see `BaseRunner.add_output_path`)."""
+    if documents is None:
+        return []
+    return [path for doc in documents for path in doc.meta.get("output_paths", [])]
+
+
+def process_document(
+    pdf_path: Path,
+    runners: list[tuple[str, BaseRunner]],
+    args: argparse.Namespace,
+    output_dir: Path
+) -> tuple[Path, Optional[str], float, list[str]]:
+    """Run a whole pipeline over a single document.
+
+    An exception raised while processing the document is caught and returned
+    so that it does not stop the processing of the other documents.
+
+    Returns:
+        tuple[Path, Optional[str], float, list[str]]: A path to the PDF file, a traceback if the process failed,
+        the elapsed time in seconds, and the files written for the document.
+    """
+    start = time.perf_counter()
+    try:
+        documents = run_pipeline(
+            load_documents([pdf_path], args, output_dir),
+            runners,
+            args,
+            output_dir,
+            show_log=False,
+            start_index=get_start_index(args)
+        )
+    except Exception:
+        return (pdf_path, traceback.format_exc(), time.perf_counter() - start, [])
+    return (pdf_path, None, time.perf_counter() - start, get_output_paths(documents))
+
+
+def _init_worker(
+    args: argparse.Namespace,
+    output_dir: Path
+):
+    """Build the modules once per worker process."""
+    _worker_state["runners"] = build_runners(
+        args.pipeline[get_start_index(args):],
+        show_progress=False,
+        inplace=not args.copy_documents
+    )
+    _worker_state["args"] = args
+    _worker_state["output_dir"] = output_dir
+
+
+def _process_document_in_worker(
+    pdf_path: Path
+) -> tuple[Path, Optional[str], float, list[str]]:
+    return process_document(
+        pdf_path,
+        _worker_state["runners"],
+        _worker_state["args"],
+        _worker_state["output_dir"]
+    )
+
+
+def stream_pipeline(
+    pdf_paths: list[Path],
+    args: argparse.Namespace,
+    output_dir: Path,
+    workers: int = 1,
+    manifest: Optional[Manifest] = None,
+    pipelined: bool = False,
+    stage_queue_size: int = 1
+) -> list[tuple[Path, str]]:
+    """Run a whole pipeline document by document.
+
+    Each document goes through all the modules and is released once the last module finishes,
+    so that memory usage does not grow with the number of documents.
+    If `workers` is more than one, documents are distributed to a pool of worker processes,
+    each of which runs the whole pipeline. If `pipelined` is True, modules run in parallel
+    on successive documents (see `pipeline_documents`). Progress is reported in the order of `pdf_paths`.
+
+    Args:
+        pdf_paths (list[Path]): A list of paths to PDF files.
+        args (argparse.Namespace): Arguments passed to each module.
+        output_dir (Path): An output directory.
+        workers (int, optional): The number of worker processes. Defaults to 1.
+        manifest (Optional[Manifest], optional): If given, the result of each document is recorded. Defaults to None.
+        pipelined (bool, optional): Whether to run modules in parallel. Cannot be used with `workers`.
+            Defaults to False.
+        stage_queue_size (int, optional): The maximum number of documents waiting for each module
+            when `pipelined` is True. Defaults to 1.
+
+    Returns:
+        list[tuple[Path, str]]: Paths to the PDF files that failed and their tracebacks.
+    """
+    if pipelined and workers > 1:
+        raise ValueError('Cannot run modules in parallel with multiple worker processes.')
+    if stage_queue_size < 1:
+        raise ValueError(f'`stage_queue_size` must be positive, but got {stage_queue_size}.')
+    failures: list[tuple[Path, str]] = []
+
+    def collect(results: Iterator[tuple[Path, Optional[str], float, list[str]]]):
+        for pdf_path, error, elapsed, output_paths in tqdm(results, total=len(pdf_paths)):
+            if manifest is not None:
+                manifest.record(pdf_path, error, elapsed, output_paths)
+            if error is not None:
+                print(f'Failed to process {pdf_path}:\n{error}')
+                failures.append((pdf_path, error))
+
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(args, output_dir)
+        ) as executor:
+            collect(executor.map(_process_document_in_worker, pdf_paths))
+    else:
+        runners = build_runners(
+            args.pipeline[get_start_index(args):],
+            show_progress=False,
+            inplace=not args.copy_documents
+        )
+        if pipelined:
+            collect(pipeline_documents(pdf_paths, runners, args, output_dir, stage_queue_size))
+        else:
+            collect(process_document(pdf_path, runners, args, output_dir) for pdf_path in pdf_paths)
+    
+    if manifest is not None:
+        manifest.save()
+    if failures != []:
+        print(f'{len(failures)} out of {len(pdf_paths)} documents failed:')
+        for pdf_path, _ in failures:
+            print(f'\t{pdf_path}')
+    return failures
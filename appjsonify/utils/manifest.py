@@ -0,0 +1,142 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Optional
+
+from .cache import get_file_hash
+
+# arguments that do not change output JSON files
+EXECUTION_ARGS = {
+    "input_dir_or_file_path", "output_dir", "verbose", "insert_page_break", "show_pos", "show_font",
+    "show_style", "show_meta", "streaming", "workers", "copy_documents", "checkpoint_stages",
+    "resume_from", "incremental", "detectron_device_mode", "detectron_batch_size", "detectron_workers",
+    "concurrent_detectors", "detection_cache_dir", "detection_cache_size", "save_visualization",
+    "render_thread_count", "render_chunk_size", "pipelined", "stage_queue_size"
+}
+
+
+def get_version() -> str:
+    """Return the installed version of appjsonify."""
+    try:
+        return version("appjsonify")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class Manifest:
+    """Records of converted PDF files for incremental processing.
+
+    A PDF file is converted again only if its contents, the pipeline and its arguments,
+    or the version of appjsonify have changed since it was converted successfully,
+    or if any of the files written for it has been removed.
+    """
+    def __init__(
+        self,
+        manifest_path: Path,
+        input_dir: Path,
+        args: argparse.Namespace,
+        save_interval: float = 10.0
+    ):
+        """
+        Args:
+            manifest_path (Path): A path to a manifest file. It is created if it does not exist.
+            input_dir (Path): A directory that PDF paths are recorded relative to.
+            args (argparse.Namespace): Arguments of the current run.
+            save_interval (float, optional): The minimum interval in seconds between saves
+                while recording results. Defaults to 10.0.
+        """
+        self.manifest_path: Path = manifest_path
+        self.input_dir: Path = input_dir
+        self.save_interval: float = save_interval
+        self.version: str = get_version()
+        config = {key: val for key, val in sorted(vars(args).items()) if key not in EXECUTION_ARGS}
+        self.config_hash: str = hashlib.sha256(
+            json.dumps(config, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        self.documents: dict[str, dict] = {}
+        if manifest_path.exists():
+            self.documents = json.loads(manifest_path.read_text()).get("documents", {})
+        # file hashes of this run, computed by `is_up_to_date`
+        self._file_hashes: dict[str, str] = {}
+        self._last_saved: float = time.monotonic()
+
+
+    def _get_key(self, pdf_path: Path) -> str:
+        return pdf_path.relative_to(self.input_dir).as_posix()
+
+
+    def _get_file_hash(self, pdf_path: Path) -> str:
+        key = self._get_key(pdf_path)
+        if key not in self._file_hashes:
+            stat = pdf_path.stat()
+            record = self.documents.get(key, {})
+            if record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+                # skip hashing unchanged files
+                self._file_hashes[key] = record["sha256"]
+            else:
+                self._file_hashes[key] = get_file_hash(pdf_path)
+        return self._file_hashes[key]
+
+
+    def is_up_to_date(self, pdf_path: Path) -> bool:
+        """Return whether a PDF file has been converted successfully with the current settings and its outputs exist."""
+        record = self.documents.get(self._get_key(pdf_path))
+        return record is not None \
+            and record["status"] == "success" \
+            and record["config_hash"] == self.config_hash \
+            and record["version"] == self.version \
+            and "outputs" in record \
+            and all((self.manifest_path.parent / output).exists() for output in record["outputs"]) \
+            and record["sha256"] == self._get_file_hash(pdf_path)
+
+
+    def record(
+        self,
+        pdf_path: Path,
+        error: Optional[str],
+        elapsed: float,
+        output_paths: Optional[list[str]] = None
+    ):
+        """Record the result of a PDF file and save the manifest from time to time.
+
+        `output_paths` are the files written for the PDF file, which are recorded relative to the manifest.
+        """
+        stat = pdf_path.stat()
+        self.documents[self._get_key(pdf_path)] = {
+            "sha256": self._get_file_hash(pdf_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "config_hash": self.config_hash,
+            "version": self.version,
+            "status": "success" if error is None else "failed",
+            "outputs": [
+                Path(os.path.relpath(output_path, self.manifest_path.parent)).as_posix()
+                for output_path in (output_paths if output_paths is not None else [])
+            ],
+            "error": error.strip().splitlines()[-1] if error is not None else None,
+            "elapsed": round(elapsed, 3),
+            "processed_at": datetime.now(timezone.utc).isoformat(timespec='seconds')
+        }
+        if time.monotonic() - self._last_saved >= self.save_interval:
+            self.save()
+
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.manifest_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(
+                {"version": self.version, "documents": self.documents},
+                f,
+                indent=4,
+                ensure_ascii=False
+            )
+        os.replace(tmp_path, self.manifest_path)
+        self._last_saved = time.monotonic()
@@ -14,6 +14,7 @@ prerequisites = {
     'dump_doc_with_paragraphs': ['load_docs', 'extract_lines', 'extract_paragraphs'],
     'dump_doc_with_lines': ['load_docs', 'extract_lines'],
     'dump_doc_with_tokens': ['load_docs'],
+    'dump_columnar': ['load_docs'],
     'dump_formatted_doc': ['load_docs', 'extract_lines', 'extract_paragraphs', 'detect_sections', 'concat_pages'],
     'load_objects_with_ml': ['load_docs'],
     'remove_figures_with_ml': ['load_docs', 'load_objects_with_ml', 'extract_lines'],
@@ -0,0 +1,54 @@
+import queue
+import threading
+from typing import Any, Iterable, Iterator
+
+
+def prefetch(
+    iterable: Iterable,
+    max_prefetch: int = 1
+) -> Iterator:
+    """Iterate over `iterable` in a background thread, keeping at most `max_prefetch` items ahead of the consumer.
+
+    This overlaps producing items, e.g., rendering pages with external processes, with consuming them
+    while bounding the number of items held in memory. An exception raised by `iterable` is raised
+    in the consumer. The producer stops when the consumer stops iterating.
+
+    Args:
+        iterable (Iterable): Items to produce.
+        max_prefetch (int, optional): The maximum number of items produced in advance. Defaults to 1.
+    """
+    items: queue.Queue = queue.Queue(maxsize=max_prefetch)
+    stopped = threading.Event()
+    end = object()
+
+    def put(entry: tuple[bool, Any]) -> bool:
+        """Wait for a free slot unless the consumer has stopped."""
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+            put((True, end))
+        except BaseException as e:
+            put((False, e))
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            success, item = items.get()
+            if not success:
+                raise item
+            if item is end:
+                return
+            yield item
+    finally:
+        stopped.set()
@@ -34,11 +34,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir":args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 75,
             "footer_offset": 80,
             "left_side_offset": 40,
@@ -87,6 +113,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 75,
             "footer_offset": 80,
@@ -131,11 +173,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 65,
             "footer_offset": 80,
             "left_side_offset": 40,
@@ -184,6 +252,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 65,
             "footer_offset": 80,
@@ -228,11 +312,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 60,
             "footer_offset": 90,
             "left_side_offset": 40,
@@ -280,6 +390,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 60,
             "footer_offset": 90,
@@ -323,11 +449,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir":args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 60,
             "footer_offset": 80,
             "left_side_offset": 40,
@@ -376,6 +528,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 60,
             "footer_offset": 80,
@@ -419,11 +587,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 60,
             "footer_offset": 90,
             "left_side_offset": 40,
@@ -471,6 +665,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 60,
             "footer_offset": 90,
@@ -514,11 +724,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 65,
             "footer_offset": 80,
             "left_side_offset": 40,
@@ -566,6 +802,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 65,
             "footer_offset": 80,
@@ -608,11 +860,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 60,
             "footer_offset": 75,
             "left_side_offset": 40,
@@ -660,6 +938,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 60,
             "footer_offset": 75,
@@ -702,11 +996,37 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "tablebank_threshold": 0.9,
             "detectron_device_mode": args.detectron_device_mode,
+            "detectron_batch_size": args.detectron_batch_size,
+            "detectron_workers": args.detectron_workers,
+            "concurrent_detectors": args.concurrent_detectors,
             "save_image": args.save_image,
+            "save_visualization": args.save_visualization,
             "output_image_dir": args.output_image_dir,
+            "detection_cache_dir": args.detection_cache_dir,
+            "detection_cache_size": args.detection_cache_size,
+            "render_dpi": args.render_dpi,
+            "render_grayscale": args.render_grayscale,
+            "render_thread_count": args.render_thread_count,
+            "render_chunk_size": args.render_chunk_size,
             "header_offset": 60,
             "footer_offset": 75,
             "left_side_offset": 40,
@@ -754,6 +1074,22 @@ def get_template(
             "show_font": args.show_font,
             "show_style": args.show_style,
             "show_meta": args.show_meta,
+            "streaming": args.streaming,
+            "workers": args.workers,
+            "pipelined": args.pipelined,
+            "stage_queue_size": args.stage_queue_size,
+            "copy_documents": args.copy_documents,
+            "incremental": args.incremental,
+            "checkpoint_stages": args.checkpoint_stages,
+            "resume_from": args.resume_from,
+            "pages": args.pages,
+            "max_pages": args.max_pages,
+            "compact_json": args.compact_json,
+            "json_backend": args.json_backend,
+            "corpus_jsonl": args.corpus_jsonl,
+            "corpus_name": args.corpus_name,
+            "shard_size": args.shard_size,
+            "shard_compression": args.shard_compression,
             "x_tolerance": 1.2,
             "header_offset": 60,
             "footer_offset": 75,
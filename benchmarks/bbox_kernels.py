@@ -0,0 +1,110 @@
+"""Measure the batched bbox kernels in `appjsonify.modules.common` against the scalar functions.
+
+Random page-like bboxes are compared pair by pair with `check_token_overlap` and `judge_within_bbox`,
+and all at once with `batch_check_token_overlap` and `batch_judge_within_bbox`.
+The script also checks that both give identical results, including the exact overlap ratios.
+
+Usage:
+    python benchmarks/bbox_kernels.py [--num_objects 10] [--num_lines 100] [--num_pages 200]
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from appjsonify.modules.common import (batch_check_token_overlap,
+                                       batch_judge_within_bbox,
+                                       batch_normalize_bbox,
+                                       batch_overlap_ratio,
+                                       check_token_overlap, judge_within_bbox,
+                                       normalize_bbox)
+
+
+def random_bboxes(
+    rng: random.Random,
+    num_bboxes: int,
+    max_width: int,
+    max_height: int
+) -> list[tuple[int]]:
+    """Return normalised bboxes with a positive area."""
+    bboxes: list[tuple[int]] = []
+    for _ in range(num_bboxes):
+        x0, y0 = rng.randint(0, 990), rng.randint(0, 990)
+        bboxes.append(
+            (x0, y0, min(1000, x0 + rng.randint(1, max_width)), min(1000, y0 + rng.randint(1, max_height)))
+        )
+    return bboxes
+
+
+def check_identical(
+    pages: list[tuple[list[tuple[int]], list[tuple[int]]]],
+    offset: int
+) -> bool:
+    for objs, lines in pages:
+        for metric in ('min', 'union'):
+            ratios = batch_overlap_ratio(objs, lines, bbox_overlap_metric=metric)
+            for threshold in (0.0, 0.5, 0.95):
+                mask = batch_check_token_overlap(objs, lines, threshold, metric)
+                for i, obj in enumerate(objs):
+                    for j, line in enumerate(lines):
+                        if bool(mask[i, j]) != check_token_overlap(obj, line, threshold, metric):
+                            return False
+            # a ratio r is exact if the scalar function judges `r > r` False and `r > r - ulp` True
+            for i, j in zip(*np.nonzero(ratios)):
+                ratio = float(ratios[i, j])
+                if check_token_overlap(objs[i], lines[j], ratio, metric) \
+                    or not check_token_overlap(objs[i], lines[j], math.nextafter(ratio, -math.inf), metric):
+                    return False
+        ref_bboxes = [(b[0] - offset, b[1] - offset, b[2] + offset, b[3] + offset) for b in objs]
+        within = batch_judge_within_bbox(ref_bboxes, lines)
+        for i, ref_bbox in enumerate(ref_bboxes):
+            for j, line in enumerate(lines):
+                if bool(within[i, j]) != judge_within_bbox(ref_bbox, line):
+                    return False
+        raw_bboxes = [[x * 0.6123 - 3.3 for x in line] for line in lines]
+        if batch_normalize_bbox(raw_bboxes, 612, 792).tolist() \
+            != [list(normalize_bbox(bbox, 612, 792)) for bbox in raw_bboxes]:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_objects", type=int, default=10, help="The number of objects per page.")
+    parser.add_argument("--num_lines", type=int, default=100, help="The number of lines per page.")
+    parser.add_argument("--num_pages", type=int, default=200, help="The number of pages.")
+    parser.add_argument("--offset", type=int, default=25, help="`object_bbox_offset` for containment.")
+    parser.add_argument("--seed", type=int, default=0, help="A random seed.")
+    bench_args = parser.parse_args()
+
+    rng = random.Random(bench_args.seed)
+    pages = [
+        (random_bboxes(rng, bench_args.num_objects, 400, 300), random_bboxes(rng, bench_args.num_lines, 400, 15))
+        for _ in range(bench_args.num_pages)
+    ]
+    offset = bench_args.offset
+    print(f'{bench_args.num_pages} pages, {bench_args.num_objects} objects x {bench_args.num_lines} lines per page, '
+          f'identical: {check_identical(pages, offset)}')
+
+    def scalar(objs, lines):
+        ref_bboxes = [(b[0] - offset, b[1] - offset, b[2] + offset, b[3] + offset) for b in objs]
+        overlaps = [[check_token_overlap(obj, line, 0.5) for line in lines] for obj in objs]
+        within = [[judge_within_bbox(ref_bbox, line) for line in lines] for ref_bbox in ref_bboxes]
+        return overlaps, within
+
+    def batched(objs, lines):
+        ref_bboxes = [(b[0] - offset, b[1] - offset, b[2] + offset, b[3] + offset) for b in objs]
+        return batch_check_token_overlap(objs, lines, 0.5), batch_judge_within_bbox(ref_bboxes, lines)
+
+    for name, func in (("scalar", scalar), ("batched", batched)):
+        start = time.perf_counter()
+        for objs, lines in pages:
+            func(objs, lines)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>8}: {elapsed:7.3f}s, {bench_args.num_pages / elapsed:9.1f} pages/sec')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measure the share of wall time spent on deep-copying documents between modules.
+
+Runs the rule-based part of the `ACL2` template twice, once with modules working on deep copies
+(`--copy_documents`) and once with modules editing documents in place (default of the CLI).
+
+Usage:
+    python benchmarks/deepcopy_share.py
+    python benchmarks/deepcopy_share.py --pdf /path/to/paper.pdf --num_docs 10
+"""
+import argparse
+import copy
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from appjsonify.modules.doc import Document, Page, Token
+from appjsonify.utils import build_runners, get_template
+
+PIPELINE = [
+    "remove_illegal_tokens", "remove_meta", "extract_lines", "extract_footnotes",
+    "remove_lines_by_objects", "extract_paragraphs", "detect_sections",
+    "concat_columns", "concat_pages", "dump_formatted_doc"
+]
+
+
+def make_synthetic_document(
+    index: int,
+    num_pages: int = 10,
+    lines_per_column: int = 55,
+    tokens_per_line: int = 9
+) -> Document:
+    """Make a two-column document similar to a conference paper."""
+    rng = random.Random(index)
+    pages: list[Page] = []
+    for _ in range(num_pages):
+        tokens: list[Token] = []
+        for x_start in (100, 520):
+            for line_index in range(lines_per_column):
+                y0 = 90 + line_index * 15
+                x0 = x_start
+                for _ in range(tokens_per_line):
+                    width = rng.randint(10, 40)
+                    tokens.append(
+                        Token(
+                            ''.join(rng.choice('abcdefghij') for _ in range(width // 5)) + '.',
+                            (x0, y0, x0 + width, y0 + 10),
+                            10.9,
+                            'ABCDEF+NimbusRomNo9L-Regu'
+                        )
+                    )
+                    x0 += width + 5
+        pages.append(
+            Page(None, None, tokens, meta={"images": [], "lines": [], "curves": [], "rects": []})
+        )
+    return Document(Path(f'synthetic_{index}.pdf'), pages)
+
+
+def load_documents(
+    pdf_path: str,
+    num_docs: int
+) -> list[Document]:
+    runner = build_runners(["load_docs"], show_progress=False)[0][1]
+    docs = runner.execute([Document(Path(pdf_path))], x_tolerance=1.2)
+    return [copy.deepcopy(docs[0]) for _ in range(num_docs)]
+
+
+def run(
+    documents: list[Document],
+    args: argparse.Namespace,
+    inplace: bool
+) -> tuple[float, float]:
+    """Return the total wall time and the time spent on copying documents."""
+    copy_times: list[float] = []
+    runners = build_runners(PIPELINE, show_progress=False, inplace=inplace)
+    for _, runner in runners:
+        # time `prepare_documents`, where documents are copied unless running in place
+        def timed_prepare(documents, prepare=runner.prepare_documents):
+            start = time.perf_counter()
+            ret = prepare(documents)
+            copy_times.append(time.perf_counter() - start)
+            return ret
+        runner.prepare_documents = timed_prepare
+
+    start = time.perf_counter()
+    for _, runner in runners:
+        documents = runner.execute(documents=documents, **vars(args))
+    return time.perf_counter() - start, sum(copy_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", type=str, default=None, help="Use a real PDF instead of synthetic documents.")
+    parser.add_argument("--num_docs", type=int, default=10, help="The number of documents.")
+    bench_args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        args = get_template(
+            "ACL2",
+            argparse.Namespace(
+                input_dir_or_file_path="", output_dir=output_dir, paper_type="ACL2",
+                verbose=False, insert_page_break=False, show_pos=False, show_font=False,
+                show_style=False, show_meta=False, streaming=False, workers=1, copy_documents=False,
+                checkpoint_stages=[], resume_from=None, incremental=False
+            )
+        )
+        if bench_args.pdf is not None:
+            documents = load_documents(bench_args.pdf, bench_args.num_docs)
+        else:
+            documents = [make_synthetic_document(index) for index in range(bench_args.num_docs)]
+        num_tokens = sum(len(page.tokens) for doc in documents for page in doc.pages)
+        print(f'{len(documents)} documents, {num_tokens} tokens, {len(PIPELINE)} modules')
+
+        for inplace in (False, True):
+            total, copy_time = run(copy.deepcopy(documents), args, inplace)
+            mode = "in place" if inplace else "deepcopy"
+            print(f'{mode:>9}: total {total:7.2f}s, copy {copy_time:7.2f}s ({copy_time / total * 100:5.1f}%)')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure memory, pickling and copying costs of the document classes.
+
+Compares the `__slots__` based `Token` with an equivalent class having a per-instance `__dict__`.
+
+Usage:
+    python benchmarks/document_memory.py [--num_tokens 200000]
+"""
+import argparse
+import copy
+import pickle
+import time
+import tracemalloc
+
+from appjsonify.modules.doc import Token
+
+FONT_NAMES = ['ABCDEF+NimbusRomNo9L-Regu', 'ABCDEF+NimbusRomNo9L-Medi', 'ABCDEF+CMMI10']
+
+
+class DictToken:
+    """`Token` without `__slots__` nor interned font names."""
+    def __init__(
+        self, 
+        token: str, 
+        pos: tuple,
+        font_size: float,
+        font_name: str,
+        meta: dict = None
+    ):
+        self.token: str = token
+        self.pos: tuple = pos
+        self.font_size: float = font_size
+        self.font_name: str = font_name
+        self.meta: dict = meta if meta is not None else {}
+
+
+def make_tokens(
+    token_class: type,
+    num_tokens: int
+) -> list:
+    # font names are built per token as they are when parsed from a PDF file
+    return [
+        token_class(
+            f'token{i % 1000}',
+            (float(i % 500), float(i % 700), float(i % 500 + 20), float(i % 700 + 10)),
+            10.9,
+            ''.join(list(FONT_NAMES[i % len(FONT_NAMES)]))
+        )
+        for i in range(num_tokens)
+    ]
+
+
+def measure(
+    token_class: type,
+    num_tokens: int
+):
+    tracemalloc.start()
+    tokens = make_tokens(token_class, num_tokens)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    data = pickle.dumps(tokens, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle.loads(data)
+    pickle_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    copy.deepcopy(tokens)
+    copy_time = time.perf_counter() - start
+    print(
+        f'{token_class.__name__:>9}: {memory / num_tokens:6.1f} bytes/token, '
+        f'pickle {len(data) / num_tokens:5.1f} bytes/token, '
+        f'pickle round trip {pickle_time:5.2f}s, deepcopy {copy_time:5.2f}s'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_tokens", type=int, default=200000, help="The number of tokens.")
+    bench_args = parser.parse_args()
+    for token_class in (DictToken, Token):
+        measure(token_class, bench_args.num_tokens)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Measure the line grouping speed of `extract_lines` on pages with thousands of tokens.
+
+`LineExtractor` used to compare each token with `np.mean` over the positions of all the tokens
+in the current line, which is quadratic in the line length. It now keeps running sums.
+This compares the grouping of the old approach with the current `LineExtractor._extract_lines`
+on synthetic reference lists and dense tables, and optionally on real PDF files, and checks that
+both group tokens identically. The old approach only groups tokens without building `Line`s,
+so its timings are a lower bound.
+
+Usage:
+    python benchmarks/extract_lines.py [--num_pages 20] [/path/to/paper.pdf ...]
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+from appjsonify.modules.doc import Document, Token
+from appjsonify.modules.edit.extract_lines import LineExtractor
+from appjsonify.modules.load.load import DocumentLoader
+
+
+def group_tokens_with_np_mean(
+    tokens: list[Token],
+    y_tolerance: float
+) -> list[list[Token]]:
+    """Group tokens into lines as `LineExtractor` did before running sums were introduced."""
+    groups: list[list[Token]] = []
+    y0s: list[int] = []
+    y1s: list[int] = []
+    for token in tokens:
+        if groups and (abs(token.pos[1] - np.mean(y0s, dtype=int)) <= y_tolerance
+                       or abs(token.pos[3] - np.mean(y1s, dtype=int)) <= y_tolerance):
+            groups[-1].append(token)
+            y0s.append(token.pos[1])
+            y1s.append(token.pos[3])
+        else:
+            groups.append([token])
+            y0s, y1s = [token.pos[1]], [token.pos[3]]
+    # single empty tokens do not form lines
+    return [group for group in groups if len(group) > 1 or group[0].token != '']
+
+
+def make_page(
+    rng: random.Random,
+    num_rows: int,
+    tokens_per_row: int
+) -> list[Token]:
+    """Make tokens of a page with `num_rows` rows of jittered tokens."""
+    tokens: list[Token] = []
+    row_height = 1000 // (num_rows + 1)
+    for row in range(num_rows):
+        y0 = row * row_height + 10
+        for index in range(tokens_per_row):
+            x0 = index * 1000 // tokens_per_row
+            jitter = rng.randint(-1, 1)
+            tokens.append(
+                Token(f'w{index}', (x0, y0 + jitter, x0 + 5, y0 + jitter + 8), 9.0, "Times-Roman")
+            )
+    return tokens
+
+
+def measure(
+    name: str,
+    pages: list[list[Token]],
+    y_tolerance: float
+):
+    start = time.perf_counter()
+    old_groups = [group_tokens_with_np_mean(tokens, y_tolerance) for tokens in pages]
+    old_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lines = [LineExtractor._extract_lines(tokens, y_tolerance) for tokens in pages]
+    new_elapsed = time.perf_counter() - start
+
+    identical = [[[id(token) for token in group] for group in groups] for groups in old_groups] \
+        == [[[id(token) for token in line.tokens] for line in page_lines] for page_lines in lines]
+    num_tokens = sum(len(tokens) for tokens in pages)
+    print(f'{name}: {len(pages)} pages, {num_tokens} tokens, identical: {identical}')
+    for label, elapsed in (("np.mean", old_elapsed), ("running sums", new_elapsed)):
+        print(f'{label:>14}: {elapsed:7.3f}s, {len(pages) / elapsed:9.1f} pages/sec')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", type=str, nargs="*", help="PDF files to load.")
+    parser.add_argument("--num_pages", type=int, default=20, help="The number of synthetic pages per layout.")
+    parser.add_argument("--x_tolerance", type=float, default=1.2, help="`x_tolerance` of `load_docs`.")
+    parser.add_argument("--y_tolerance", type=float, default=3.0, help="`y_tolerance` of `extract_lines`.")
+    parser.add_argument("--seed", type=int, default=0, help="A random seed.")
+    bench_args = parser.parse_args()
+
+    rng = random.Random(bench_args.seed)
+    # a reference list with short lines and a table whose rows have hundreds of tokens
+    measure(
+        "reference list",
+        [make_page(rng, 60, 40) for _ in range(bench_args.num_pages)],
+        bench_args.y_tolerance
+    )
+    measure(
+        "dense table",
+        [make_page(rng, 8, 500) for _ in range(bench_args.num_pages)],
+        bench_args.y_tolerance
+    )
+    for pdf_path in bench_args.pdf:
+        loader = DocumentLoader(show_progress=False, inplace=True)
+        doc = loader.execute([Document(Path(pdf_path))], bench_args.x_tolerance)[0]
+        measure(pdf_path, [page.tokens for page in doc.pages], bench_args.y_tolerance)
+
+
+if __name__ == "__main__":
+    main()
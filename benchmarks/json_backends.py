@@ -0,0 +1,75 @@
+"""Measure the speed and size of JSON files written by the dumpers with each backend.
+
+The dumpers write indented files with `json.dump(..., indent=4)` by default, and use orjson or msgspec
+if installed for compact files (`--compact_json`) or if chosen with `--json_backend`. This serialises a synthetic document
+of the same structure as the output of `dump_formatted_doc` with every installed backend,
+with and without indents, and checks that all of them give identical objects.
+
+Usage:
+    python benchmarks/json_backends.py [--num_sections 2000] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import time
+
+from appjsonify.modules.dump.serializer import JSON_BACKENDS, dumps_json, get_json_backend
+
+
+def make_formatted_doc(
+    rng: random.Random,
+    num_sections: int
+) -> dict:
+    """Make a formatted document with `num_sections` sections of a few paragraphs."""
+    words = ["language", "model", "token", "Ünïcode", "表", "attention", "12.5%", "\"quoted\"", "back\\slash"]
+    def sentence():
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+    return {
+        'doc_name': "A Paper",
+        'author': "",
+        'creation_date': "D:20230101000000",
+        'mod_date': "D:20230101000000",
+        'tables': [{"caption": sentence(), "pos": [1, 2, 3, 4], "page": 1} for _ in range(10)],
+        'figures': [{"caption": sentence(), "pos": [1, 2, 3, 4], "page": 1} for _ in range(10)],
+        'footers': [sentence() for _ in range(10)],
+        'font_profile': {
+            "most_common_font_size": 9.96264,
+            "most_common_font_name": "Times-Roman",
+            "fonts": ["Times-Roman", "Times-Bold"],
+            "histogram": [{"font_size": 9.96264, "font_id": 0, "count": 10000}]
+        },
+        'body': [
+            {"title": sentence(), "content": [sentence() for _ in range(rng.randint(1, 5))]}
+            for _ in range(num_sections)
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_sections", type=int, default=2000, help="The number of sections.")
+    parser.add_argument("--repeat", type=int, default=20, help="The number of serialisations per setting.")
+    parser.add_argument("--seed", type=int, default=0, help="A random seed.")
+    bench_args = parser.parse_args()
+
+    formatted_doc = make_formatted_doc(random.Random(bench_args.seed), bench_args.num_sections)
+    identical = True
+    for backend in JSON_BACKENDS:
+        try:
+            get_json_backend(backend)
+        except ModuleNotFoundError:
+            print(f'{backend:>8}: not installed')
+            continue
+        for compact in (False, True):
+            start = time.perf_counter()
+            for _ in range(bench_args.repeat):
+                encoded = dumps_json(formatted_doc, compact, backend)
+            elapsed = time.perf_counter() - start
+            identical = identical and json.loads(encoded) == formatted_doc
+            print(f'{backend:>8} ({"compact" if compact else "indented":>8}): {elapsed / bench_args.repeat * 1000:8.2f}ms, '
+                  f'{len(encoded) / 1024:9.1f}KiB')
+    print(f'identical: {identical}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Measure the token extraction speed of `load_docs` with and without the per-page character index.
+
+Font names and sizes of a word used to be looked up with `page.crop(bbox).chars`, which scans all
+the objects in a page for every word. This compares that lookup with `CharIndex` on the same words
+and checks that both give identical tokens.
+
+Usage:
+    python benchmarks/load_fonts.py /path/to/paper.pdf [/path/to/another.pdf ...]
+"""
+import argparse
+import statistics
+import time
+from collections import Counter
+from typing import Any
+
+import pdfplumber
+
+from appjsonify.modules.load.load import DocumentLoader
+
+
+def extract_tokens_with_crop(
+    page: pdfplumber.page.Page,
+    width: int,
+    height: int,
+    x_tolerance: float
+) -> list[tuple]:
+    """Extract tokens as `DocumentLoader` did before `CharIndex` was introduced."""
+    tokens: list[tuple] = []
+    for word in page.extract_words(x_tolerance=x_tolerance, use_text_flow=True):
+        word_bbox = [float(word['x0']), float(word['top']),
+                    float(word['x1']), float(word['bottom'])]
+        word_bbox[0] = 0 if word_bbox[0] < 0  else word_bbox[0]
+        word_bbox[1] = 0 if word_bbox[1] < 0  else word_bbox[1]
+        word_bbox[2] = width if word_bbox[2] > width else word_bbox[2]
+        word_bbox[3] = height if word_bbox[3] > height else word_bbox[3]
+        try:
+            word_font_specs = [(char['fontname'], char['size'])
+                            for char in page.crop(tuple(word_bbox)).chars]
+            font_size = round(statistics.median([word_font_spec[1]
+                                                for word_font_spec in word_font_specs]), 1)
+            font_name = Counter([word_font_spec[0]
+                                for word_font_spec in word_font_specs]).most_common(1)[0][0]
+        except ValueError:
+            font_size = -1
+            font_name = 'default'
+        tokens.append((font_size, font_name))
+    return tokens
+
+
+def extract_tokens_with_index(
+    page: pdfplumber.page.Page,
+    width: int,
+    height: int,
+    x_tolerance: float
+) -> list[tuple]:
+    return [
+        (token.font_size, token.font_name)
+        for token in DocumentLoader._extract_tokens(page, width, height, x_tolerance)
+    ]
+
+
+def measure(
+    pdf_path: str,
+    x_tolerance: float
+):
+    with pdfplumber.open(pdf_path) as pdf:
+        results: dict[str, Any] = {}
+        for name, extract in (("crop", extract_tokens_with_crop), ("CharIndex", extract_tokens_with_index)):
+            start = time.perf_counter()
+            tokens: list[tuple] = []
+            for page in pdf.pages:
+                tokens.extend(extract(page, int(page.width), int(page.height), x_tolerance))
+            results[name] = (tokens, time.perf_counter() - start)
+        num_pages = len(pdf.pages)
+
+    print(f'{pdf_path}: {num_pages} pages, {len(results["crop"][0])} tokens, '
+          f'identical: {results["crop"][0] == results["CharIndex"][0]}')
+    for name, (_, elapsed) in results.items():
+        print(f'{name:>10}: {elapsed:7.2f}s, {num_pages / elapsed:7.2f} pages/sec')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", type=str, nargs="+", help="PDF files to load.")
+    parser.add_argument("--x_tolerance", type=float, default=1.2, help="`x_tolerance` of `load_docs`.")
+    bench_args = parser.parse_args()
+    for pdf_path in bench_args.pdf:
+        measure(pdf_path, bench_args.x_tolerance)
+
+
+if __name__ == "__main__":
+    main()
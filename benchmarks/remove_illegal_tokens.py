@@ -0,0 +1,64 @@
+"""Measure the speed of `remove_illegal_tokens` on the token stream of real papers.
+
+`IllegalTokenRemover._check_code` used to align every token with its `repr` by `difflib.ndiff`.
+It now returns early when `repr` escapes no character and caches results of token strings.
+This compares the old alignment, the new function without the cache and with the cache,
+and checks that all of them give identical tokens.
+
+Usage:
+    python benchmarks/remove_illegal_tokens.py /path/to/paper.pdf [/path/to/another.pdf ...]
+"""
+import argparse
+import difflib
+import re
+import time
+from pathlib import Path
+
+from appjsonify.modules.doc import Document
+from appjsonify.modules.edit.remove_illegal_tokens import IllegalTokenRemover
+from appjsonify.modules.load.load import DocumentLoader
+
+illegal_char_ptn = re.compile(r'\(cid:[0-9]+\)')
+
+
+def check_code_with_ndiff(
+    token: str
+) -> str:
+    """Remove illegal characters as `IllegalTokenRemover` did before the fast path was introduced."""
+    illegal_chars = [
+        symbol[-1] for symbol in difflib.ndiff(token, repr(token)[1:-1]) if symbol[0] == '-'
+    ]
+    for illegal_char in illegal_chars:
+        token = token.replace(illegal_char, '')
+    return illegal_char_ptn.sub('', token)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", type=str, nargs="+", help="PDF files to load.")
+    parser.add_argument("--x_tolerance", type=float, default=1.2, help="`x_tolerance` of `load_docs`.")
+    bench_args = parser.parse_args()
+
+    loader = DocumentLoader(show_progress=False, inplace=True)
+    docs = loader.execute([Document(Path(pdf_path)) for pdf_path in bench_args.pdf], bench_args.x_tolerance)
+    tokens = [token.token for doc in docs for page in doc.pages for token in page.tokens]
+    print(f'{len(docs)} documents, {len(tokens)} tokens, {len(set(tokens))} unique tokens')
+
+    IllegalTokenRemover._check_code.cache_clear()
+    results: dict[str, tuple[list[str], float]] = {}
+    for name, check_code in (
+        ("ndiff", check_code_with_ndiff),
+        ("fast path", IllegalTokenRemover._check_code.__wrapped__),
+        ("cached", IllegalTokenRemover._check_code)
+    ):
+        start = time.perf_counter()
+        outputs = [check_code(token) for token in tokens]
+        results[name] = (outputs, time.perf_counter() - start)
+
+    print(f'identical: {all(outputs == results["ndiff"][0] for outputs, _ in results.values())}')
+    for name, (_, elapsed) in results.items():
+        print(f'{name:>10}: {elapsed:7.3f}s, {len(tokens) / elapsed:12.1f} tokens/sec')
+
+
+if __name__ == "__main__":
+    main()
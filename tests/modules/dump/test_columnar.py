@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from appjsonify.modules.doc import Document, Line, Page, Paragraph, Token
+from appjsonify.modules.runner import BaseRunner
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset
+
+
+@pytest.fixture()
+def documents():
+    tokens = [
+        Token("1", (100, 100, 110, 110), 12.0, "ABCDEF+Times-Bold"),
+        Token("Introduction", (115, 100, 300, 110), 12.0, "ABCDEF+Times-Bold"),
+        Token("Text.", (100, 120, 150, 130), 10.0, "ABCDEF+Times-Roman"),
+        Token("noise", (900, 990, 950, 1000), 8.0, "ABCDEF+Times-Roman"),
+    ]
+    lines = [
+        Line("1 Introduction", (100, 100, 300, 110), 12.0, "ABCDEF+Times-Bold", tokens[:2]),
+        Line("Text.", (100, 120, 150, 130), 10.0, "ABCDEF+Times-Roman", tokens[2:3]),
+    ]
+    paragraphs = [
+        Paragraph("Text.", (100, 120, 150, 130), 10.0, "ABCDEF+Times-Roman", lines[1:], meta={"style": "body"}),
+    ]
+    return [
+        Document(Path("paper_a.pdf"), [Page([], [], tokens[:1]), Page(paragraphs, lines, tokens)]),
+        Document(Path("paper_b.pdf"), [Page([], [], tokens[2:3])]),
+    ]
+
+
+@pytest.mark.parametrize("columnar_format", ["parquet", "arrow"])
+def test_dump_columnar(documents, tmp_path, columnar_format):
+    runner = BaseRunner.by_name("dump_columnar")(show_progress=False)
+    runner.execute(documents[:1], output_dir=str(tmp_path), columnar_format=columnar_format)
+    runner.execute(documents[1:], output_dir=str(tmp_path), columnar_format=columnar_format)
+
+    tokens = pa.dataset.dataset(tmp_path / "corpus_tokens", format=columnar_format).to_table()
+    tokens = tokens.sort_by([("doc_id", "ascending"), ("page", "ascending"), ("index", "ascending")]).to_pylist()
+    assert [(row["doc_id"], row["page"], row["index"], row["text"]) for row in tokens] == [
+        ("paper_a", 1, 0, "1"),
+        ("paper_a", 2, 0, "1"),
+        ("paper_a", 2, 1, "Introduction"),
+        ("paper_a", 2, 2, "Text."),
+        ("paper_a", 2, 3, "noise"),
+        ("paper_b", 1, 0, "Text."),
+    ]
+    assert [row["line_index"] for row in tokens] == [None, 0, 0, 1, None, None]
+    assert (tokens[2]["x0"], tokens[2]["y1"], tokens[2]["font_size"]) == (115.0, 110.0, 12.0)
+    assert tokens[2]["font_name"] == "ABCDEF+Times-Bold"
+
+    lines = pa.dataset.dataset(tmp_path / "corpus_lines", format=columnar_format).to_table().to_pylist()
+    assert [(row["text"], row["paragraph_index"], row["num_tokens"]) for row in lines] == [
+        ("1 Introduction", None, 2), ("Text.", 0, 1)
+    ]
+    paragraphs = pa.dataset.dataset(tmp_path / "corpus_paragraphs", format=columnar_format).to_table().to_pylist()
+    assert [(row["text"], row["num_lines"], row["style"]) for row in paragraphs] == [("Text.", 1, "body")]
+    # paper_b has no lines
+    assert len(list((tmp_path / "corpus_lines").iterdir())) == 1
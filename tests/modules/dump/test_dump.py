@@ -0,0 +1,125 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from appjsonify.modules.doc import Document, Line, Page, Paragraph, Token
+from appjsonify.modules.dump.corpus import ShardedJSONLWriter, load_corpus_index, read_corpus_document
+from appjsonify.modules.dump.serializer import dumps_json, get_json_backend
+from appjsonify.modules.runner import BaseRunner
+
+
+@pytest.fixture()
+def documents():
+    tokens = [
+        Token("1 Introduction", (100, 100, 300, 110), 12.0, "ABCDEF+Times-Bold"),
+        Token("Ünïcode text.", (100, 120, 300, 130), 10.0, "ABCDEF+Times-Roman"),
+        Token("", (100, 140, 300, 150), 10.0, "ABCDEF+Times-Roman"),
+    ]
+    lines = [Line(token.token, token.pos, token.font_size, token.font_name, [token]) for token in tokens[:2]]
+    paragraphs = [
+        Paragraph("1 Introduction", lines[0].pos, 12.0, "ABCDEF+Times-Bold", lines[:1], meta={"style": "section"}),
+        Paragraph("Ünïcode text.", lines[1].pos, 10.0, "ABCDEF+Times-Roman", lines[1:], meta={"style": "body"}),
+    ]
+    doc = Document(
+        Path("paper.pdf"),
+        [Page(paragraphs, lines, tokens)],
+        formatted_paragraphs=paragraphs,
+        meta={"Title": "A Paper"}
+    )
+    return [doc]
+
+
+@pytest.mark.parametrize("backend", ["auto", "orjson", "msgspec", "json"])
+def test_dumps_json(backend):
+    try:
+        get_json_backend(backend)
+    except ModuleNotFoundError:
+        pytest.skip(f"{backend} is not installed")
+    obj = {"doc_name": "Ünïcode", "font_size": 9.5, "body": [{"title": "1 Intro", "content": ["a", "b"]}]}
+
+    compact = dumps_json(obj, compact=True, backend=backend)
+    assert json.loads(compact) == obj
+    assert b"\n" not in compact and b", " not in compact
+    assert "Ünïcode".encode('utf-8') in compact
+    assert json.loads(dumps_json(obj, backend=backend)) == obj
+
+
+def test_auto_json_backend(documents, tmp_path):
+    # indented files are the same as those written by the standard json whichever backends are installed
+    assert get_json_backend("auto") == "json"
+    obj = {"doc_name": "Ünïcode", "font_size": 9.5, "body": [{"title": "1 Intro", "content": ["a", "b"]}]}
+    assert dumps_json(obj) == json.dumps(obj, indent=4, ensure_ascii=False).encode('utf-8')
+
+    runner = BaseRunner.by_name("dump_formatted_doc")(show_progress=False)
+    runner.execute(documents, output_dir=str(tmp_path))
+    dumped = (tmp_path / "paper" / "paper.json").read_text(encoding='utf-8')
+    assert dumped == json.dumps(json.loads(dumped), indent=4, ensure_ascii=False)
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ValueError):
+        get_json_backend("pickle")
+
+
+@pytest.mark.parametrize("compact_json", [False, True])
+def test_dumpers(documents, tmp_path, compact_json):
+    bodies = {
+        ("dump_doc_with_tokens", "paper_with_tokens.json"): ["1 Introduction", "Ünïcode text."],
+        ("dump_doc_with_lines", "paper_with_lines.json"): ["1 Introduction", "Ünïcode text."],
+        ("dump_doc_with_paragraphs", "paper_with_paragraphs.json"): ["1 Introduction", "Ünïcode text."],
+        ("dump_doc_with_sections", "paper_with_sections.json"): [
+            {"title": "1 Introduction", "content": ["Ünïcode text."]}
+        ],
+        ("dump_formatted_doc", "paper.json"): [{"title": "1 Introduction", "content": ["Ünïcode text."]}],
+    }
+    for (module_name, file_name), body in bodies.items():
+        runner = BaseRunner.by_name(module_name)(show_progress=False)
+        runner.execute(documents, output_dir=str(tmp_path), compact_json=compact_json)
+        with open(tmp_path / "paper" / file_name) as f:
+            dumped = json.load(f)
+        assert dumped["doc_name"] == "A Paper"
+        assert dumped["author"] == ""
+        assert dumped["font_profile"]["most_common_font_name"] == "Times-Roman"
+        assert dumped["body"] == body
+
+
+@pytest.mark.parametrize("shard_compression", ["none", "gzip"])
+def test_corpus_jsonl(documents, tmp_path, shard_compression):
+    runner = BaseRunner.by_name("dump_formatted_doc")(show_progress=False)
+    for stem in ("paper_a", "paper_b", "paper_a"):
+        documents[0].input_path = Path(f"{stem}.pdf")
+        runner.execute(documents, output_dir=str(tmp_path), corpus_jsonl=True, shard_compression=shard_compression)
+    assert not (tmp_path / "paper_a").exists()
+
+    index = load_corpus_index(tmp_path)
+    assert set(index) == {"paper_a", "paper_b"}
+    # the latest entry is returned
+    assert index["paper_a"]["offset"] > index["paper_b"]["offset"]
+    dumped = read_corpus_document(tmp_path, index["paper_b"])
+    assert dumped["doc_id"] == "paper_b"
+    assert dumped["body"] == [{"title": "1 Introduction", "content": ["Ünïcode text."]}]
+
+    # a whole shard is a valid JSONL file
+    shard_path = tmp_path / index["paper_b"]["shard"]
+    with (gzip.open if shard_compression == "gzip" else open)(shard_path, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line)["doc_id"] for line in f] == ["paper_a", "paper_b", "paper_a"]
+
+
+def test_corpus_shard_rotation(tmp_path):
+    # two documents do not fit in a shard of 1 MB
+    writer = ShardedJSONLWriter(tmp_path, shard_size=1)
+    text = "x" * 600 * 1024
+    for index in range(3):
+        writer.write(f"doc_{index}", json.dumps({"doc_id": f"doc_{index}", "text": text}).encode('utf-8'))
+    index = load_corpus_index(tmp_path)
+    assert len({entry["shard"] for entry in index.values()}) == 3
+    assert all(entry["offset"] == 0 for entry in index.values())
+    assert read_corpus_document(tmp_path, index["doc_2"]) == {"doc_id": "doc_2", "text": text}
+
+
+@pytest.mark.parametrize("shard_size", [0, -1])
+def test_corpus_invalid_shard_size(tmp_path, shard_size):
+    with pytest.raises(ValueError):
+        ShardedJSONLWriter(tmp_path, shard_size=shard_size)
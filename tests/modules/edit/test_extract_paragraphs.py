@@ -0,0 +1,43 @@
+import pytest
+
+from appjsonify.modules.doc import Document, Page, Line, Token
+from appjsonify.modules.runner import BaseRunner
+
+
+def make_line(text: str, pos: tuple, font_size: float = 10.0) -> Line:
+    return Line(text, pos, font_size, "Times-Roman", [Token(text, pos, font_size, "Times-Roman")])
+
+
+@pytest.fixture()
+def documents():
+    lines = [
+        # a paragraph with a hyphenated word ending with a short line
+        make_line("This is a para-", (100, 100, 500, 110)),
+        make_line("graph that ends here.", (100, 112, 300, 122)),
+        # a listing paragraph
+        make_line("1. The first item", (100, 150, 500, 160)),
+        make_line("continues here", (120, 162, 500, 172)),
+        make_line("and there", (120, 174, 500, 184)),
+        # a single line
+        make_line("Heading", (100, 300, 200, 310), 12.0)
+    ]
+    return [Document("", [Page(None, lines, None, {})])]
+
+def test_extract_paragraphs_1(documents):
+    # get a module instance
+    module_cls = BaseRunner.by_name("extract_paragraphs")
+    
+    # execute a process
+    docs = module_cls().execute(documents=documents)
+    
+    # compare
+    paragraphs = docs[0].pages[0].paragraphs
+    assert [paragraph.paragraph for paragraph in paragraphs] == [
+        "This is a paragraph that ends here.",
+        "1. The first item continues here and there",
+        "Heading"
+    ]
+    assert [paragraph.pos for paragraph in paragraphs] == [
+        (100, 100, 500, 122), (100, 150, 500, 184), (100, 300, 200, 310)
+    ]
+    assert [paragraph.font_size for paragraph in paragraphs] == [10.0, 10.0, 12.0]
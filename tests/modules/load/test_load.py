@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from appjsonify.modules.common import get_page_numbers, parse_page_ranges
+from appjsonify.modules.doc import Document
+from appjsonify.modules.runner import BaseRunner
+
+
+def make_pdf(num_pages: int) -> bytes:
+    """Make a PDF file whose n-th page only says `Page n`."""
+    page_ids = [4 + 2 * index for index in range(num_pages)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+        + b"] /Count %d >>" % num_pages,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, page_id in enumerate(page_ids, start=1):
+        content = b"BT /F1 24 Tf 100 700 Td (Page %d) Tj ET" % index
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    pdf = b"%PDF-1.4\n"
+    offsets: list[int] = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return pdf
+
+
+@pytest.fixture()
+def pdf_path(tmp_path) -> Path:
+    pdf_path = tmp_path / "paper.pdf"
+    pdf_path.write_bytes(make_pdf(5))
+    return pdf_path
+
+
+def test_parse_page_ranges():
+    assert parse_page_ranges("1-3,5") == [1, 2, 3, 5]
+    assert parse_page_ranges("4,2-3,3") == [2, 3, 4]
+    for pages in ("", "0", "3-1", "a-b", "1-2-3"):
+        with pytest.raises(ValueError):
+            parse_page_ranges(pages)
+
+
+@pytest.mark.parametrize(
+    "kwargs, page_numbers",
+    [
+        ({}, [1, 2, 3, 4, 5]),
+        ({"pages": "2-3,5"}, [2, 3, 5]),
+        ({"max_pages": 2}, [1, 2]),
+        ({"pages": "2-3,5", "max_pages": 2}, [2, 3]),
+        # pages beyond the end are ignored
+        ({"pages": "4-9"}, [4, 5]),
+    ]
+)
+def test_load_docs_pages(pdf_path, kwargs, page_numbers):
+    runner = BaseRunner.by_name("load_docs")(show_progress=False)
+    doc = runner.execute([Document(pdf_path)], x_tolerance=1.5, **kwargs)[0]
+
+    assert get_page_numbers(doc) == page_numbers
+    assert [[token.token for token in page.tokens] for page in doc.pages] \
+        == [["Page", str(page_number)] for page_number in page_numbers]
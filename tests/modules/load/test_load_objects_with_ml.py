@@ -0,0 +1,253 @@
+import queue
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+pytest.importorskip("detectron2")
+
+from appjsonify.modules.doc import Document, Page
+from appjsonify.modules.load import load_objects_with_ml
+from appjsonify.modules.load.models import BaseModel, DetectorPool, predict_models
+from appjsonify.modules.runner import BaseRunner
+
+
+class StubModel(BaseModel):
+    """A detector whose predictor returns the page number drawn in the red channel of each image."""
+    def __init__(self, model_name: str, num_outputs: int, fail_on: int = -1):
+        self.model_name = model_name
+        self.num_outputs = num_outputs
+        self.fail_on = fail_on
+        self.batch_sizes: list[int] = []
+
+    def get_cache_fields(self) -> tuple:
+        return (self.model_name,)
+
+    def get_input_size(self) -> int:
+        return 800
+
+    def preprocess(self, np_imgs, shared_inputs=None):
+        return []
+
+    def predict(self, np_imgs, shared_inputs=None):
+        self.batch_sizes.append(len(np_imgs))
+        page_numbers = [int(np_img[0, 0, 2]) for np_img in np_imgs]
+        if self.fail_on in page_numbers:
+            raise ValueError(f'{self.model_name} failed')
+        return page_numbers
+
+    def get_bboxes_from_instances(self, img, p, page_number, save_image=False, output_dir=''):
+        bboxes = tuple(
+            {0: {"bbox": (p, index, p + 10, index + 10), "img_path": f'{self.model_name}_{page_number}'}}
+            for index in range(self.num_outputs)
+        )
+        return bboxes[0] if self.num_outputs == 1 else bboxes
+
+
+def make_models(fail_on: int = -1) -> tuple[StubModel, StubModel, StubModel]:
+    return (StubModel("TABLEBANK", 1), StubModel("PUBLAYNET", 4, fail_on), StubModel("DOCBANK", 10))
+
+
+def render(pdf_path, dpi, first_page, last_page, thread_count, grayscale, size):
+    return [Image.new("RGB", (8, 8), (page_number, 0, 0)) for page_number in range(first_page, last_page + 1)]
+
+
+@pytest.fixture(autouse=True)
+def stub_rendering(monkeypatch):
+    monkeypatch.setattr(load_objects_with_ml, "convert_from_path", render)
+
+
+def make_document(name: str = "paper", num_pages: int = 5) -> Document:
+    return Document(Path(f'{name}.pdf'), [Page([], [], [], {}) for _ in range(num_pages)])
+
+
+def make_loader(models: tuple) -> BaseRunner:
+    loader = BaseRunner.by_name("load_objects_with_ml")(show_progress=False)
+    loader._load_models = lambda *args: (models, None)
+    return loader
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"detectron_batch_size": 0}, {"detectron_workers": -1}, {"render_dpi": -1},
+    {"render_thread_count": 0}, {"render_chunk_size": 0}
+])
+def test_prepare_1(kwargs):
+    # prepare rejects the same arguments as execute
+    loader = make_loader(make_models())
+    doc = make_document()
+    with pytest.raises(ValueError):
+        loader.prepare([doc], **kwargs)
+    with pytest.raises(ValueError):
+        loader.execute([doc], **kwargs)
+    assert loader._prepared == {}
+
+
+def test_prepare_2():
+    # a document that fails does not leave its prepared detections behind
+    loader = make_loader(make_models(fail_on=3))
+    doc = make_document()
+    loader.prepare([doc])
+    assert doc.input_path in loader._prepared
+    with pytest.raises(ValueError):
+        loader.execute([doc])
+    assert loader._prepared == {}
+
+    # prepared detections are used by execute
+    loader = make_loader(make_models())
+    loader.prepare([doc])
+    documents = loader.execute([doc])
+    assert loader._prepared == {}
+    assert [page.meta["tables"][0].meta["img_path"][0] for page in documents[0].pages] \
+        == [f'TABLEBANK_{page_number}' for page_number in range(1, 6)]
+
+
+def detect(doc: Document, models: tuple, detectron_batch_size: int = 1, **kwargs) -> list[list]:
+    return load_objects_with_ml.MLBasedObjectLoader._detect_objects(
+        doc, models, detectron_batch_size, False, "", False, None, **kwargs
+    )
+
+
+@pytest.mark.parametrize("detectron_batch_size", [2, 3, 8])
+def test_detect_objects_1(detectron_batch_size):
+    # batches give the same bboxes as single pages
+    doc = make_document(num_pages=7)
+    expected = detect(doc, make_models())
+    models = make_models()
+    assert detect(doc, models, detectron_batch_size) == expected
+    assert models[0].batch_sizes == [
+        min(detectron_batch_size, 7 - start) for start in range(0, 7, detectron_batch_size)
+    ]
+    assert [output[0]["bbox"][0] for output in expected[0]] == [1, 2, 3, 4, 5, 6, 7]
+
+
+class InProcessPool(DetectorPool):
+    """A `DetectorPool` that runs the models in the main process and returns the results
+    of the batches in flight in reverse order, as workers may finish them in any order."""
+    def __init__(self, models: tuple, buffer_size: int = 3):
+        self.models = models
+        self.buffer_size = buffer_size
+        self.procs = []
+        self.result_queue = queue.Queue()
+        self.tasks: list[tuple] = []
+        self.put_index = 0
+        self.get_index = 0
+        self.result_rank: list[int] = []
+        self.result_data: list = []
+        self.closed = False
+        self.num_discards = 0
+
+    def put(self, np_imgs, subsets):
+        self.put_index += 1
+        self.tasks.append((self.put_index, np_imgs, subsets))
+
+    def get(self):
+        for index, np_imgs, subsets in reversed(self.tasks):
+            try:
+                self.result_queue.put((index, None, predict_models(self.models, np_imgs, subsets)))
+            except Exception:
+                self.result_queue.put((index, traceback.format_exc(), None))
+        self.tasks = []
+        return super().get()
+
+    def discard(self):
+        self.num_discards += 1
+        super().discard()
+
+    @property
+    def default_buffer_size(self) -> int:
+        return self.buffer_size
+
+
+@pytest.mark.parametrize("detectron_batch_size", [1, 2])
+def test_detect_objects_2(detectron_batch_size):
+    # results of a pool come back in page order
+    doc = make_document(num_pages=7)
+    expected = detect(doc, make_models())
+    pool = InProcessPool(make_models())
+    assert detect(doc, make_models(), detectron_batch_size, pool=pool) == expected
+    assert len(pool) == 0
+
+
+def test_detect_objects_3():
+    # the results in flight are discarded when a detection raises
+    doc = make_document(num_pages=7)
+    pool = InProcessPool(make_models(fail_on=2))
+    with pytest.raises(RuntimeError, match="PUBLAYNET failed"):
+        detect(doc, make_models(), pool=pool)
+    assert pool.num_discards == 1
+    assert len(pool) == 0 and pool.tasks == [] and pool.result_data == []
+
+    # the next document gets its own results
+    pool.models = make_models()
+    assert detect(doc, make_models(), pool=pool) == detect(doc, make_models())
+
+
+@pytest.mark.parametrize("detectron_batch_size", [1, 3])
+def test_detect_objects_4(detectron_batch_size):
+    # concurrent detectors give the same results as sequential ones
+    doc = make_document(num_pages=7)
+    expected = detect(doc, make_models(), detectron_batch_size)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert detect(doc, make_models(), detectron_batch_size, executor=executor) == expected
+
+        # an error of a detector is raised as it is
+        with pytest.raises(ValueError, match="PUBLAYNET failed"):
+            detect(doc, make_models(fail_on=2), detectron_batch_size, executor=executor)
+
+
+def summarize(doc: Document) -> list[dict]:
+    """Return the objects of each page in a comparable form."""
+    return [
+        {key: [(token.token, token.pos, token.meta) for token in tokens] for key, tokens in page.meta.items()}
+        for page in doc.pages
+    ]
+
+
+def test_execute_1():
+    # the whole module gives the same documents with concurrent detectors
+    doc = make_document(num_pages=3)
+    expected = make_loader(make_models()).execute([doc])
+    loader = make_loader(make_models())
+    documents = loader.execute([doc], concurrent_detectors=True)
+    assert loader._executor is not None
+    assert summarize(documents[0]) == summarize(expected[0])
+
+
+class BrokenModel(StubModel):
+    """A detector whose weights fail to load, which only converts predictions in the main process."""
+    def __init__(self, detectron_device_mode: str = 'cpu', build_predictor: bool = True, **kwargs):
+        if build_predictor:
+            raise RuntimeError("failed to load weights")
+        super().__init__("BROKEN", 1)
+
+
+def test_detector_pool_1():
+    # a pool whose worker has died raises an error instead of waiting forever
+    doc = make_document(num_pages=7)
+    models = make_models()
+    pool = DetectorPool([(BrokenModel, {})], ["cpu"])
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        detect(doc, models, pool=pool)
+    assert pool.closed and len(pool) == 0
+    assert not any(proc.is_alive() for proc in pool.procs)
+
+    # the next document fails at once
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="closed"):
+        detect(doc, models, pool=pool)
+    assert time.perf_counter() - start < 1
+
+
+def test_detector_pool_2(monkeypatch):
+    # a module drops a broken pool and loads the detectors again for the next document
+    for name in ("TableBankModel", "PublaynetModel", "DocBankModel"):
+        monkeypatch.setattr(load_objects_with_ml, name, BrokenModel)
+    monkeypatch.setattr(load_objects_with_ml.MLBasedObjectLoader, "check_model_file_path", staticmethod(lambda: None))
+    loader = BaseRunner.by_name("load_objects_with_ml")(show_progress=False)
+    for name in ("first", "second"):
+        with pytest.raises(RuntimeError, match="exited unexpectedly"):
+            loader.execute([make_document(name)], detectron_workers=1)
+        assert loader._models == {}
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from appjsonify.modules.common import (BboxIndex, FontProfile, batch_check_token_overlap, batch_judge_within_bbox,
+                                       batch_normalize_bbox, batch_overlap_ratio, check_token_overlap,
+                                       get_font_profile, get_most_common_font_name, get_most_common_font_size,
+                                       judge_within_bbox, normalize_bbox, strip_font_subset)
+from appjsonify.modules.doc import Document, Page, Token
+
+
+def test_bbox_index_1():
+    bboxes = [(0, 0, 10, 10), (100, 100, 200, 120), (990, 990, 1000, 1000)]
+    index = BboxIndex(bboxes)
+
+    assert index.query((5, 5, 6, 6)) == [0]
+    assert index.query((150, 0, 160, 50)) == []
+    # the offset expands the query bbox
+    assert 1 in index.query((150, 130, 160, 140), offset=25)
+    # touching bboxes are returned
+    assert 1 in index.query((200, 120, 300, 300))
+    assert index.query((0, 0, 1000, 1000)) == [0, 1, 2]
+    assert BboxIndex([]).query((0, 0, 1000, 1000)) == []
+
+
+def test_bbox_index_2():
+    # candidates are a superset of bboxes that satisfy the exact conditions
+    rng = random.Random(0)
+    def random_bbox():
+        x0, y0 = rng.randint(0, 990), rng.randint(0, 990)
+        return (x0, y0, min(1000, x0 + rng.randint(1, 300)), min(1000, y0 + rng.randint(1, 30)))
+    bboxes = [random_bbox() for _ in range(300)]
+    index = BboxIndex(bboxes)
+    offset = 25
+    for _ in range(300):
+        target = random_bbox()
+        candidates = set(index.query(target, offset))
+        for i, bbox in enumerate(bboxes):
+            ref_bbox = (bbox[0] - offset, bbox[1] - offset, bbox[2] + offset, bbox[3] + offset)
+            if judge_within_bbox(ref_bbox, target) or check_token_overlap(bbox, target, threshold=0.5):
+                assert i in candidates
+
+
+def test_batch_kernels_1():
+    refs = [(0, 0, 100, 100), (50, 50, 60, 60), (200, 200, 300, 210)]
+    targets = [(0, 0, 100, 100), (40, 40, 70, 70), (300, 210, 400, 220), (500, 500, 510, 510)]
+    for metric in ('min', 'union'):
+        ratios = batch_overlap_ratio(refs, targets, metric)
+        assert ratios.shape == (3, 4)
+        assert ratios[0, 0] == 1.0 and ratios[0, 3] == 0.0
+        for threshold in (0.0, 0.5, 0.95):
+            mask = batch_check_token_overlap(refs, targets, threshold, metric)
+            assert mask.tolist() == [
+                [check_token_overlap(ref, target, threshold, metric) for target in targets] for ref in refs
+            ]
+    assert batch_judge_within_bbox(refs, targets).tolist() == [
+        [judge_within_bbox(ref, target) for target in targets] for ref in refs
+    ]
+    raw_bboxes = [[-3.2, 10.5, 611.9, 800.0], [306.0, 396.0, 306.5, 396.5]]
+    assert batch_normalize_bbox(raw_bboxes, 612, 792).tolist() \
+        == [list(normalize_bbox(bbox, 612, 792)) for bbox in raw_bboxes]
+
+    # empty inputs and an unknown metric
+    assert batch_check_token_overlap([], targets).shape == (0, 4)
+    assert batch_judge_within_bbox(refs, []).shape == (3, 0)
+    with pytest.raises(ValueError):
+        batch_overlap_ratio(refs, targets, 'max')
+
+
+def test_font_profile_1():
+    tokens = [
+        Token("A", (0, 0, 10, 10), 12.0, "ABCDEF+Times-Bold"),
+        Token("b", (0, 0, 10, 10), 9.0, "ABCDEF+Times-Roman"),
+        Token("c", (0, 0, 10, 10), 10.0, "GHIJKL+Times-Roman"),
+        Token("d", (0, 0, 10, 10), 9.0, "CMMI10"),
+        Token("e", (0, 0, 10, 10), 10.0, "Times-Roman"),
+    ]
+    doc = Document("paper.pdf", [Page([], [], tokens[:2]), Page([], [], tokens[2:])], meta={})
+    profile = get_font_profile(doc)
+
+    assert doc.meta["font_profile"] is profile
+    assert strip_font_subset("ABCDEF+Times-Roman") == "Times-Roman"
+    assert strip_font_subset("CMMI10") == "CMMI10"
+    # ties are broken by the first appearance
+    assert profile.most_common_font_size == 9.0 == get_most_common_font_size(doc)
+    assert profile.most_common_font_name == "Times-Roman" == get_most_common_font_name(doc)
+    assert profile.to_dict() == {
+        "most_common_font_size": 9.0,
+        "most_common_font_name": "Times-Roman",
+        "fonts": ["Times-Bold", "Times-Roman", "CMMI10"],
+        "histogram": [
+            {"font_size": 10.0, "font_id": 1, "count": 2},
+            {"font_size": 12.0, "font_id": 0, "count": 1},
+            {"font_size": 9.0, "font_id": 1, "count": 1},
+            {"font_size": 9.0, "font_id": 2, "count": 1},
+        ]
+    }
+
+    empty = FontProfile.from_document(Document("empty.pdf", [Page([], [], [])], meta={}))
+    assert empty.most_common_font_size is None and empty.to_dict()["histogram"] == []
@@ -0,0 +1,42 @@
+import copy
+import pickle
+
+import pytest
+
+from appjsonify.modules.doc import Document, Page, Line, Token
+
+
+@pytest.fixture()
+def document():
+    # create tokens shared by a line and a page
+    token = Token("test", (0, 100, 10, 110), 10.0, "ABCDEF+" + "Times-Roman", {"caption": ["test"]})
+    line = Line("test", (0, 100, 10, 110), 10.0, "Times-Roman", [token])
+    
+    # compose a page
+    page = Page(None, [line], [token], {"images": []})
+    
+    # create a `Document` instance
+    return Document("test.pdf", [page])
+
+def test_doc_1(document):
+    # document classes do not accept unknown attributes
+    token = document.pages[0].tokens[0]
+    with pytest.raises(AttributeError):
+        token.unknown = None
+    
+    # font names are interned
+    assert token.font_name is Token("", (0, 0, 0, 0), 10.0, "ABCDEF+Times-Roman").font_name
+
+def test_doc_2(document):
+    for ret_document in (pickle.loads(pickle.dumps(document)), copy.deepcopy(document)):
+        # compare
+        ret_page = ret_document.pages[0]
+        assert ret_document.input_path == "test.pdf"
+        assert ret_page.meta == {"images": []}
+        assert ret_page.tokens[0].pos == (0, 100, 10, 110)
+        assert ret_page.tokens[0].meta == {"caption": ["test"]}
+        assert ret_page.lines[0].font_name == "Times-Roman"
+        
+        # a token shared by a line and a page is still shared
+        assert ret_page.lines[0].tokens[0] is ret_page.tokens[0]
+        assert ret_page.tokens[0] is not document.pages[0].tokens[0]
@@ -0,0 +1,22 @@
+from appjsonify.modules.runner import BaseRunner
+
+
+class Runner(BaseRunner):
+    def execute(self, documents, threshold: float = 0.5, **kwargs):
+        self.check_args(self.execute, locals())
+        return documents
+
+
+def test_check_args_1(capsys):
+    # default arguments are reported once per runner
+    runner = Runner(show_progress=False)
+    runner.execute([])
+    assert 'threshold:\t0.5' in capsys.readouterr().out
+    runner.execute([])
+    assert capsys.readouterr().out == ''
+    runner.execute([], threshold=0.8)
+    assert capsys.readouterr().out == ''
+
+    # a new pipeline run builds new runners, which report again
+    Runner(show_progress=False).execute([])
+    assert 'threshold:\t0.5' in capsys.readouterr().out
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+from appjsonify.utils import DetectionCache
+
+
+def test_cache_1(tmpdir):
+    cache = DetectionCache(str(tmpdir))
+    key = cache.make_key("pdf_hash", 1, "TABLEBANK", "weight_hash", 0.9)
+
+    # miss
+    assert cache.get(key) == (False, None)
+
+    # hit, including a cached None
+    value = {0: {"bbox": (0, 100, 10, 110), "img_path": None}}
+    cache.put(key, value)
+    assert cache.get(key) == (True, value)
+    none_key = cache.make_key("pdf_hash", 2, "TABLEBANK", "weight_hash", 0.9)
+    cache.put(none_key, None)
+    assert cache.get(none_key) == (True, None)
+
+    # a different setting is a different key
+    assert cache.get(cache.make_key("pdf_hash", 1, "TABLEBANK", "weight_hash", 0.8)) == (False, None)
+
+    # entries persist across instances
+    assert DetectionCache(str(tmpdir)).get(key) == (True, value)
+
+
+def test_cache_2(tmpdir):
+    # room for about two entries
+    value = "x" * 4000
+    cache = DetectionCache(str(tmpdir), max_size_mb=10000 / 1024 / 1024)
+    keys = [cache.make_key(index) for index in range(3)]
+
+    cache.put(keys[0], value)
+    cache.put(keys[1], value)
+    # make the first entry older and then use it so that the second one is the least recently used
+    past = time.time() - 100
+    for key in keys[:2]:
+        os.utime(str(tmpdir.join(f'{key}.pkl')), (past, past))
+    cache.get(keys[0])
+    cache.put(keys[2], value)
+
+    assert cache.get(keys[0])[0] is True
+    assert cache.get(keys[1])[0] is False
+    assert cache.get(keys[2])[0] is True
+
+
+def test_cache_3(tmpdir):
+    # threads share a cache, e.g., the stages of a pipelined run
+    value = "x" * 1000
+    cache = DetectionCache(str(tmpdir), max_size_mb=20000 / 1024 / 1024)
+
+    def work(thread_index: int):
+        for index in range(50):
+            key = cache.make_key(thread_index, index)
+            cache.put(key, value)
+            cache.get(key)
+
+    threads = [threading.Thread(target=work, args=(thread_index,)) for thread_index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sizes = [os.path.getsize(path) for path in tmpdir.listdir()]
+    assert cache.total_size == sum(sizes) <= cache.max_size
+
+
+def test_cache_4(tmpdir):
+    # overwriting an entry does not count its old size
+    cache = DetectionCache(str(tmpdir))
+    key = cache.make_key("pdf_hash", 1)
+    cache.put(key, "x" * 1000)
+    cache.put(key, "x" * 1000)
+    cache.put(key, "x" * 10)
+    assert cache.total_size == os.path.getsize(str(tmpdir.join(f'{key}.pkl')))
+
+
+def test_cache_5(tmpdir):
+    # broken entries are removed and treated as misses
+    cache = DetectionCache(str(tmpdir))
+    keys = [cache.make_key("pdf_hash", index) for index in range(3)]
+    for key in keys:
+        cache.put(key, {0: {"bbox": (0, 100, 10, 110), "img_path": None}})
+    # truncated
+    path = tmpdir.join(f'{keys[0]}.pkl')
+    path.write_binary(path.read_binary()[:10])
+    # not a pickle
+    tmpdir.join(f'{keys[1]}.pkl').write_binary(b"not a pickle")
+
+    assert cache.get(keys[0]) == (False, None)
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[2])[0] is True
+    assert [path.basename for path in tmpdir.listdir()] == [f'{keys[2]}.pkl']
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from appjsonify.modules.doc import Document, Page, Token
+from appjsonify.utils import CheckpointError, load_checkpoint, save_checkpoint
+
+
+PIPELINE = ["load_docs", "remove_meta", "extract_lines", "dump_doc_with_lines"]
+
+
+@pytest.fixture()
+def document() -> Document:
+    token = Token("test", (0, 100, 10, 110), 10.0, "Times-Roman")
+    page = Page(None, None, [token], {"images": []})
+    return Document(Path("/path/to/test.pdf"), [page], meta={"Title": "test"})
+
+
+def test_checkpoint_1(document, tmpdir):
+    output_dir = Path(str(tmpdir))
+    save_checkpoint([document], output_dir, PIPELINE, 1)
+    assert (output_dir / "test" / "1_remove_meta.ckpt").exists()
+    
+    # the PDF file may have been moved
+    ret_document = load_checkpoint(Path("/new/path/to/test.pdf"), output_dir, PIPELINE, 1)
+    assert ret_document.input_path == Path("/new/path/to/test.pdf")
+    assert ret_document.meta == {"Title": "test"}
+    assert ret_document.pages[0].tokens[0].pos == (0, 100, 10, 110)
+    
+    # the following modules can be changed
+    load_checkpoint(document.input_path, output_dir, PIPELINE[:2] + ["dump_doc_with_tokens"], 1)
+
+
+def test_checkpoint_2(document, tmpdir):
+    output_dir = Path(str(tmpdir))
+    save_checkpoint([document], output_dir, PIPELINE, 1)
+    
+    # no checkpoint after the module
+    with pytest.raises(FileNotFoundError):
+        load_checkpoint(document.input_path, output_dir, PIPELINE, 2)
+    
+    # different preceding modules
+    with pytest.raises(CheckpointError):
+        load_checkpoint(document.input_path, output_dir, ["remove_meta", "remove_meta"], 1)
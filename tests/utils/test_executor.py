@@ -0,0 +1,138 @@
+import argparse
+import threading
+from pathlib import Path
+
+import pytest
+
+from appjsonify.modules.runner import BaseRunner
+from appjsonify.utils import pipeline_documents, stream_pipeline
+from appjsonify.utils.executor import process_document
+
+
+class Recorder(BaseRunner):
+    def __init__(self, name: str, events: list, fail_on: str = ''):
+        super().__init__(show_progress=False, inplace=True)
+        self.name = name
+        self.events = events
+        self.fail_on = fail_on
+
+    def execute(self, documents, **kwargs):
+        for doc in documents:
+            if doc.input_path.stem == self.fail_on:
+                raise ValueError(f'{self.name} failed')
+            self.events.append((self.name, doc.input_path.stem))
+            doc.meta.setdefault('modules', []).append(self.name)
+        return documents
+
+
+# documents processed by `FailingRecorder` in order
+processed: list[str] = []
+
+
+@BaseRunner.register("test_failing_recorder")
+class FailingRecorder(BaseRunner):
+    def execute(self, documents, **kwargs):
+        for doc in documents:
+            if doc.input_path.stem == 'bad':
+                raise ValueError('bad document')
+            processed.append(doc.input_path.stem)
+        return documents
+
+
+class PreparingRecorder(Recorder):
+    def prepare(self, documents, **kwargs):
+        for doc in documents:
+            self.events.append((f'prepare_{self.name}', doc.input_path.stem))
+
+
+def make_args(pipeline: list[str]) -> argparse.Namespace:
+    return argparse.Namespace(
+        pipeline=pipeline, resume_from=None, verbose=False, checkpoint_stages=[], copy_documents=False
+    )
+
+
+def test_pipeline_documents_1(tmpdir):
+    # documents go through all modules in order, and prepare precedes execute
+    events: list = []
+    runners = [
+        ('first', Recorder('first', events)),
+        ('second', PreparingRecorder('second', events)),
+    ]
+    pdf_paths = [Path(f'{i}.pdf') for i in range(5)]
+    results = list(pipeline_documents(pdf_paths, runners, make_args(['first', 'second']), Path(tmpdir)))
+    assert [pdf_path for pdf_path, _, _, _ in results] == pdf_paths
+    assert all(error is None for _, error, _, _ in results)
+    for i in range(5):
+        assert events.index(('first', str(i))) < events.index(('prepare_second', str(i))) \
+            < events.index(('second', str(i)))
+    assert [name for name, stem in events if stem == '2'] == ['first', 'prepare_second', 'second']
+
+
+def test_pipeline_documents_2(tmpdir):
+    # a failed document skips the following modules without stopping the others
+    events: list = []
+    runners = [
+        ('first', Recorder('first', events, fail_on='1')),
+        ('second', Recorder('second', events)),
+    ]
+    pdf_paths = [Path(f'{i}.pdf') for i in range(3)]
+    results = list(pipeline_documents(pdf_paths, runners, make_args(['first', 'second']), Path(tmpdir)))
+    assert [error is None for _, error, _, _ in results] == [True, False, True]
+    assert 'ValueError: first failed' in results[1][1]
+    assert ('second', '1') not in events
+    assert ('second', '2') in events
+
+
+def test_pipeline_documents_3(tmpdir):
+    # a module processes the next document while the following module is still busy
+    second_started = threading.Event()
+    first_done = threading.Event()
+
+    class First(BaseRunner):
+        def execute(self, documents, **kwargs):
+            if documents[0].input_path.stem == '1':
+                first_done.set()
+            return documents
+
+    class Second(BaseRunner):
+        def execute(self, documents, **kwargs):
+            if documents[0].input_path.stem == '0':
+                second_started.set()
+                # blocks forever if the stages do not overlap
+                assert first_done.wait(timeout=5)
+            return documents
+
+    runners = [('first', First(show_progress=False)), ('second', Second(show_progress=False))]
+    pdf_paths = [Path(f'{i}.pdf') for i in range(2)]
+    results = list(pipeline_documents(pdf_paths, runners, make_args(['first', 'second']), Path(tmpdir)))
+    assert second_started.is_set()
+    assert all(error is None for _, error, _, _ in results)
+
+
+def test_stream_pipeline_1(tmpdir):
+    # pipelined runs cannot be combined with worker processes
+    with pytest.raises(ValueError):
+        stream_pipeline([], make_args([]), Path(tmpdir), workers=2, pipelined=True)
+
+
+def test_process_document_1(tmpdir):
+    # a failed document is returned with its traceback, and the next one is still processed
+    events: list = []
+    runners = [('first', Recorder('first', events, fail_on='bad'))]
+    pdf_paths = [Path('bad.pdf'), Path('good.pdf')]
+    results = [process_document(pdf_path, runners, make_args(['first']), Path(tmpdir)) for pdf_path in pdf_paths]
+    assert [pdf_path for pdf_path, _, _, _ in results] == pdf_paths
+    assert 'ValueError: first failed' in results[0][1]
+    assert results[1][1] is None
+    assert events == [('first', 'good')]
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_stream_pipeline_2(tmpdir, pipelined):
+    # a failed document does not stop the following ones
+    processed.clear()
+    pdf_paths = [Path('bad.pdf'), Path('good.pdf'), Path('bad.pdf'), Path('good2.pdf')]
+    failures = stream_pipeline(pdf_paths, make_args(['test_failing_recorder']), Path(tmpdir), pipelined=pipelined)
+    assert [pdf_path for pdf_path, _ in failures] == [Path('bad.pdf'), Path('bad.pdf')]
+    assert all('ValueError: bad document' in error for _, error in failures)
+    assert processed == ['good', 'good2']
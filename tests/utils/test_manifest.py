@@ -0,0 +1,106 @@
+import argparse
+from pathlib import Path
+
+from appjsonify.modules.runner import BaseRunner
+from appjsonify.utils import Manifest
+from appjsonify.utils.executor import process_document
+
+
+def make_args(**kwargs) -> argparse.Namespace:
+    args_dict: dict = {
+        "input_dir_or_file_path": "/path/to/input",
+        "pipeline": ["load_docs", "dump_doc_with_tokens"],
+        "x_tolerance": 1.2,
+        "workers": 1
+    }
+    return argparse.Namespace(**(args_dict | kwargs))
+
+
+def test_manifest_1(tmpdir):
+    input_dir = Path(str(tmpdir.mkdir("input")))
+    manifest_path = Path(str(tmpdir)) / "output" / "manifest.json"
+    pdf_path = input_dir / "sub" / "test.pdf"
+    pdf_path.parent.mkdir()
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    
+    # not converted yet
+    manifest = Manifest(manifest_path, input_dir, make_args())
+    assert manifest.is_up_to_date(pdf_path) is False
+    
+    # failed
+    manifest.record(pdf_path, "Traceback...\nValueError: test", 1.0)
+    assert manifest.is_up_to_date(pdf_path) is False
+    
+    # converted
+    manifest.record(pdf_path, None, 1.0)
+    manifest.save()
+    assert manifest.documents["sub/test.pdf"]["status"] == "success"
+    assert Manifest(manifest_path, input_dir, make_args()).is_up_to_date(pdf_path) is True
+    
+    # execution settings do not matter
+    assert Manifest(manifest_path, input_dir, make_args(workers=4)).is_up_to_date(pdf_path) is True
+    
+    # parameters matter
+    assert Manifest(manifest_path, input_dir, make_args(x_tolerance=3.5)).is_up_to_date(pdf_path) is False
+    
+    # contents matter
+    pdf_path.write_bytes(b"%PDF-1.4 changed")
+    assert Manifest(manifest_path, input_dir, make_args()).is_up_to_date(pdf_path) is False
+
+
+def test_manifest_2(tmpdir):
+    # removed outputs are converted again
+    input_dir = Path(str(tmpdir.mkdir("input")))
+    output_dir = Path(str(tmpdir.mkdir("output")))
+    manifest_path = output_dir / "manifest.json"
+    pdf_path = input_dir / "test.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    output_paths = [output_dir / "test" / "test_with_tokens.json", output_dir / "test" / "test_with_lines.json"]
+    output_paths[0].parent.mkdir()
+    for output_path in output_paths:
+        output_path.write_text("{}")
+
+    manifest = Manifest(manifest_path, input_dir, make_args())
+    manifest.record(pdf_path, None, 1.0, [str(output_path) for output_path in output_paths])
+    manifest.save()
+    assert manifest.documents["test.pdf"]["outputs"] == ["test/test_with_tokens.json", "test/test_with_lines.json"]
+    assert Manifest(manifest_path, input_dir, make_args()).is_up_to_date(pdf_path) is True
+
+    # a partial output
+    output_paths[1].unlink()
+    assert Manifest(manifest_path, input_dir, make_args()).is_up_to_date(pdf_path) is False
+
+    # a removed output directory
+    output_paths[0].unlink()
+    output_paths[0].parent.rmdir()
+    assert Manifest(manifest_path, input_dir, make_args()).is_up_to_date(pdf_path) is False
+
+
+def test_manifest_3(tmpdir):
+    # files written by dumpers are recorded through the pipeline
+    class Writer(BaseRunner):
+        def execute(self, documents, output_dir, **kwargs):
+            for doc in documents:
+                output_path = Path(output_dir) / f'{doc.input_path.stem}.json'
+                output_path.write_text("{}")
+                self.add_output_path(doc, output_path)
+            return documents
+
+    input_dir = Path(str(tmpdir.mkdir("input")))
+    output_dir = Path(str(tmpdir.mkdir("output")))
+    pdf_paths = [input_dir / "a.pdf", input_dir / "b.pdf"]
+    for pdf_path in pdf_paths:
+        pdf_path.write_bytes(b"%PDF-1.4 " + pdf_path.stem.encode())
+    args = make_args(
+        pipeline=["writer"], output_dir=str(output_dir), resume_from=None, verbose=False, checkpoint_stages=[]
+    )
+    manifest = Manifest(output_dir / "manifest.json", input_dir, args)
+    runners = [("writer", Writer(show_progress=False))]
+    for pdf_path in pdf_paths:
+        _, error, elapsed, output_paths = process_document(pdf_path, runners, args, output_dir)
+        manifest.record(pdf_path, error, elapsed, output_paths)
+    manifest.save()
+
+    (output_dir / "a.json").unlink()
+    manifest = Manifest(output_dir / "manifest.json", input_dir, args)
+    assert [manifest.is_up_to_date(pdf_path) for pdf_path in pdf_paths] == [False, True]
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from appjsonify.utils import prefetch
+
+
+def test_prefetch_1():
+    assert list(prefetch(range(10))) == list(range(10))
+    assert list(prefetch([], max_prefetch=3)) == []
+
+
+def test_prefetch_2():
+    # the producer runs at most `max_prefetch` items ahead of the consumer
+    produced: list[int] = []
+    def produce():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    items = prefetch(produce(), max_prefetch=2)
+    assert next(items) == 0
+    time.sleep(0.3)
+    # one consumed, two queued and one waiting for a slot
+    assert len(produced) <= 4
+    items.close()
+
+
+def test_prefetch_3():
+    # exceptions of the producer are raised in the consumer
+    def produce():
+        yield 0
+        raise ValueError("failed to render")
+
+    items = prefetch(produce())
+    assert next(items) == 0
+    with pytest.raises(ValueError, match="failed to render"):
+        next(items)
+
+
+def test_prefetch_4():
+    # the producer stops when the consumer stops
+    for item in prefetch(iter(int, 1)):
+        if item == 0:
+            break
+    time.sleep(0.3)
+    assert [thread for thread in threading.enumerate() if thread.name == "prefetch"] == []
@@ -0,0 +1,41 @@
+import pytest
+
+from appjsonify.utils import get_template
+
+PAPER_TYPES = [
+    "ACL", "ACL2", "AAAI", "AAAI2", "ACM", "ACM2", "IEEE", "IEEE2",
+    "Springer", "Springer2", "ICML", "ICML2", "ICLR", "ICLR2", "NeurIPS", "NeurIPS2"
+]
+
+# arguments that every template must take from the command line
+PASSED_ARGS = [
+    "streaming", "workers", "pipelined", "stage_queue_size", "copy_documents", "incremental",
+    "checkpoint_stages", "resume_from", "pages", "max_pages", "compact_json", "json_backend",
+    "corpus_jsonl", "corpus_name", "shard_size", "shard_compression"
+]
+
+
+class Args:
+    """Command line arguments whose values are their names."""
+    def __getattr__(self, name: str):
+        return f'<{name}>'
+
+
+@pytest.mark.parametrize("paper_type", PAPER_TYPES)
+def test_get_template(paper_type):
+    args = get_template(paper_type, Args())
+    for name in PASSED_ARGS:
+        assert getattr(args, name) == f'<{name}>', name
+
+
+@pytest.mark.parametrize("paper_type", PAPER_TYPES)
+def test_get_template_with_ml(paper_type):
+    args = get_template(paper_type, Args())
+    if "load_objects_with_ml" not in args.pipeline:
+        pytest.skip(f"{paper_type} does not use ML-based modules")
+    for name in [
+        "detectron_device_mode", "detectron_batch_size", "detectron_workers", "concurrent_detectors",
+        "detection_cache_dir", "detection_cache_size", "render_dpi", "render_grayscale",
+        "render_thread_count", "render_chunk_size"
+    ]:
+        assert getattr(args, name) == f'<{name}>', name